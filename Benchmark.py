@@ -0,0 +1,260 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 03:40:00 2026
+
+@author: MarcMignard
+"""
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import platform
+import tracemalloc
+import numpy as np
+
+##########################################################################
+###   Speed and accuracy benchmarks of the wave engines
+###   Every solver is timed over grid sizes and sweep widths (best of a few runs), with the throughput in
+###   configurations per second and the peak memory from tracemalloc (a separate run, tracemalloc slows it down).
+###   The accuracy checks compare probe waveforms to the golden traces in reference/golden.npz:
+###     reflections  the six cases of media/reflections.svg, golden from LatticeWaves, which is exact for the
+###                  piecewise linear drive
+###     reactive     the source RC and load RC cases of MakeWaves.py, golden from the frequency domain solution
+###                  of the line and its RC ends (ExactWaves), which does not use the companion models
+###     spice        the same six cases simulated by LTSpice, read back from the lines of the figure that
+###                  TlineLTSpice.PlotPointToPoint saved (media/LTS_reflections_single.svg), or simulated again
+###                  with --backend ltspice/ngspice. LTSpice only kept ~100 time points per trace, hence the tolerance
+###   python Benchmark.py run --json out.json [--baseline old.json]   exits with 1 if a check fails or if a
+###   benchmark is more than --slowdown times slower than in the baseline
+###   python Benchmark.py golden [--backend ngspice]                  writes reference/golden.npz again
+##########################################################################
+
+from WaveEngine import MakeWaves, SweepWaves
+from MakeWaves import Drive, params, zTrace, zTerm, endT
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+GOLDEN = os.path.join(HERE,'reference','golden.npz')
+LTSPICE_SVG = os.path.join(HERE,'media','LTS_reflections_single.svg')
+NT = 2000                         #time steps of the accuracy checks, the same grid as the figures
+PROBES = [0.,0.5,1.]
+
+def ReflectionCases(nT,fine=1):
+    #the six cases of media/reflections.svg as arrays for SweepWaves, srcDrv at fine times the resolution
+    srcDrv, t = Drive(nT*fine)
+    return srcDrv, dict(zSrc=[p[2] for p in params],zTrace=zTrace,zTerm=zTerm,length=[p[1] for p in params])
+
+def Reflections(nT):
+    srcDrv, c = ReflectionCases(nT)
+    return SweepWaves(srcDrv,c['zSrc'],c['zTrace'],c['zTerm'],c['length'],2,endT,probes=PROBES)
+
+#source RC (zSrc=100, CS 1..100pF) and load RC (zSrc=20, zTerm=100, CL 5..100pF), length=2
+REACTIVE = ([dict(zSrc=100,zTerm=zTerm,cSrc=c*1e-3) for c in (1,10,50,100)]
+            + [dict(zSrc=20,zTerm=100,cTerm=c*1e-3) for c in (5,20,100)])
+
+def Reactive(nT):
+    srcDrv, t = Drive(nT)
+    return np.concatenate([SweepWaves(srcDrv,c['zSrc'],zTrace,c['zTerm'],2,2,endT,probes=PROBES,
+                                      cSrc=c.get('cSrc',0),cTerm=c.get('cTerm',np.inf)) for c in REACTIVE])
+
+def ExactWaves(srcDrv,dt,zSrc,zTrace,zTerm,length,probes,lSrc=0.,cSrc=0.,lTerm=0.,cTerm=np.inf,fine=8,periods=16):
+    #voltages at the probes of one line with the same source and load networks as SweepWaves, from the
+    #transfer function of the line in the frequency domain, for srcDrv linearly interpolated to fine times
+    #the resolution. The waves are damped by exp(-sigma*t) before the FFT and undamped after, so the tail of
+    #the response that wraps around the FFT period (periods times the drive) is smaller than 1e-15.
+    #https://en.wikipedia.org/wiki/Numerical_inversion_of_Laplace_transform
+    n = srcDrv.size
+    N = n*fine*periods
+    s = np.zeros(N)
+    s[:(n-1)*fine+1] = np.interp(np.arange((n-1)*fine+1)/fine,np.arange(n),srcDrv)
+    t = np.arange(N)*dt/fine
+    sigma = 36/(N*dt/fine)
+    jw = sigma + 2j*np.pi*np.fft.rfftfreq(N,dt/fine)     #Laplace variable on the damped axis
+    zS = zSrc + jw*lSrc
+    vTh, zTh = np.fft.rfft(s*np.exp(-sigma*t))/(1+jw*cSrc*zS), zS/(1+jw*cSrc*zS)   #Thevenin source at the line
+    yL = 1/(zTerm + jw*lTerm) if np.isinf(cTerm) else jw*cTerm/(1 + jw*cTerm*(zTerm + jw*lTerm))
+    gTerm = (1 - zTrace*yL)/(1 + zTrace*yL)
+    gSrc = (zTh - zTrace)/(zTh + zTrace)
+    vRight = vTh*zTrace/(zTh + zTrace)/(1 - gSrc*gTerm*np.exp(-2*jw*length))
+    x = np.asarray(probes,dtype=float)[None,:]*length
+    v = vRight[:,None]*(np.exp(-jw[:,None]*x) + gTerm[:,None]*np.exp(-jw[:,None]*(2*length - x)))
+    return (np.fft.irfft(v,N,axis=0)*np.exp(sigma*t)[:,None])[:n*fine:fine]
+
+CHECKS = {'reflections': (Reflections,1e-9),     #(function of nT, tolerance in volts)
+          'reactive': (Reactive,2e-4),
+          'spice': (Reflections,2e-2)}
+
+def SpiceFromSvg(fn=LTSPICE_SVG,xlim=(0,20),ylim=(-0.8,1.8)):
+    #LTSpice traces of the six reflection cases from the matplotlib figure of TlineLTSpice.PlotPointToPoint,
+    #on the time grid of the engines, (case,NT,probes). Each panel (axes_1..6, in the order of params) maps
+    #its white background box to xlim and ylim, and the load, middle and source lines are told apart by their
+    #default matplotlib colors. The lines have every time point that LTSpice saved, so this is its own data.
+    import xml.etree.ElementTree as ET
+    svg = '{http://www.w3.org/2000/svg}'
+    colors = {'#2ca02c': 0, '#ff7f0e': 1, '#1f77b4': 2}   #source, middle and load in the order of PROBES
+    t = np.arange(NT)*endT/NT
+    cases = []
+    for ax in ET.parse(fn).getroot().iter(svg+'g'):
+        if not (ax.get('id') or '').startswith('axes_'):
+            continue
+        box, traces = None, [None]*len(colors)
+        for g in ax.findall(svg+'g'):
+            path = g.find(svg+'path')
+            if path is None:
+                continue
+            xy = np.asarray(re.findall(r'(-?[\d.]+) (-?[\d.]+)',path.get('d')),dtype=float)
+            style = path.get('style','')
+            color = re.search(r'stroke: (#[0-9a-f]{6})',style)
+            if box is None and 'fill: #ffffff' in style:
+                box = xy.min(0), xy.max(0)             #(left,top), (right,bottom)
+            elif (g.get('id') or '').startswith('line2d') and color is not None and color.group(1) in colors:
+                traces[colors[color.group(1)]] = xy
+        (left,top), (right,bottom) = box
+        cases.append(np.stack([np.interp(t,xlim[0] + (xy[:,0]-left)/(right-left)*(xlim[1]-xlim[0]),
+                                         ylim[0] + (bottom-xy[:,1])/(bottom-top)*(ylim[1]-ylim[0])) for xy in traces],axis=1))
+    return np.asarray(cases)
+
+def MakeGolden(backend=None,dt=0.01):
+    #reference traces of the checks, the spice traces come from SpiceFromSvg, or from a SPICE backend of
+    #SimRunner.py (Tline.Backend names)
+    from Lattice import LatticeWaves
+    srcDrv, c = ReflectionCases(NT)
+    golden = {'reflections': LatticeWaves(srcDrv,c['zSrc'],c['zTrace'],c['zTerm'],c['length'],endT,probes=PROBES,tol=1e-12),
+              'reactive': np.asarray([ExactWaves(srcDrv,endT/NT,c['zSrc'],zTrace,c['zTerm'],2,PROBES,
+                                                 cSrc=c.get('cSrc',0.),cTerm=c.get('cTerm',np.inf)) for c in REACTIVE])}
+    if backend is None:
+        golden['spice'] = SpiceFromSvg()
+    else:
+        from Tline import Backend
+        from SimRunner import RunSweep
+        pulse = dict(tStart=0,tRise=1,tOn=9,tPeriod=endT,nCycles=1,tEnd=endT)
+        fn = os.path.join(HERE,'LTSpice','singleTrace')
+        jobs = [dict(pulse,schematic=fn,tdT1=p[1]/2,tdT2=p[1]/2,zSource=p[2],zTrace=zTrace,zTerm=zTerm) for p in params]
+        t = np.arange(NT)*endT/NT            #the time grid of the engines
+        golden['spice'] = np.asarray([np.stack([np.interp(t,res['time']*1e9,res[name]) for name in ('V(vs)','V(vm)','V(vl)')],axis=1)
+                                      for res in RunSweep(jobs,Backend(backend,dt))])
+    os.makedirs(os.path.dirname(GOLDEN),exist_ok=True)
+    np.savez_compressed(GOLDEN,**{k: v.astype(np.float32) if k != 'reflections' else v for k,v in golden.items()})
+    return golden
+
+def CheckAccuracy():
+    #largest difference of each check from its golden traces, checks without golden traces are skipped
+    results = []
+    golden = np.load(GOLDEN)
+    for name,(func,tol) in CHECKS.items():
+        if name not in golden:
+            results.append(dict(check=name,maxError=None,tol=tol,passed=None,skipped=f'no {name} traces in {os.path.basename(GOLDEN)}'))
+            continue
+        ref = golden[name]
+        err = float(np.abs(func(NT) - ref).max())
+        #float32 golden traces are only good to about 1e-7
+        tol = max(tol,1e-6) if ref.dtype == np.float32 else tol
+        results.append(dict(check=name,maxError=err,tol=tol,passed=err <= tol,skipped=None))
+    return results
+
+def Benchmarks(quick=False):
+    #list of (name, dict of parameters, number of configurations, function to time)
+    from Lattice import LatticeWaves
+    from LineResponse import LineResponse
+    from LossyLine import LossyLine
+    from TlineNetwork import NetworkWaves
+    from CoupledLines import CoupledWaves
+    benches = []
+    grids = [(100,200),(1000,2000)] if quick else [(100,200),(1000,2000),(4000,8000)]
+    for nX,nT in grids:
+        srcDrv = Drive(nT)[0]
+        for method in ('delay','interp'):
+            benches.append((f'MakeWaves {method}',dict(nX=nX,nT=nT),1,
+                            lambda srcDrv=srcDrv,nX=nX,method=method: MakeWaves(srcDrv,20,zTrace,zTerm,0.5,nX,endT,method=method)))
+    srcDrv = Drive(NT)[0]
+    rng = np.random.default_rng(0)
+    for nCfg in ((1,100) if quick else (1,10,100,1000)):
+        zSrc, length = rng.uniform(10,150,nCfg), rng.uniform(0.25,2,nCfg)
+        benches.append(('SweepWaves',dict(nT=NT,configs=nCfg),nCfg,
+                        lambda zSrc=zSrc,length=length: SweepWaves(srcDrv,zSrc,zTrace,zTerm,length,2,endT,probes=PROBES)))
+        benches.append(('SweepWaves source RC',dict(nT=NT,configs=nCfg),nCfg,
+                        lambda zSrc=zSrc,length=length: SweepWaves(srcDrv,zSrc,zTrace,zTerm,length,2,endT,probes=PROBES,cSrc=0.01)))
+        benches.append(('LatticeWaves',dict(nT=NT,configs=nCfg),nCfg,
+                        lambda zSrc=zSrc,length=length: LatticeWaves(srcDrv,zSrc,zTrace,zTerm,length,endT,probes=PROBES)))
+    dt = endT/NT
+    benches.append(('LineResponse',dict(nT=NT,configs=6),6,
+                    lambda: LineResponse([p[2] for p in params],zTrace,zTerm,[p[1] for p in params],dt,PROBES).Waves(srcDrv)))
+    benches.append(('LossyLine',dict(nT=NT,configs=1),1,
+                    lambda: LossyLine(0.5,zTrace,0,1/zTrace,2,dt,PROBES).Waves(srcDrv,20,zTerm)))
+    benches.append(('NetworkWaves Y split',dict(nT=NT,configs=1),1,
+                    lambda: NetworkWaves(srcDrv,[('vs','vm',zTrace,0.5),('vm','vl1',zTrace,0.5),('vm','vl2',zTrace,0.5)],endT,{'vs':20})))
+    near = np.eye(4,k=1) + np.eye(4,k=-1)
+    patterns = rng.integers(-1,2,(100,4))
+    benches.append(('CoupledWaves',dict(nT=NT,lines=4,patterns=100),100,
+                    lambda: CoupledWaves(srcDrv,50*(np.eye(4)+0.15*near),(np.eye(4)*1.1-0.1*near)/50,50,50,2,endT,patterns=patterns)))
+    return benches
+
+def RunBenchmarks(quick=False,repeat=3):
+    results = []
+    for name,p,nCfg,func in Benchmarks(quick):
+        best = np.inf
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            func()
+            best = min(best,time.perf_counter()-t0)
+        tracemalloc.start()
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        results.append(dict(name=name,params=p,seconds=best,configsPerSecond=nCfg/best,peakMB=peak/2**20))
+        print(f"{name} {p}: {best*1e3:.1f}ms, {nCfg/best:.0f} configs/s, {peak/2**20:.1f}MB",file=sys.stderr)
+    return results
+
+def Regressions(benchmarks,baseline,slowdown=1.5):
+    #benchmarks that are more than slowdown times slower than the same benchmark in a baseline result
+    old = {(b['name'],json.dumps(b['params'],sort_keys=True)): b['seconds'] for b in baseline['benchmarks']}
+    slow = []
+    for b in benchmarks:
+        key = (b['name'],json.dumps(b['params'],sort_keys=True))
+        if key in old and b['seconds'] > slowdown*old[key]:
+            slow.append(dict(name=b['name'],params=b['params'],seconds=b['seconds'],baseline=old[key]))
+    return slow
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Speed and accuracy benchmarks of the wave engines')
+    sub = parser.add_subparsers(dest='command',required=True)
+    p = sub.add_parser('run',help='run the accuracy checks and the benchmarks')
+    p.add_argument('--json',default=None,help='file for the results, - for stdout')
+    p.add_argument('--baseline',default=None,help='results of an earlier run to compare the times with')
+    p.add_argument('--slowdown',type=float,default=1.5,help='how much slower than the baseline is a regression')
+    p.add_argument('--quick',action='store_true',help='fewer and smaller benchmarks')
+    p.add_argument('--repeat',type=int,default=3)
+    p = sub.add_parser('golden',help='write the golden traces again')
+    p.add_argument('--backend',default=None,choices=['ltspice','ngspice'],
+                   help='simulate the SPICE traces instead of reading them from the LTSpice figure')
+    args = parser.parse_args(argv)
+
+    if args.command == 'golden':
+        golden = MakeGolden(args.backend)
+        print(f"wrote {', '.join(golden)} to {GOLDEN}")
+        return 0
+    accuracy = CheckAccuracy()
+    for a in accuracy:
+        if a['skipped']:
+            print(f"{a['check']}: skipped, {a['skipped']}",file=sys.stderr)
+        else:
+            print(f"{a['check']}: max error {a['maxError']:.2e}V (tol {a['tol']:.0e}) {'ok' if a['passed'] else 'FAILED'}",file=sys.stderr)
+    benchmarks = RunBenchmarks(args.quick,args.repeat)
+    out = dict(time=time.strftime('%Y-%m-%dT%H:%M:%S'),python=platform.python_version(),numpy=np.__version__,
+               machine=platform.machine(),cpus=os.cpu_count(),accuracy=accuracy,benchmarks=benchmarks)
+    if args.baseline is not None:
+        with open(args.baseline) as f:
+            out['regressions'] = Regressions(benchmarks,json.load(f),args.slowdown)
+        for r in out['regressions']:
+            print(f"{r['name']} {r['params']}: {r['seconds']*1e3:.1f}ms, was {r['baseline']*1e3:.1f}ms",file=sys.stderr)
+    if args.json == '-':
+        print(json.dumps(out,indent=1))
+    elif args.json is not None:
+        with open(args.json,'w') as f:
+            json.dump(out,f,indent=1)
+    failed = any(a['passed'] is False for a in accuracy) or bool(out.get('regressions'))
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
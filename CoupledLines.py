@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 01:20:00 2026
+
+@author: MarcMignard
+"""
+import numpy as np
+from WaveEngine import DelayTaps, ProbePositions
+
+##########################################################################
+###   Crosstalk between N coupled lossless lines (a bus of traces over one ground plane)
+###   The lines are described by their L and C matrices per unit length. The eigenvectors of L·C are the
+###   propagation modes (even and odd for two lines), and each mode travels at its own speed without changing
+###   shape, so each mode is a delay line of the WaveEngine kind. The modes only mix at the ends of the lines,
+###   where the terminations are resistors on each conductor: that is a small N×N matrix per end, found once.
+###   The lines are linear, so the response to any aggressor pattern is the sum of the responses to each
+###   conductor driven alone, and only N simulations are needed for any number of patterns.
+###   Paul, Analysis of Multiconductor Transmission Lines, chapter 7
+###   https://en.wikipedia.org/wiki/Crosstalk#In_electronics
+###   Units as in LossyLine.py: L in ohm*time and C in time/ohm per unit length, so one line with L=50 and
+###   C=0.02 is zTrace=50Ω with velocity 1
+##########################################################################
+
+def Modes(L,C):
+    #modal decomposition of symmetric L and C matrices (N,N) per unit length
+    #returns (tv, delay, zMode): the mode shapes as columns of conductor voltages, the delay of each mode
+    #per unit length, and the impedance of each mode. The mode currents are C·tv, and tv.T·C·tv=1
+    #L·C is not symmetric, but C^½·L·C^½ is and has the same eigenvalues, so eigh gives real modes
+    w, u = np.linalg.eigh(C)
+    if np.any(w <= 0):
+        raise ValueError('C has to be positive definite')
+    cHalf = (u*np.sqrt(w)) @ u.T
+    lam, y = np.linalg.eigh(cHalf @ L @ cHalf)
+    if np.any(lam <= 0):
+        raise ValueError('L has to be positive definite')
+    tv = (u/np.sqrt(w)) @ u.T @ y
+    return tv, np.sqrt(lam), np.sqrt(lam)
+
+def ImpedanceMatrix(L,C):
+    #characteristic impedance matrix of the coupled lines, the termination that does not reflect any mode
+    tv, _, zMode = Modes(L,C)
+    return (tv*zMode) @ tv.T
+
+class CoupledState:
+    #State of a batch of configurations of the same coupled lines, only the terminations and drives differ
+    #zSrc, zTerm: (nCfg,N) or (N,) resistors from each conductor to its source or to ground (inf is open)
+    #drives: (nCfg,N) weight of srcDrv on each conductor's source, a quiet line has 0
+    #pos are the stored points as a fraction of the line length
+    def __init__(self,L,C,length,dt,pos,zSrc,zTerm,drives,decimate=1):
+        L, C = np.atleast_2d(np.asarray(L,dtype=float)), np.atleast_2d(np.asarray(C,dtype=float))
+        if not (np.allclose(L,L.T) and np.allclose(C,C.T)):
+            raise ValueError('L and C have to be symmetric')
+        n = L.shape[0]
+        zSrc, zTerm, drives = [np.array(a,dtype=float) for a in np.broadcast_arrays(
+            *[np.atleast_2d(np.asarray(p,dtype=float)) for p in (zSrc,zTerm,drives)])]
+        if zSrc.shape[1] != n:
+            raise ValueError(f'zSrc, zTerm and drives need {n} values per configuration')
+        self.n = n
+        self.nCfg = zSrc.shape[0]
+        self.nP = pos.size
+        self.decimate = decimate
+        tv, delay, zMode = Modes(L,C)
+        self.tv = tv
+        tvInv = tv.T @ C
+        yc = C @ (tv/zMode) @ tvInv                   #characteristic admittance matrix
+
+        #Source end: vSrc - zSrc*i = v with v = Tv(f+b) and i = Yc·Tv(f-b), solved for the launched modes f.
+        #Load end: i = v/zTerm gives the reflected modes b, written with conductances so zTerm=inf is open.
+        eye = np.eye(n)
+        zy = zSrc[:,:,None]*yc[None]
+        aSrc = np.linalg.inv(eye + zy)
+        self.launch = np.einsum('ij,cjk,ck->ci',tvInv,aSrc,drives)   #launched modes per volt of srcDrv
+        self.gSrc = tvInv @ aSrc @ (zy - eye) @ tv                   #modes reflected at the source
+        gLoad = np.where(np.isinf(zTerm),0,1/zTerm)[:,:,None]*eye
+        self.gTerm = tvInv @ np.linalg.solve(yc + gLoad,yc - gLoad) @ tv  #modes reflected at the load
+
+        #every mode is a delay line, its delay along the whole line and to each stored point
+        self.lineTap, self.lineFrac = DelayTaps(length*delay/dt)
+        if np.any(self.lineTap < 1):
+            raise ValueError('the fastest mode needs a delay of at least one time step, decrease dt')
+        x = np.asarray(pos,dtype=float)[:,None]*length*delay[None,:]
+        self.rightTap, self.rightFrac = DelayTaps(x/dt)
+        self.leftTap, self.leftFrac = DelayTaps((length*delay[None,:] - x)/dt)
+        self.M = self.lineTap.max() + 2
+        self.rightBuf = np.zeros((self.nCfg,n,2*self.M))   #modes launched at the source end
+        self.leftBuf = np.zeros((self.nCfg,n,2*self.M))    #modes launched at the load end
+        self.head = 0
+        self.tIdx = 0
+
+    def Advance(self,srcDrv):
+        #run the time steps of srcDrv, returns the conductor voltages (config,steps kept after decimation,points,N)
+        n, M, decimate = self.n, self.M, self.decimate
+        rightBuf, leftBuf, head = self.rightBuf, self.leftBuf, self.head
+        lineTap, lineFrac, launch, gSrc, gTerm = self.lineTap, self.lineFrac, self.launch, self.gSrc, self.gTerm
+        rightTap, rightFrac, leftTap, leftFrac = self.rightTap, self.rightFrac, self.leftTap, self.leftFrac
+        modes = np.arange(n)
+        first = -self.tIdx % decimate
+        modalWave = np.zeros((self.nCfg,len(range(first,srcDrv.size,decimate)),self.nP,n))
+        for tIdx in np.arange(srcDrv.size):
+            k = head+M-lineTap
+            rightArrive = (1-lineFrac)*rightBuf[:,modes,k] + lineFrac*rightBuf[:,modes,k-1]  #modes reaching the load
+            leftArrive = (1-lineFrac)*leftBuf[:,modes,k] + lineFrac*leftBuf[:,modes,k-1]     #modes reaching the source
+            right = srcDrv[tIdx]*launch + (gSrc @ leftArrive[:,:,None])[:,:,0]
+            left = (gTerm @ rightArrive[:,:,None])[:,:,0]
+            rightBuf[:,:,head] = rightBuf[:,:,head+M] = right
+            leftBuf[:,:,head] = leftBuf[:,:,head+M] = left
+            if (tIdx - first) % decimate == 0 and tIdx >= first:
+                out = modalWave[:,(tIdx-first)//decimate]
+                k = head+M-rightTap
+                out[:] = (1-rightFrac)*rightBuf[:,modes,k] + rightFrac*rightBuf[:,modes,k-1]
+                k = head+M-leftTap
+                out += (1-leftFrac)*leftBuf[:,modes,k] + leftFrac*leftBuf[:,modes,k-1]
+            head = (head+1) % M
+        self.head = head
+        self.tIdx += srcDrv.size
+        return modalWave @ self.tv.T            #back from modes to conductor voltages
+
+def CoupledWaves(srcDrv,L,C,zSrc,zTerm,length,endT,patterns=None,probes=(0.,1.),decimate=1):
+    #voltages on coupled lines for a batch of aggressor patterns
+    #patterns: (nPattern,N) weight of srcDrv on each conductor, 1 rises with srcDrv, -1 falls and 0 is quiet,
+    #  default is each conductor alone (the identity). The waves are the change from the starting levels.
+    #zSrc, zTerm: (N,) or a single value for every conductor
+    #returns an array of (nPattern,ceil(nT/decimate),probes,N)
+    L = np.atleast_2d(np.asarray(L,dtype=float))
+    n = L.shape[0]
+    patterns = np.eye(n) if patterns is None else np.atleast_2d(np.asarray(patterns,dtype=float))
+    dt = endT/srcDrv.size
+    #only simulate the drives that are needed: each conductor alone, or the patterns if there are fewer
+    drives = np.eye(n) if patterns.shape[0] > n else patterns
+    state = CoupledState(L,C,length,dt,ProbePositions(probes),
+                         np.broadcast_to(zSrc,(n,)),np.broadcast_to(zTerm,(n,)),drives,decimate)
+    waves = state.Advance(np.asarray(srcDrv,dtype=float))
+    return waves if patterns.shape[0] <= n else np.einsum('pd,dtxc->ptxc',patterns,waves)
+
+def Crosstalk(waves,patterns,near=0,far=-1):
+    #peak crosstalk on the quiet lines of each pattern, from the waves of CoupledWaves
+    #near, far: index of the probes at the driven end and at the load end
+    #returns {'next','fext'} arrays of (nPattern,N), the largest |voltage| at each end of the quiet
+    #lines (near end and far end crosstalk), nan on the lines that are driven
+    quiet = np.atleast_2d(np.asarray(patterns,dtype=float)) == 0
+    peak = np.abs(waves).max(1)
+    return {'next': np.where(quiet,peak[:,near,:],np.nan),
+            'fext': np.where(quiet,peak[:,far,:],np.nan)}
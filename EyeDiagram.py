@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 20:10:00 2026
+
+@author: MarcMignard
+"""
+import numpy as np
+
+##########################################################################
+###   PRBS drive patterns and eye diagrams for long streaming simulations (WaveEngine.StreamWaves)
+###   Both work a chunk at a time, so a pattern of millions of bits never has to be in memory.
+###   PRBS polynomials: https://en.wikipedia.org/wiki/Pseudorandom_binary_sequence
+###   Eye diagram: https://en.wikipedia.org/wiki/Eye_pattern
+##########################################################################
+
+PRBS_TAPS = {7:(7,6), 9:(9,5), 15:(15,14), 23:(23,18), 31:(31,28)} #x^n + x^m + 1
+
+def PrbsBits(order,chunkBits,seed=1):
+    #endless generator of PRBS bits in chunks of chunkBits, b[k] = b[k-n] xor b[k-m]
+    #the recurrence only looks back m bits or more, so it can be filled in blocks of m bits at a time
+    n, m = PRBS_TAPS[order]
+    state = np.asarray([(seed >> i) & 1 for i in range(n)],dtype=np.uint8)
+    if not state.any():
+        raise ValueError('PRBS seed can not be zero')
+    while True:
+        bits = np.concatenate((state,np.zeros(chunkBits,dtype=np.uint8)))
+        for k in range(n,n+chunkBits,m):
+            stop = min(k+m,n+chunkBits)
+            bits[k:stop] = bits[k-n:stop-n] ^ bits[k-m:stop-m]
+        state = bits[-n:]
+        yield bits[n:]
+
+def PrbsDrive(order,nBits,samplesPerBit,riseSamples,chunkBits=4096,vLow=0.,vHigh=1.,seed=1):
+    #generator of drive samples for nBits of PRBS, with linear edges that take riseSamples
+    bits = PrbsBits(order,chunkBits,seed)
+    tail = np.zeros(max(riseSamples-1,0))  #end of the previous chunk, needed for the edges at the start of the next one
+    done = 0
+    while done < nBits:
+        b = next(bits)[:nBits-done]
+        done += b.size
+        nrz = np.concatenate((tail,np.repeat(vLow + (vHigh-vLow)*b.astype(float),samplesPerBit)))
+        #moving average of the NRZ levels gives linear edges
+        c = np.cumsum(np.concatenate(([0],nrz)))
+        r = max(riseSamples,1)
+        yield (c[r:] - c[:-r])/r
+        if riseSamples > 1:
+            tail = nrz[-(riseSamples-1):]
+
+class EyeDiagram:
+    #2-D histogram of voltage versus time within nUI unit intervals, filled in a chunk at a time
+    def __init__(self,samplesPerUI,vMin,vMax,nBins=200,nUI=2,skip=0):
+        self.samplesPerUI = samplesPerUI
+        self.vMin = vMin
+        self.vMax = vMax
+        self.nBins = nBins
+        self.nCols = nUI*samplesPerUI
+        self.skip = skip              #samples to ignore at the start, while the line settles
+        self.count = 0                #number of samples seen so far
+        self.hist = np.zeros((nBins,self.nCols),dtype=np.int64)
+
+    def Add(self,samples):
+        #samples of one probe, continuing from the previous call
+        samples = np.asarray(samples).ravel()
+        phase = (self.count + np.arange(samples.size)) % self.nCols
+        keep = self.count + np.arange(samples.size) >= self.skip
+        self.count += samples.size
+        vBin = np.floor((samples - self.vMin)/(self.vMax - self.vMin)*self.nBins).astype(int)
+        keep &= (vBin >= 0) & (vBin < self.nBins)
+        self.hist += np.bincount(vBin[keep]*self.nCols + phase[keep],minlength=self.hist.size).reshape(self.hist.shape)
+
+    def Edges(self):
+        #voltage bin edges and time (in samples) of the histogram columns
+        return np.linspace(self.vMin,self.vMax,self.nBins+1), np.arange(self.nCols)
+
+    def Opening(self,vThreshold):
+        #smallest vertical eye opening around vThreshold, in volts, for each column of the histogram
+        #columns that have no samples on one side of vThreshold have no eye to measure and are nan
+        vEdges, _ = self.Edges()
+        mid = (vEdges[:-1] + vEdges[1:])/2
+        hit = self.hist > 0
+        above = np.where(hit & (mid[:,None] >= vThreshold),mid[:,None],np.inf).min(0)
+        below = np.where(hit & (mid[:,None] < vThreshold),mid[:,None],-np.inf).max(0)
+        return np.where(np.isfinite(above) & np.isfinite(below),np.clip(above - below,0,None),np.nan)
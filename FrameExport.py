@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 03:00:00 2026
+
+@author: MarcMignard
+"""
+import os
+import shutil
+import subprocess
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+##########################################################################
+###   Fast export of voltage versus position animations to video files
+###   matplotlib's FuncAnimation redraws the whole figure for every frame, which is why the animations in
+###   MakeWaves.py had to be made with nX=50 and nT=100. Here matplotlib only draws the parts that do not
+###   move (titles, axes, grid) once, and every frame is that background with the curves drawn straight into
+###   the RGB pixels with numpy. Ranges of frames are drawn on a process pool and the raw frames are piped in
+###   order into ffmpeg (https://ffmpeg.org/ffmpeg-formats.html#rawvideo), or saved with Pillow as a GIF when
+###   ffmpeg is not installed.
+##########################################################################
+
+COLORS = {'r': (214,39,40), 'b': (31,119,180), 'k': (0,0,0), 'g': (44,160,44), 'm': (148,103,189), 'c': (23,190,207)}
+
+def Background(panels,size=(7,4),dpi=100,suptitle=None):
+    #draw the parts of the figure that do not change with matplotlib, returns the RGB image (H,W,3)
+    #and the pixel box (left,top,right,bottom) of each panel. The figure is not made with pyplot, so no
+    #window is opened and nothing has to be closed
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    fig = Figure(figsize=size,dpi=dpi)
+    FigureCanvasAgg(fig)
+    axes = fig.subplots(1,len(panels),squeeze=False)[0]
+    if suptitle is not None:
+        fig.suptitle(suptitle)
+    for ax,p in zip(axes,panels):
+        ax.set_xlim(*p['xlim'])
+        ax.set_ylim(*p['ylim'])
+        ax.set_title(p.get('title',''))
+        ax.set_xlabel(p.get('xlabel',''))
+        ax.set_ylabel(p.get('ylabel',''))
+        ax.grid(True)
+    fig.canvas.draw()
+    image = np.asarray(fig.canvas.buffer_rgba())[:,:,:3]
+    h, w = image.shape[0] & ~1, image.shape[1] & ~1     #video encoders want an even number of pixels
+    boxes = []
+    for ax in axes:
+        b = ax.get_window_extent()
+        boxes.append((int(round(b.x0)),int(round(image.shape[0]-b.y1)),int(round(b.x1)),int(round(image.shape[0]-b.y0))))
+    return np.ascontiguousarray(image[:h,:w]), boxes
+
+def DrawCurve(frame,box,xlim,ylim,x,y,color,lineWidth=2):
+    #draw the polyline (x,y) in data units into the RGB frame, inside the pixel box of its panel
+    #every pixel column between two samples is filled from the lowest to the highest y of the line in it,
+    #so steep edges are solid lines too
+    left, top, right, bottom = box
+    px = left + (x - xlim[0])/(xlim[1] - xlim[0])*(right - left)
+    py = bottom - (y - ylim[0])/(ylim[1] - ylim[0])*(bottom - top)
+    c0 = max(left,int(np.ceil(px.min())))
+    c1 = min(right-1,int(np.floor(px.max())))
+    if c1 < c0:
+        return
+    cols = np.arange(c0,c1+1)
+    yc = np.interp(np.concatenate((cols,[c1+1])) - 0.5,px,py)    #line height at the column edges
+    half = lineWidth/2
+    lo = np.minimum(yc[:-1],yc[1:]) - half
+    hi = np.maximum(yc[:-1],yc[1:]) + half
+    r0 = max(top,int(np.floor(lo.min())))
+    r1 = min(bottom,int(np.ceil(hi.max()))+1)
+    if r1 <= r0:
+        return
+    rows = np.arange(r0,r1)[:,None]
+    mask = (rows >= lo) & (rows <= hi)
+    frame[r0:r1,c0:c1+1][mask] = color
+
+_spec = None
+
+def InitWorker(spec):
+    #each worker process gets the background and the waves once, not with every range of frames
+    global _spec
+    _spec = spec
+
+def RenderFrames(span):
+    #frames start..stop-1 of the animation as one block of raw RGB bytes
+    start, stop = span
+    background, boxes, panels, lineWidth = _spec
+    frames = np.empty((stop-start,)+background.shape,dtype=np.uint8)
+    for i in range(start,stop):
+        frame = frames[i-start]
+        frame[:] = background
+        for box,p in zip(boxes,panels):
+            for x,waves,offset,color in p['curves']:
+                DrawCurve(frame,box,p['xlim'],p['ylim'],x,waves[i]+offset,COLORS.get(color,color),lineWidth)
+    return frames.tobytes()
+
+def Encoder(filename,width,height,fps):
+    #ffmpeg reading raw RGB frames from stdin, None when ffmpeg is not installed
+    ffmpeg = shutil.which('ffmpeg')
+    if ffmpeg is None:
+        return None
+    cmd = [ffmpeg,'-y','-loglevel','error','-f','rawvideo','-pix_fmt','rgb24','-s',f'{width}x{height}',
+           '-r',str(fps),'-i','-']
+    if filename.lower().endswith('.gif'):
+        cmd += ['-vf','split[a][b];[a]palettegen[p];[b][p]paletteuse']
+    else:
+        cmd += ['-pix_fmt','yuv420p']
+    return subprocess.Popen(cmd + [filename],stdin=subprocess.PIPE)
+
+class GifFrames:
+    #GIF frames with Pillow without quantizing every frame: the background is quantized once, and the only
+    #other colors in a frame are the curve colors, which get their own palette entries
+    def __init__(self,background,colors):
+        from PIL import Image
+        self.Image = Image
+        colors = np.unique(np.asarray(colors,dtype=np.uint8).reshape(-1,3),axis=0)
+        bg = Image.fromarray(background).quantize(256-len(colors),method=Image.Quantize.FASTOCTREE,dither=Image.Dither.NONE)
+        nBg = len(bg.getpalette())//3
+        self.palette = bg.getpalette() + colors.ravel().tolist()
+        self.bgIndex = np.asarray(bg)
+        self.bgKey = self.Key(background)
+        self.colorKey = self.Key(colors)                 #sorted, because colors came from np.unique
+        self.colorIndex = nBg + np.arange(len(colors))
+        self.frames = []
+
+    def Key(self,rgb):
+        rgb = rgb.astype(np.int32)
+        return (rgb[...,0] << 16) | (rgb[...,1] << 8) | rgb[...,2]
+
+    def Add(self,frames):
+        for f in frames:
+            key = self.Key(f)
+            changed = key != self.bgKey
+            index = self.bgIndex.copy()
+            index[changed] = self.colorIndex[np.searchsorted(self.colorKey,key[changed])]
+            im = self.Image.fromarray(index,'P')
+            im.putpalette(self.palette)
+            self.frames.append(im)
+
+    def Save(self,filename,fps):
+        self.frames[0].save(filename,save_all=True,append_images=self.frames[1:],duration=1000/fps,loop=0,optimize=False)
+
+def ExportAnimation(filename,panels,fps=60,step=1,size=(7,4),dpi=100,suptitle=None,lineWidth=2,workers=None,chunk=32):
+    #panels: list of dicts with 'xlim', 'ylim', 'curves' and optional 'title', 'xlabel', 'ylabel'
+    #  curves: list of (x positions (nX,), waves (frames,nX), offset added to the voltage, color 'r'/'b'/... or RGB)
+    #step: only every step'th frame is exported, workers: number of processes (1 draws in this process)
+    #the file type follows the extension: .mp4, .webm, ... need ffmpeg, .gif uses Pillow without ffmpeg
+    nFrames = min(w.shape[0] for p in panels for _,w,_,_ in p['curves'])
+    panels = [dict(p,curves=[(np.asarray(x,dtype=float),np.asarray(w,dtype=float)[:nFrames:step],o,c)
+                             for x,w,o,c in p['curves']]) for p in panels]
+    nFrames = -(-nFrames//step)
+    background, boxes = Background(panels,size,dpi,suptitle)
+    height, width = background.shape[:2]
+    spec = (background,boxes,panels,lineWidth)
+    spans = [(i,min(i+chunk,nFrames)) for i in range(0,nFrames,chunk)]
+
+    encoder = Encoder(filename,width,height,fps)
+    if encoder is None and not filename.lower().endswith('.gif'):
+        raise RuntimeError(f'ffmpeg is needed to write {os.path.basename(filename)}, or use a .gif file name')
+    #Pillow needs all the frames of a GIF at once
+    gif = None if encoder is not None else GifFrames(background,[COLORS.get(c,c) for p in panels for _,_,_,c in p['curves']])
+    def Write(block):
+        if encoder is not None:
+            encoder.stdin.write(block)
+        else:
+            gif.Add(np.frombuffer(block,dtype=np.uint8).reshape(-1,height,width,3))
+
+    workers = os.cpu_count() if workers is None else workers
+    done = False
+    try:
+        if workers == 1 or len(spans) <= 1:
+            InitWorker(spec)
+            for span in spans:
+                Write(RenderFrames(span))
+        else:
+            #keep only a few blocks in flight, and write them in order as they finish
+            with ProcessPoolExecutor(max_workers=workers,initializer=InitWorker,initargs=(spec,)) as pool:
+                ahead = 2*workers
+                futures = [pool.submit(RenderFrames,span) for span in spans[:ahead]]
+                for k in range(len(spans)):
+                    Write(futures[k].result())
+                    futures[k] = None
+                    if k + ahead < len(spans):
+                        futures.append(pool.submit(RenderFrames,spans[k+ahead]))
+        done = True
+    finally:
+        if encoder is not None:
+            try:
+                encoder.stdin.close()
+            except BrokenPipeError:
+                pass            #ffmpeg already stopped, its exit code tells
+            #only blame ffmpeg when nothing else went wrong, so an error from drawing or writing is not hidden
+            if encoder.wait() != 0 and done:
+                raise RuntimeError(f'ffmpeg failed to write {filename}')
+    if encoder is None:
+        gif.Save(filename,fps)
+    return nFrames
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 00:30:00 2026
+
+@author: MarcMignard
+"""
+import os
+import re
+import mmap
+import numpy as np
+
+##########################################################################
+###   IBIS (.ibs) driver models for the wave engine
+###   https://ibis.org/ver7.0/ver7_0.pdf
+###   An IbisFile is indexed once: the byte offset of every [keyword] is found with a regular expression on a
+###   memory map of the file, and the keywords after each [Model] are grouped under that model. Nothing else is
+###   parsed until a model is asked for, then only its sections are read, and the parsed model is kept.
+###   A DriverModel turns the [Pullup], [Pulldown] and clamp V-I tables of one corner into the current the
+###   driver pushes into the line at any pad voltage, for a switching state between 0 (pulldown on) and 1
+###   (pullup on). LineState(...,driver=DriverModel) solves that nonlinear source at every time step.
+##########################################################################
+
+KEYWORD = re.compile(rb'^[ \t]*\[([^\]\r\n]+)\]',re.MULTILINE)
+NUMBER = re.compile(r'^([+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)([TGMkmunpf]?)')
+SCALE = {'T':1e12,'G':1e9,'M':1e6,'k':1e3,'':1.,'m':1e-3,'u':1e-6,'n':1e-9,'p':1e-12,'f':1e-15}
+#keywords that end a [Model] section, everything else after a [Model] belongs to it
+TOP_LEVEL = {'ibis ver','file name','file rev','date','source','notes','disclaimer','copyright','component',
+             'model selector','model','submodel','define package model','end','external circuit','interconnect model set'}
+CORNERS = {'typ':0,'min':1,'max':2}
+
+def Keyword(name):
+    #keywords are not case sensitive, and spaces and underscores are the same
+    return ' '.join(name.replace('_',' ').lower().split())
+
+def IbisNumber(text):
+    #IBIS numbers have scaling suffixes (and units that are ignored), NA is nan
+    m = NUMBER.match(text)
+    if m is None:
+        return np.nan
+    return float(m.group(1))*SCALE[m.group(2)]
+
+class IbisModel:
+    #the parsed sections of one [Model], tables are arrays of (voltage, typ, min, max)
+    def __init__(self,name,sections):
+        self.name = name
+        self.params = {}         #Model_type, C_comp, Vinl, ... as the text after the name
+        self.tables = {}         #'pullup', 'pulldown', 'gnd clamp', 'power clamp'
+        self.ranges = {}         #'voltage range', 'pullup reference', ... as (typ, min, max)
+        self.ramp = {}           #'dv/dt_r', 'dv/dt_f' as (dV, dt) for typ, min, max, and 'r_load'
+        for key,lines in sections:
+            if key == 'model':
+                for line in lines:
+                    k,_,v = line.replace('=',' ').partition(' ')
+                    self.params[k.lower()] = v.strip()
+            elif key in ('pullup','pulldown','gnd clamp','power clamp'):
+                rows = [[IbisNumber(v) for v in line.split()[:4]] for line in lines]
+                self.tables[key] = np.asarray([r + [np.nan]*(4-len(r)) for r in rows if len(r) >= 2])
+            elif key == 'ramp':
+                for line in lines:
+                    k,_,v = line.replace('=',' ').partition(' ')
+                    if k.lower() == 'r_load':
+                        self.ramp['r_load'] = IbisNumber(v.strip())
+                    else:
+                        #dV/dt pairs, an NA corner is (nan, nan)
+                        pairs = [[IbisNumber(p) for p in c.split('/')][:2] for c in v.split()]
+                        self.ramp[k.lower()] = [tuple(p + [np.nan]*(2-len(p))) for p in pairs]
+            elif lines:
+                self.ranges[key] = tuple(IbisNumber(v) for v in lines[0].split()[:3])
+
+    def Value(self,param,corner='typ'):
+        #a number from the model parameters (C_comp typ min max), NA corners fall back to typ
+        values = [IbisNumber(v) for v in self.params[param.lower()].split()]
+        v = values[CORNERS[corner]] if CORNERS[corner] < len(values) else np.nan
+        return values[0] if np.isnan(v) else v
+
+class IbisFile:
+    def __init__(self,filename):
+        self.filename = filename
+        self.comment = '|'
+        self.models = {}         #model name (lower case) -> list of (keyword, start, end) byte ranges
+        self.components = {}     #component name -> (start, end)
+        self._parsed = {}        #models that have been parsed
+        with open(filename,'rb') as f, mmap.mmap(f.fileno(),0,access=mmap.ACCESS_READ) as mm:
+            found = [(m.start(),m.end(),Keyword(m.group(1).decode('ascii','replace'))) for m in KEYWORD.finditer(mm)]
+            size = mm.size()
+            for start,end,key in found:
+                if key == 'comment char':
+                    self.comment = mm[end:mm.find(b'\n',end)].decode('ascii').split()[0][0]
+        self.names = {}          #model name (lower case) -> model name as written
+        model = None
+        for i,(start,end,key) in enumerate(found):
+            stop = found[i+1][0] if i+1 < len(found) else size
+            if key == 'model':
+                model = self.ReadLines(end,stop)[0].split()[0]
+                self.names[model.lower()] = model
+                self.models[model.lower()] = [(key,end,stop)]
+            elif key in TOP_LEVEL:
+                model = None
+                if key == 'component':
+                    self.components[self.ReadLines(end,stop)[0].strip()] = (end,stop)
+            elif model is not None:
+                self.models[model.lower()].append((key,end,stop))
+
+    def ReadLines(self,start,stop):
+        #the lines between two byte offsets, without comments and blank lines
+        with open(self.filename,'rb') as f:
+            f.seek(start)
+            text = f.read(stop-start).decode('ascii','replace')
+        lines = [line.split(self.comment)[0].rstrip() for line in text.splitlines()]
+        return [line for line in lines if line.strip()]
+
+    def ModelNames(self):
+        return list(self.names.values())
+
+    def Model(self,name):
+        key = name.lower()
+        if key not in self._parsed:
+            if key not in self.models:
+                raise KeyError(f"no [Model] {name} in {self.filename}")
+            sections = []
+            for k,start,stop in self.models[key]:
+                lines = self.ReadLines(start,stop)
+                sections.append((k,lines[1:] if k == 'model' else lines))
+            self._parsed[key] = IbisModel(self.names[key],sections)
+        return self._parsed[key]
+
+_files = {}
+def OpenIbis(filename):
+    #IbisFile objects are kept, so the index and the parsed models are only made once while the file is unchanged
+    stat = os.stat(filename)
+    key = (os.path.abspath(filename),stat.st_mtime,stat.st_size)
+    if key not in _files:
+        _files[key] = IbisFile(filename)
+    return _files[key]
+
+class DriverModel:
+    #Output buffer of one corner of an IbisModel. Current is out of the pad (into the line), the IBIS tables
+    #are current into the pin, with the pullup and power clamp voltages measured from Vcc.
+    def __init__(self,model,corner='typ',vcc=None):
+        c = CORNERS[corner]
+        self.vcc = (model.ranges['pullup reference'] if 'pullup reference' in model.ranges
+                    else model.ranges['voltage range'])[c] if vcc is None else vcc
+        self.ramp = model.ramp
+        self.corner = c
+        tables = {}
+        for k,t in model.tables.items():
+            i = t[:,1+c] if np.all(np.isfinite(t[:,1+c])) else t[:,1]     #NA columns use typ
+            v = self.vcc - t[:,0] if k in ('pullup','power clamp') else t[:,0]
+            order = np.argsort(v)
+            tables[k] = (v[order],-i[order])
+        #all the tables on the same pad voltages, so the current is linear between grid points
+        self.v = np.unique(np.concatenate([t[0] for t in tables.values()]))
+        zero = np.zeros(self.v.size)
+        self.iUp = np.interp(self.v,*tables['pullup']) if 'pullup' in tables else zero
+        self.iDown = np.interp(self.v,*tables['pulldown']) if 'pulldown' in tables else zero
+        self.iClamp = sum((np.interp(self.v,*tables[k]) for k in ('gnd clamp','power clamp') if k in tables),zero)
+
+    def RampTime(self,rising=True,timeUnit=1e-9):
+        #0 to 100% switching time from the 20% to 80% [Ramp] rate, in units of timeUnit (nS)
+        corners = self.ramp['dv/dt_r' if rising else 'dv/dt_f']
+        dv,dt = corners[self.corner] if self.corner < len(corners) else (np.nan,np.nan)
+        if np.isnan(dv) or np.isnan(dt):
+            dv,dt = corners[0]     #NA corners use typ
+        return dt/0.6/timeUnit
+
+    def Current(self,vPad,state):
+        #current out of the pad at voltage vPad with the pullup switched on by state (0..1)
+        return (state*np.interp(vPad,self.v,self.iUp) + (1-state)*np.interp(vPad,self.v,self.iDown)
+                + np.interp(vPad,self.v,self.iClamp))
+
+    def Solve(self,state,vOpen,rSeries):
+        #pad voltage and current when the driver is connected to a Thevenin load vOpen through rSeries
+        #(the line is 2*incoming wave behind its impedance), for arrays of vOpen and rSeries.
+        #The tables are linear between grid points, so the balance of currents is too: find the grid
+        #interval where it changes sign and solve the straight line exactly. Outside the grid the end
+        #intervals are extended.
+        i = state*self.iUp + (1-state)*self.iDown + self.iClamp
+        f = i[None,:] - (self.v[None,:] - vOpen[:,None])/rSeries[:,None]  #decreases with the pad voltage
+        k = np.clip((f >= 0).sum(1) - 1,0,self.v.size-2)
+        rows = np.arange(vOpen.size)
+        f0, f1 = f[rows,k], f[rows,k+1]
+        vPad = self.v[k] + f0*(self.v[k+1] - self.v[k])/(f0 - f1)
+        return vPad, (vPad - vOpen)/rSeries
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 16:10:00 2026
+
+@author: MarcMignard
+"""
+import numpy as np
+from WaveEngine import Reflection, ProbePositions
+
+##########################################################################
+###   Lattice (bounce diagram) solution for a uniform lossless line with resistive ends
+###   https://en.wikipedia.org/wiki/Lattice_diagram
+###   The voltage at position x is a sum of delayed copies of the source drive:
+###     V(x,t) = srcDrv/(1+zSrc/zTrace) * sum over m of (Γsrc*Γterm)^m * [ s(t-x-2mT) + Γterm*s(t-2T+x-2mT) ]
+###   where T is the delay of the whole line. No spatial grid is needed, and the only interpolation
+###   is between the samples of srcDrv, so the result is exact for a piecewise linear drive.
+##########################################################################
+
+def LatticeWaves(srcDrv,zSrc,zTrace,zTerm,length,endT,probes=(0.,0.5,1.),decimate=1,tol=1e-6,maxBounces=10000):
+    #zSrc, zTrace, zTerm and length can be arrays (broadcast together), returns (config,ceil(nT/decimate),probes)
+    #probes are positions as a fraction of the line length (0=source, 1=load), see WaveEngine.ProbePositions
+    #bounces are summed until the rest of the series is below tol, or they arrive after endT, so tol only bounds
+    #the truncation of the series: the result is the bounce sum of the piecewise linear srcDrv for any length.
+    #The delay engine gives the same waves only when the line is a whole number of time steps long, otherwise
+    #it linearly interpolates the fractional delay of every trip and differs by that interpolation error.
+    zSrc,zTrace,zTerm,length = [a.ravel() for a in np.broadcast_arrays(*[np.asarray(p,dtype=float) for p in (zSrc,zTrace,zTerm,length)])]
+    pos = ProbePositions(probes)
+    nT = srcDrv.size              #number of time steps
+    dt = endT/nT                  #time step, velocity is 1 by definition
+    tIdx = np.arange(0,nT,decimate)
+    totalWave = np.zeros((length.size,tIdx.size,pos.size)) #array to return
+
+    drvScale = 1/(1+zSrc/zTrace)          #voltage divider between source and line
+    gSrc = Reflection(zSrc,zTrace)        #reflection coefficient looking into the source
+    gTerm = Reflection(zTerm,zTrace)      #reflection coefficient looking into the termination, inf is open
+    #srcDrv is zero before the simulation starts, and holds its last value after the end
+    drv = np.concatenate(([0],srcDrv,srcDrv[-1:]))
+    drvMax = np.abs(srcDrv).max()
+
+    def Delayed(delay):
+        #srcDrv delayed by delay (in time steps), linearly interpolated, for the stored time steps
+        u = tIdx[:,None] - delay[:,None,:] + 1
+        i = np.clip(np.floor(u).astype(int),0,nT)
+        w = u - i
+        return np.where(u < 0,0,(1-w)*drv[i] + w*drv[i+1])
+
+    x = pos*length[:,None]/dt        #delay of each probe from the source, in time steps
+    T = length[:,None]/dt            #delay of the whole line, in time steps
+    amp = drvScale.copy()
+    #bound on the sum of all the remaining bounces is amp*tailScale (geometric series)
+    tailScale = (1+np.abs(gTerm))*drvMax/np.maximum(1-np.abs(gSrc*gTerm),1e-300)
+    for m in np.arange(maxBounces):
+        #configurations that still have bounces that are large enough, and arrive before the end
+        active = (np.abs(amp)*tailScale >= tol) & (2*m*T[:,0] <= nT)
+        if not np.any(active):
+            break
+        rows = np.flatnonzero(active)
+        a = amp[rows,None,None]
+        totalWave[rows] += a*Delayed(x[rows]+2*m*T[rows])                               #right-going wave
+        totalWave[rows] += a*gTerm[rows,None,None]*Delayed(2*T[rows]-x[rows]+2*m*T[rows]) #left-going wave
+        amp = amp*gSrc*gTerm
+    return totalWave
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 21:00:00 2026
+
+@author: MarcMignard
+"""
+import numpy as np
+from WaveEngine import LineState, ProbePositions
+
+##########################################################################
+###   Impulse response and FFT overlap-add convolution for fixed line configurations
+###   The line and its terminations are linear and time invariant, and so is the delay engine: the probe
+###   waves are a convolution of srcDrv with the response to a single unit sample of drive. That response
+###   is simulated once, then each new srcDrv is an FFT convolution instead of a step by step simulation.
+###   https://en.wikipedia.org/wiki/Overlap%E2%80%93add_method
+##########################################################################
+
+def ImpulseResponse(zSrc,zTrace,zTerm,length,dt,probes=(0.,0.5,1.),tol=1e-9,maxT=2**20,**terms):
+    #response of the probes to srcDrv = [1,0,0,...] with time step dt, returns an array of (config,nH,probes)
+    #The reflections are run a round trip at a time until the last round trip adds less than tol of the
+    #total, or maxT steps. If nH == maxT the response was cut off before it died away (open or shorted ends).
+    #zSrc, zTrace, zTerm, length and terms (lSrc,cSrc,lTerm,cTerm) can be arrays, as in SweepWaves
+    state = LineState(zSrc,zTrace,zTerm,length,dt,ProbePositions(probes),**terms)
+    roundTrip = 2*int(state.lineTap.max()) + 2
+    h = [state.Advance(np.concatenate(([1.],np.zeros(roundTrip-1))))]
+    total = np.abs(h[0]).sum(1)
+    done = roundTrip
+    while done < maxT:
+        n = min(roundTrip,maxT-done)
+        h.append(state.Advance(np.zeros(n)))
+        done += n
+        last = np.abs(h[-1]).sum(1)
+        total += last
+        if np.all(last <= tol*total):
+            break
+    return np.concatenate(h,axis=1)
+
+class LineResponse:
+    #A batch of line configurations as an impulse response, Waves(srcDrv) gives the same result as
+    #SweepWaves(srcDrv,...) with endT = dt*srcDrv.size, to within tol of the largest drive sample
+    #cache is an optional SimCache, so the impulse response is only simulated once for each configuration
+    def __init__(self,zSrc,zTrace,zTerm,length,dt,probes=(0.,0.5,1.),tol=1e-9,maxT=2**20,cache=None,**terms):
+        self.args = (zSrc,zTrace,zTerm,length,dt,tuple(ProbePositions(probes)),tol)
+        self.terms = terms
+        self.cache = cache
+        self.Simulate(maxT)
+
+    def Simulate(self,maxT):
+        if self.cache is None:
+            self.h = ImpulseResponse(*self.args,maxT=maxT,**self.terms)
+        else:
+            self.h = self.cache.Call(ImpulseResponse,*self.args,maxT=maxT,**self.terms)
+        self.maxT = maxT
+        self.spectra = {}         #FFT of h for each FFT size that has been used
+
+    def Spectrum(self,nFFT):
+        if nFFT not in self.spectra:
+            self.spectra[nFFT] = np.fft.rfft(self.h,nFFT,axis=1)  #(config,frequency,probes)
+        return self.spectra[nFFT]
+
+    def Waves(self,srcDrv,decimate=1):
+        #srcDrv is one drive waveform (nT), or a batch of them (drive,nT)
+        #returns (config,ceil(nT/decimate),probes), or (drive,config,ceil(nT/decimate),probes) for a batch
+        drv = np.asarray(srcDrv,dtype=float)
+        batch = drv.reshape(-1,drv.shape[-1])
+        nT = batch.shape[1]
+        nH = self.h.shape[1]
+        if nH == self.maxT and nT > nH:
+            #the response did not die away, it has to be as long as the drive
+            self.Simulate(nT)
+            nH = self.h.shape[1]
+        #blocks of L drive samples, each convolved with an FFT of nFFT >= L+nH-1 points
+        nFFT = 1 << int(np.ceil(np.log2(min(nT,3*nH) + nH - 1)))
+        L = nFFT - nH + 1
+        nBlocks = -(-nT//L)
+        x = np.zeros((batch.shape[0],nBlocks*L))
+        x[:,:nT] = batch
+        X = np.fft.rfft(x.reshape(batch.shape[0],nBlocks,L),nFFT,axis=2)    #(drive,block,frequency)
+        H = self.Spectrum(nFFT)
+        seg = np.fft.irfft(X[:,None,:,:,None]*H[None,:,None,:,:],nFFT,axis=3) #(drive,config,block,time,probes)
+        #add the overlapping tails of the blocks, a block spills into the next -(-nFFT//L)-1 blocks
+        nSpill = -(-nFFT//L)
+        seg = np.pad(seg,((0,0),(0,0),(0,0),(0,nSpill*L-nFFT),(0,0)))
+        shape = seg.shape
+        totalWave = np.zeros((shape[0],shape[1],(nBlocks+nSpill)*L,shape[4]))
+        for j in range(nSpill):
+            totalWave[:,:,j*L:(j+nBlocks)*L,:] += seg[:,:,:,j*L:(j+1)*L,:].reshape(shape[0],shape[1],nBlocks*L,shape[4])
+        totalWave = totalWave[:,:,:nT:decimate,:]
+        return totalWave[0] if drv.ndim == 1 else totalWave.reshape(drv.shape[:-1]+totalWave.shape[1:])
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 21:40:00 2026
+
+@author: MarcMignard
+"""
+import numpy as np
+from WaveEngine import ProbePositions
+
+##########################################################################
+###   Lossy line with per unit length R, L, G, C, solved in the frequency domain
+###   https://en.wikipedia.org/wiki/Telegrapher%27s_equations
+###   At each frequency the series impedance is Z=R+sL and the shunt admittance is Y=G+sC, the propagation
+###   constant is γ=sqrt(ZY) and a piece of line of length d is the chain (ABCD) matrix
+###     [[cosh(γd), Z*d*sinh(γd)/(γd)], [Y*d*sinh(γd)/(γd), cosh(γd)]]
+###   which is well behaved at DC, unlike Zc=sqrt(Z/Y). R and G can be functions of frequency (skin effect,
+###   dielectric loss). The chain matrices from each probe to the load are the kernels, they depend only on
+###   the line, so they are computed once and used for every drive waveform and termination.
+###   The drive is damped by exp(-σt) before the FFT and the result multiplied by exp(σt) afterwards, which is
+###   the same as evaluating everything at s=σ+jω. Reflections that would wrap around the end of the FFT onto
+###   the start of the waveform are then attenuated by exp(-σ*nFFT*dt)=tol, however slowly the line settles.
+###   So R and G functions get the complex frequency f=s/(2πj), and should be analytic like the ones below.
+###   https://en.wikipedia.org/wiki/Two-port_network#ABCD-parameters
+##########################################################################
+
+def SkinEffect(rDC,rSkin):
+    #R(f) = rDC + rSkin*(1+j)*sqrt(f), rSkin is the resistance per unit length at a frequency of 1
+    #the (1+j) is the internal inductance that goes with skin effect, it keeps the impulse response causal
+    return lambda f: rDC + rSkin*(1+1j)*np.sqrt(f)
+
+def DielectricLoss(C,tanD):
+    #G(f) = 2*pi*f*C*tanD for a dielectric with a constant loss tangent
+    #this is not quite causal, a small part of the edge arrives before the delay of the line
+    return lambda f: 2*np.pi*f*C*tanD
+
+def Sinhc(z):
+    small = np.abs(z) < 1e-8
+    return np.where(small,1,np.sinh(z)/np.where(small,1,z))
+
+class LossyLine:
+    #R,L,G,C per unit length (ohm, ohm*time, 1/ohm, time/ohm: nH and nF per unit length when time is in nS)
+    #R and G are numbers or functions of frequency (1/time, see above), length in the same units as R,L,G,C
+    #dt is the time step of the drive waveforms, probes are positions as a fraction of the line length
+    def __init__(self,R,L,G,C,length,dt,probes=(0.,0.5,1.)):
+        self.R, self.L, self.G, self.C = R, L, G, C
+        self.length = length
+        self.dt = dt
+        self.pos = ProbePositions(probes)
+        self.kernels = {}                      #chain matrices for each FFT size that has been used
+
+    def Sigma(self,nFFT,tol):
+        #damping that makes the part of the response that wraps around the FFT smaller than tol
+        return np.log(1/tol)/(nFFT*self.dt)
+
+    def Kernels(self,nFFT,tol):
+        #s, and the chain matrix entries (A,B,C,D) of the whole line and (A,B) from each probe to the load
+        if (nFFT,tol) not in self.kernels:
+            s = self.Sigma(nFFT,tol) + 2j*np.pi*np.fft.rfftfreq(nFFT,self.dt)
+            f = s/(2j*np.pi)
+            R = self.R(f) if callable(self.R) else self.R
+            G = self.G(f) if callable(self.G) else self.G
+            Z = R + s*self.L
+            Y = G + s*self.C
+            gamma = np.sqrt(Z*Y)
+            d = self.length*np.concatenate(([1.],1-self.pos))[:,None]  #whole line, then each probe to the load
+            gd = gamma*d
+            sc = Sinhc(gd)
+            self.kernels[nFFT,tol] = (s, np.cosh(gd), Z*d*sc, Y*d*sc)
+        return self.kernels[nFFT,tol]
+
+    def Transfer(self,nFFT,tol,zSrc,zTerm,lSrc=0,cSrc=0,lTerm=0,cTerm=np.inf):
+        #V(probe)/srcDrv at each frequency of Kernels(nFFT,tol), (config,frequency,probes)
+        #terminations are the same as SweepWaves, arrays broadcast together, the reactances are exact (no companion model)
+        zSrc,zTerm,lSrc,cSrc,lTerm,cTerm = [a.ravel()[:,None] for a in np.broadcast_arrays(
+            *[np.asarray(p,dtype=float) for p in (zSrc,zTerm,lSrc,cSrc,lTerm,cTerm)])]
+        s, ch, zb, yc = self.Kernels(nFFT,tol)
+        with np.errstate(divide='ignore',invalid='ignore'):
+            #load admittance of zTerm, lTerm and cTerm in series, 0 for an open circuit
+            yL = np.where(np.isinf(cTerm),1/(zTerm + s*lTerm),s*cTerm/(s*cTerm*(zTerm + s*lTerm) + 1))
+        yL = np.where(np.isinf(zTerm),0,yL)
+        zSeries = zSrc + s*lSrc
+        vIn = ch[0] + zb[0]*yL                   #line input voltage per volt at the load
+        iIn = yc[0] + ch[0]*yL + s*cSrc*vIn      #current from the source, including the source capacitor
+        return ((ch[1:,None,:] + zb[1:,None,:]*yL)/(vIn + zSeries*iIn)).transpose(1,2,0)
+
+    def Waves(self,srcDrv,zSrc,zTerm,decimate=1,tol=1e-10,**terms):
+        #srcDrv is one drive waveform (nT), or a batch of them (drive,nT), sampled every dt
+        #returns (config,ceil(nT/decimate),probes), or (drive,config,ceil(nT/decimate),probes) for a batch
+        drv = np.asarray(srcDrv,dtype=float)
+        batch = drv.reshape(-1,drv.shape[-1])
+        nT = batch.shape[1]
+        nFFT = 1 << int(np.ceil(np.log2(2*nT)))
+        sigma = self.Sigma(nFFT,tol)
+        damp = np.exp(-sigma*self.dt*np.arange(nFFT))
+        H = self.Transfer(nFFT,tol,zSrc,zTerm,**terms)
+        #srcDrv holds its last value after the end, a step back to zero would ring back into the waveform
+        padded = np.concatenate((batch,np.repeat(batch[:,-1:],nFFT-nT,axis=1)),axis=1)
+        X = np.fft.rfft(padded*damp,axis=1)
+        totalWave = np.fft.irfft(X[:,None,:,None]*H[None],nFFT,axis=2)[:,:,:nT,:]/damp[:nT,None]
+        totalWave = totalWave[:,:,::decimate,:]
+        return totalWave[0] if drv.ndim == 1 else totalWave.reshape(drv.shape[:-1]+totalWave.shape[1:])
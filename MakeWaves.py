@@ -5,224 +5,400 @@ Created on Wed Oct 25 10:00:16 2023
 @author: MarcMignard
 ΑΒΓΔΕΖΗΘΙΚΛΜΝΞΟΠΡΣΤΥΦΧΨΩαβγδεζηθικλμνξοπρσςτυφχψωάέήϊίόύϋώΆΈΉΊΌΎΏ±≥≤ΪΫ÷≈°√ⁿ²ˑ∂
 """
+import os
+import sys
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib import animation
 #For animations to work in Spyder IDE, have to run '%matplotlib qt5', switch back with '%matplotlib inline'
 
 ##########################################################################
-###   This code implements the d'Alembert solution to the 1-dimensional lossless wave equation
-###   wave equation: https://en.wikipedia.org/wiki/Wave_equation and https://en.wikipedia.org/wiki/Telegrapher%27s_equations
-###   d'Alembert solution: https://en.wikipedia.org/wiki/D%27Alembert%27s_formula
-##########################################################################
-
-def MakeWaves(srcDrv,zSrc,zTrace,zTerm,length,nX,endT):
-    rightWave = np.zeros(nX+2)    #wave going in direction from source to load
-    leftWave = np.zeros(nX+2)     #wave going in direction from load to source
-    nT = srcDrv.size              #number of time steps
-    totalWave = np.zeros((nT,nX)) #array to return
-    x = np.linspace(-1/(nX-1),1+1/(nX-1),nX+2)*length
-    #The points on the left and right of x are one simulation time step away from the physical line
-    #This allows simple linear interpolation to update the simulation step
-    velocity = 1 #by definition
-    x[0] = -velocity*endT/nT
-    x[-1] = length + velocity*endT/nT
-    
-    #for all the time steps in the simulation
-    for tIdx in np.arange(nT):
-        temp = rightWave[-1] #need to save this before updating rightWave
-        #at the beginning is both the source (through the zSrc/zTrace voltage divider), and the reflection from the left-going wave
-        rightWave[0] = srcDrv[tIdx]/(1+zSrc/zTrace) + leftWave[0]*(zSrc-zTrace)/(zSrc+zTrace) 
-        rightWave = np.interp(x-endT/nT,x,rightWave)
-        #at the end is the reflection from the right-going wave
-        leftWave[-1] = temp*(zTerm-zTrace)/(zTerm+zTrace)
-        leftWave =  np.interp(x+endT/nT,x,leftWave)
-        totalWave[tIdx,:] = rightWave[1:-1] + leftWave[1:-1]
-    return totalWave
+###   The wave engine (d'Alembert solution of the lossless wave equation) is in WaveEngine.py
+###   MakeWaves(...,method='interp') gives the original interpolating solution for comparison
+###   Each figure is a function, nothing is simulated or plotted when this file is imported, and matplotlib
+###   (and schemdraw) are only imported by the functions that draw. Run this file to make all of them,
+###   or one at a time with 'python Tline.py render'
+##########################################################################
+from WaveEngine import SweepWaves
+from SimCache import SimCache
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+MEDIA = os.path.join(HERE,'media')
 
 #rise time and velocity are one unit by definition
-zSrc = 100      #source impedance
 zTrace = 100    #characteristic impedance of transmission line
 zTerm = 1e6     #load termination impedance
-length = 0.5    #length in units of rise time
-nX = 1000       #number of simulation steps in distance dimension
-nT = 2000       #number of simulation steps in time dimension. Generally this needs to be > nX
 endT = 20       #simulation end time in units of propagation delay along total length
 maxV = 1        #maximum drive voltage
-sRise = np.linspace(0,endT/2,int(nT/2))
-#srcDrv contains both a rising edge and a falling edge
-srcDrv = np.clip(np.concatenate((maxV*sRise,maxV*(1-sRise))),0,maxV)
-t = np.linspace(0,endT,nT)
 
-#show what the source drive waveform looks like
-# plt.figure()
-# plt.plot(t,srcDrv)
-# plt.show()
+def Drive(nT,endT=endT,maxV=maxV):
+    #srcDrv contains both a rising edge and a falling edge, and the time of each step
+    sRise = np.linspace(0,endT/2,int(nT/2))
+    srcDrv = np.clip(np.concatenate((maxV*sRise,maxV*(1-sRise))),0,maxV)
+    t = np.linspace(0,endT,nT)
+    return srcDrv, t
+
+def Cache():
+    #waves that were already simulated are read from .simcache next to this file
+    return SimCache(os.path.join(HERE,'.simcache'))
 
 ##########################################################################
 ###  Subplots of voltage versus time
-###     
+###
 ##########################################################################
 params = [[321,0.25,20,'fine everywhere'],[322,0.25,100,'fine everywhere'],
           [323,0.5,20,'undershoot bad'],[324,0.5,100,'fine everywhere'],
           [325,1,20,'undershoot bad'],[326,1,100,'load ok, problem near source']] #[subplot,length,zSrc]
-plt.figure(figsize=(8,8),dpi=150)
-plt.suptitle(f'Voltage versus time of several stub lengths and source impedances, zTrace={zTrace}', y=0.92)
-
-for i in range(len(params)):
-    length = params[i][1]     #length in units of rise time
-    zSrc = params[i][2]       #source impedance
-    totalWave = MakeWaves(srcDrv,zSrc,zTrace,zTerm,length,nX,endT)
-    Vovershoot = maxV*2/(1+zSrc/zTrace)   
-    Vundershoot = maxV*2/(1+zSrc/zTrace)*(1+(zSrc-zTrace)/(zSrc+zTrace))
-    plt.subplot(params[i][0])
-    #plt.title(f'length={length}, zSrc={zSrc}')
-    plt.plot(t,totalWave[:,-1],'--',label='load')
-    plt.plot(t,totalWave[:,int(nX/2)],label='middle')
-    plt.plot(t,totalWave[:,0],':',label='source')
-    plt.xlim([-0.1,t[-1]+0.1])
-    plt.ylim([-0.8,maxV*1.8])
-    plt.grid(True)
-    plt.legend(loc='upper right')
-    plt.text(0.1,-0.7,f'length={length}, zSrc={zSrc}')
-    plt.text(0.1,-0.4,params[i][3])
-    if i==2:
-        plt.annotate('', xy=(2.5,Vundershoot), xytext=(2,-0.2), arrowprops=dict(facecolor='black', width=1, headwidth=5, headlength=8))
-    if i==4:
-        plt.annotate('', xy=(4,Vundershoot), xytext=(2.5,-0.2), arrowprops=dict(facecolor='black', width=1, headwidth=5, headlength=8))
-    if i==5:
-        plt.annotate('', xy=(2,0.5), xytext=(4,-0.2), arrowprops=dict(facecolor='black', width=1, headwidth=5, headlength=8))
-    if i%2==0:
+
+def PlotReflections(cache=None,nX=1000,nT=2000,save=True):
+    #nX is the number of simulation steps in distance dimension
+    #nT is the number of simulation steps in time dimension. Generally this needs to be > nX
+    import matplotlib.pyplot as plt
+    cache = Cache() if cache is None else cache
+    srcDrv, t = Drive(nT)
+    plt.figure(figsize=(8,8),dpi=150)
+    plt.suptitle(f'Voltage versus time of several stub lengths and source impedances, zTrace={zTrace}', y=0.92)
+
+    #all six configurations are simulated together, only keeping the source, middle and load points
+    sweepWaves = cache.Call(SweepWaves,srcDrv,[p[2] for p in params],zTrace,zTerm,[p[1] for p in params],nX,endT,probes=[0,int(nX/2),-1])
+    for i in range(len(params)):
+        length = params[i][1]     #length in units of rise time
+        zSrc = params[i][2]       #source impedance
+        totalWave = sweepWaves[i]
+        Vovershoot = maxV*2/(1+zSrc/zTrace)
+        Vundershoot = maxV*2/(1+zSrc/zTrace)*(1+(zSrc-zTrace)/(zSrc+zTrace))
+        plt.subplot(params[i][0])
+        #plt.title(f'length={length}, zSrc={zSrc}')
+        plt.plot(t,totalWave[:,2],'--',label='load')
+        plt.plot(t,totalWave[:,1],label='middle')
+        plt.plot(t,totalWave[:,0],':',label='source')
+        plt.xlim([-0.1,t[-1]+0.1])
+        plt.ylim([-0.8,maxV*1.8])
+        plt.grid(True)
+        plt.legend(loc='upper right')
+        plt.text(0.1,-0.7,f'length={length}, zSrc={zSrc}')
+        plt.text(0.1,-0.4,params[i][3])
+        if i==2:
+            plt.annotate('', xy=(2.5,Vundershoot), xytext=(2,-0.2), arrowprops=dict(facecolor='black', width=1, headwidth=5, headlength=8))
+        if i==4:
+            plt.annotate('', xy=(4,Vundershoot), xytext=(2.5,-0.2), arrowprops=dict(facecolor='black', width=1, headwidth=5, headlength=8))
+        if i==5:
+            plt.annotate('', xy=(2,0.5), xytext=(4,-0.2), arrowprops=dict(facecolor='black', width=1, headwidth=5, headlength=8))
+        if i%2==0:
+            plt.ylabel('voltage')
+            #plt.plot([0,t[-1]],[Vovershoot,Vovershoot],'k:')
+            #plt.plot([0,t[-1]],[Vundershoot,Vundershoot],'k:')
+        if i==4 or i==5:
+            plt.xlabel('time (units of rise time)')
+    if save:
+        plt.savefig(os.path.join(MEDIA,'reflections.svg'), bbox_inches='tight')
+    plt.show()
+
+    #the same observations measured from the waveforms (see SIMetrics.py), worst of source, middle and load,
+    #on stderr so 'Tline.py render' output stays clean
+    from SIMetrics import WaveMetrics
+    metrics = WaveMetrics(sweepWaves,endT/nT)
+    for i in range(len(params)):
+        print(f"length={params[i][1]}, zSrc={params[i][2]}: overshoot={metrics['overshoot'][i].max():.2f}V, "
+              f"undershoot={metrics['undershoot'][i].max():.2f}V, Vih margin={np.nanmin(metrics['ringbackMargin'][i]):.2f}V, "
+              f"settled by t={np.nanmax(metrics['settle'][i]):.2f}",file=sys.stderr)
+    return sweepWaves
+
+##########################################################################
+###   Reactive terminations, same cases as the LTSpice simulations in TlineLTSpice.py
+###   Time is in units of rise time (1nS), so capacitance is in nF
+##########################################################################
+
+def PlotReactive(cache=None,nX=1000,nT=2000):
+    import matplotlib.pyplot as plt
+    cache = Cache() if cache is None else cache
+    srcDrv, t = Drive(nT)
+
+    #source series R with capacitor to ground (singleTrace_RCsrc), length=2, probes at source, 1/4 and load
+    CSs = np.asarray([1,10,50,100])   #pF
+    rcWaves = cache.Call(SweepWaves,srcDrv,100,zTrace,zTerm,2,nX,endT,probes=[0.,0.25,1.],cSrc=CSs[:,None]*1e-3)
+    plt.figure(figsize=(5,8),dpi=150)
+    plt.suptitle(f'Source series RC termination\nzSrc=100Ω, zTrace={zTrace}Ω, zTerm=open')
+    for cs in np.arange(CSs.size):
+        plt.subplot(CSs.size,1,cs+1)
+        plt.plot(t,rcWaves[cs,:,2],'--',label='load')
+        plt.plot(t,rcWaves[cs,:,1],label='middle')
+        plt.plot(t,rcWaves[cs,:,0],':',label='source')
+        plt.grid(True)
+        if 0==cs:
+            plt.ylabel('voltage (source=1V)')
+        plt.xlim(0,20)
+        plt.ylim(0,1.25)
+        plt.text(5,0.1,f'CS = {CSs[cs]}pF')
+    plt.legend()
+    plt.xlabel('time (scaled by rise time)')
+    plt.show()
+
+    #load series RC to ground (singleTrace_loadRC), length=2, probes at source, middle and load
+    CLs = np.asarray([5,20,100])     #pF
+    rcWaves = cache.Call(SweepWaves,srcDrv,20,zTrace,100,2,nX,endT,probes=[0.,0.5,1.],cTerm=CLs[:,None]*1e-3)
+    plt.figure(figsize=(4,5),dpi=150)
+    plt.suptitle(f'Parallel load termination\nzSrc=20Ω, zTrace={zTrace}Ω, zTerm=100Ω||xx pF')
+    for cl in np.arange(CLs.size):
+        plt.subplot(CLs.size,1,cl+1)
+        plt.plot(t,rcWaves[cl,:,2],'--',label='load')
+        plt.plot(t,rcWaves[cl,:,1],label='middle')
+        plt.plot(t,rcWaves[cl,:,0],':',label='source')
+        plt.grid(True)
         plt.ylabel('voltage')
-        #plt.plot([0,t[-1]],[Vovershoot,Vovershoot],'k:')
-        #plt.plot([0,t[-1]],[Vundershoot,Vundershoot],'k:')
-    if i==4 or i==5:
-        plt.xlabel('time (units of rise time)')
-plt.savefig('./media/reflections.svg', bbox_inches='tight')
-plt.show()
+        plt.xlim(0,20)
+        plt.ylim(-0.8,1.8)
+        plt.text(0.1,-0.7,f'CL = {CLs[cl]}pF')
+    plt.legend()
+    plt.xlabel('time (scaled by rise time)')
+    plt.show()
 
 ##########################################################################
 ###   Animation plot of voltage versus position
-###     
+###
 ##########################################################################
 '''
 Need large nX=1000,nT=2000 for simulation of voltage vs time to match LTSpice.
 But want small nX=50,nT=100 to make reasonable sized animated GIFs of voltage vs position.
+(FuncAnimation is slow at full resolution, ExportPositionVideo renders the frames directly and does not need this.)
+For voltage vs time, AutoWaves in WaveEngine.py picks the coarsest grid for a given accuracy instead.
 '''
-zSrc = 100      #source impedance
-zTrace = 100    #characteristic impedance of transmission line
-zTerm = 1e6     #load termination impedance
-nX = 50         #number of simulation steps in distance dimension
-nT = 100        #number of simulation steps in time dimension. Generally this needs to be > nX
-endT = 20       #simulation end time in units of propagation delay along total length
-maxV = 1        #maximum drive voltage
-sRise = np.linspace(0,endT/2,int(nT/2))
-#srcDrv contains both a rising edge and a falling edge
-srcDrv = np.clip(np.concatenate((maxV*sRise,maxV*(1-sRise))),0,maxV)
-t = np.linspace(0,endT,nT)
-
-xOne = np.linspace(0,1,nX)
-waveOne20 = MakeWaves(srcDrv,20,zTrace,zTerm,1,nX,endT)
-waveOne100 = MakeWaves(srcDrv,100,zTrace,zTerm,1,nX,endT)
-xHalf = np.linspace(0,0.5,nX)
-waveHalf20 = MakeWaves(srcDrv,20,zTrace,zTerm,0.5,nX,endT)
-waveHalf100 = MakeWaves(srcDrv,100,zTrace,zTerm,0.5,nX,endT)
-xQuarter = np.linspace(0,0.25,nX)
-waveQuarter20 = MakeWaves(srcDrv,20,zTrace,zTerm,0.25,nX,endT)
-waveQuarter100 = MakeWaves(srcDrv,100,zTrace,zTerm,0.25,nX,endT)
-
-def updateline(num, axOne20, axHalf20, axQuarter20, waveOne20, waveHalf20, waveQuarter20, 
-               axOne100, axHalf100, axQuarter100, waveOne100, waveHalf100, waveQuarter100):
-    axOne20.set_data(xOne,waveOne20[num,:])
-    axHalf20.set_data(xHalf,waveHalf20[num,:]+1)
-    axQuarter20.set_data(xQuarter,waveQuarter20[num,:]+2)
-    axOne100.set_data(xOne,waveOne100[num,:])
-    axHalf100.set_data(xHalf,waveHalf100[num,:]+1)
-    axQuarter100.set_data(xQuarter,waveQuarter100[num,:]+2)
-    #time_text.set_text("Points: %.0f" % int(num))
-    return axOne20,axHalf20,axQuarter20,axOne100,axHalf100,axQuarter100
-
-fig, (ax20, ax100) = plt.subplots(1,2,figsize=(7,4),dpi=150)
-plt.suptitle(f'Voltage versus position, zTrace={zTrace}') #, y=0.92)
-plt.subplot(121)
-plt.title(f'zSrc=20')
-plt.grid(True)
-plt.xlabel('position (units of tRiseˑvelocity)')
-plt.ylabel('voltage')
-
-plt.subplot(122)
-plt.title(f'zSrc=100')
-plt.grid(True)
-plt.xlabel('position (units of tRiseˑvelocity)')
-
-ax20.set_ylim(-0.8, 3.5)
-ax20.set_xlim(0, 1)
-ax100.set_ylim(-0.8, 3.5)
-ax100.set_xlim(0, 1)
-axOne20 = ax20.plot([], [], 'r-', label="One")[0]
-axHalf20 = ax20.plot([], [], 'b-', label="Half")[0]
-axQuarter20 = ax20.plot([], [], 'k-', label="Quarter")[0]
-axOne100 = ax100.plot([], [], 'r-', label="One")[0]
-axHalf100 = ax100.plot([], [], 'b-', label="Half")[0]
-axQuarter100 = ax100.plot([], [], 'k-', label="Quarter")[0]
 
-#For animations to work in Spyder IDE, have to run '%matplotlib qt5', switch back with '%matplotlib inline'
-#Change to interval=10 to save video. Real time animation runs slower, so use interval=5
-anim = animation.FuncAnimation(fig, updateline, frames=waveHalf20.shape[0], interval=10, blit=True, fargs=(axOne20, axHalf20, axQuarter20, waveOne20, waveHalf20, waveQuarter20, 
-               axOne100, axHalf100, axQuarter100, waveOne100, waveHalf100, waveQuarter100))
+def PositionWaves(cache=None,nX=50,nT=100):
+    #lengths [1,0.5,0.25] for each of zSrc [20,100], simulated together
+    #returns (waveOne20,waveHalf20,waveQuarter20,waveOne100,waveHalf100,waveQuarter100)
+    cache = Cache() if cache is None else cache
+    srcDrv, t = Drive(nT)
+    return cache.Call(SweepWaves,srcDrv,[[20],[100]],zTrace,zTerm,[1,0.5,0.25],nX,endT)
+
+def AnimatePosition(cache=None,nX=50,nT=100,gif=None):
+    #gif is a file name to save the animation to, with Pillow
+    import matplotlib.pyplot as plt
+    from matplotlib import animation
+    xOne = np.linspace(0,1,nX)
+    xHalf = np.linspace(0,0.5,nX)
+    xQuarter = np.linspace(0,0.25,nX)
+    (waveOne20,waveHalf20,waveQuarter20,waveOne100,waveHalf100,waveQuarter100) = PositionWaves(cache,nX,nT)
+
+    def updateline(num, axOne20, axHalf20, axQuarter20, waveOne20, waveHalf20, waveQuarter20,
+                   axOne100, axHalf100, axQuarter100, waveOne100, waveHalf100, waveQuarter100):
+        axOne20.set_data(xOne,waveOne20[num,:])
+        axHalf20.set_data(xHalf,waveHalf20[num,:]+1)
+        axQuarter20.set_data(xQuarter,waveQuarter20[num,:]+2)
+        axOne100.set_data(xOne,waveOne100[num,:])
+        axHalf100.set_data(xHalf,waveHalf100[num,:]+1)
+        axQuarter100.set_data(xQuarter,waveQuarter100[num,:]+2)
+        #time_text.set_text("Points: %.0f" % int(num))
+        return axOne20,axHalf20,axQuarter20,axOne100,axHalf100,axQuarter100
+
+    fig, (ax20, ax100) = plt.subplots(1,2,figsize=(7,4),dpi=150)
+    plt.suptitle(f'Voltage versus position, zTrace={zTrace}') #, y=0.92)
+    plt.subplot(121)
+    plt.title(f'zSrc=20')
+    plt.grid(True)
+    plt.xlabel('position (units of tRiseˑvelocity)')
+    plt.ylabel('voltage')
+
+    plt.subplot(122)
+    plt.title(f'zSrc=100')
+    plt.grid(True)
+    plt.xlabel('position (units of tRiseˑvelocity)')
+
+    ax20.set_ylim(-0.8, 3.5)
+    ax20.set_xlim(0, 1)
+    ax100.set_ylim(-0.8, 3.5)
+    ax100.set_xlim(0, 1)
+    axOne20 = ax20.plot([], [], 'r-', label="One")[0]
+    axHalf20 = ax20.plot([], [], 'b-', label="Half")[0]
+    axQuarter20 = ax20.plot([], [], 'k-', label="Quarter")[0]
+    axOne100 = ax100.plot([], [], 'r-', label="One")[0]
+    axHalf100 = ax100.plot([], [], 'b-', label="Half")[0]
+    axQuarter100 = ax100.plot([], [], 'k-', label="Quarter")[0]
+
+    #For animations to work in Spyder IDE, have to run '%matplotlib qt5', switch back with '%matplotlib inline'
+    #Change to interval=10 to save video. Real time animation runs slower, so use interval=5
+    anim = animation.FuncAnimation(fig, updateline, frames=waveHalf20.shape[0], interval=10, blit=True, fargs=(axOne20, axHalf20, axQuarter20, waveOne20, waveHalf20, waveQuarter20,
+                   axOne100, axHalf100, axQuarter100, waveOne100, waveHalf100, waveQuarter100))
 
-#Steps required to create html5 videos:
-#  1) pip install ffmpeg-python
-#  2) download and install ffmpeg from https://www.ffmpeg.org/download.html
-#  3) add path to ffmpgeg.exe using "edit ENV"
-#  4) in new cmd window, type "ffmpeg -version" to make sure it works
-# printing to file takes a long time
-# ffmpeg is not required just to view the files
-# with open(f"./media/StubsVideo.html", "w") as f:
-#     print(anim.to_html5_video(), file=f)
+    #ExportPositionVideo below writes the same animation at full resolution (nX=1000, nT=2000) much faster
+    #Steps required to create html5 videos:
+    #  1) pip install ffmpeg-python
+    #  2) download and install ffmpeg from https://www.ffmpeg.org/download.html
+    #  3) add path to ffmpgeg.exe using "edit ENV"
+    #  4) in new cmd window, type "ffmpeg -version" to make sure it works
+    # printing to file takes a long time
+    # ffmpeg is not required just to view the files
+    # with open(os.path.join(MEDIA,'StubsVideo.html'), "w") as f:
+    #     print(anim.to_html5_video(), file=f)
 
-# To save the animation using Pillow as a gif (pip install Pillow)
-# writer = animation.PillowWriter(fps=60,
-#                                 metadata=dict(artist='Me'),
-#                                 bitrate=1800)
-# anim.save(f"./media/StubsVideo.gif", writer=writer)
+    # To save the animation using Pillow as a gif (pip install Pillow), for example gif=os.path.join(MEDIA,'StubsVideo.gif')
+    if gif is not None:
+        writer = animation.PillowWriter(fps=60,
+                                        metadata=dict(artist='Me'),
+                                        bitrate=1800)
+        anim.save(gif, writer=writer)
 
-plt.show()
+    plt.show()
+    return anim
+
+def ExportPositionVideo(filename=os.path.join(MEDIA,'StubsVideo.gif'),cache=None,nX=1000,nT=2000,fps=60,step=1,workers=None):
+    #the animation of AnimatePosition written straight to a video file with FrameExport.py, the extension
+    #picks the format (.mp4 and others need ffmpeg, .gif works with Pillow only), returns the number of frames
+    from FrameExport import ExportAnimation
+    x = [np.linspace(0,length,nX) for length in (1,0.5,0.25)]
+    waves = PositionWaves(cache,nX,nT)
+    panels = [dict(title=f'zSrc={zSrc}',xlim=(0,1),ylim=(-0.8,3.5),xlabel='position (units of tRiseˑvelocity)',
+                   ylabel='voltage' if i == 0 else '',
+                   curves=[(x[0],waves[3*i],0,'r'),(x[1],waves[3*i+1],1,'b'),(x[2],waves[3*i+2],2,'k')])
+              for i,zSrc in enumerate((20,100))]
+    return ExportAnimation(filename,panels,fps,step,suptitle=f'Voltage versus position, zTrace={zTrace}',workers=workers)
+
+##########################################################################
+###   Stubs: one long line, V shaped split and Y shaped split (same topology as LTSpice/dualTrace.asc)
+###
+##########################################################################
+
+def PlotStubs(cache=None,nT=2000):
+    import matplotlib.pyplot as plt
+    from TlineNetwork import NetworkWaves
+    cache = Cache() if cache is None else cache
+    zSrc = 20       #source impedance
+    srcDrv, t = Drive(nT)
+    topologies = [['one long line, length=1',[('vs','vl1',zTrace,1)]],
+                  ['V split, two lines of length=1',[('vs','vl1',zTrace,1),('vs','vl2',zTrace,1)]],
+                  ['Y split, 0.5 then two lines of 0.5',[('vs','vm',zTrace,0.5),('vm','vl1',zTrace,0.5),('vm','vl2',zTrace,0.5)]]]
+    plt.figure(figsize=(5,8),dpi=150)
+    plt.suptitle(f'Splitting lines, zSrc={zSrc}Ω, zTrace={zTrace}Ω, zTerm=open')
+    for i in range(len(topologies)):
+        plt.subplot(len(topologies),1,i+1)
+        stubWaves = cache.Call(NetworkWaves,srcDrv,topologies[i][1],endT,{'vs':zSrc},{'vl1':zTerm},probes=['vs','vl1'])
+        plt.plot(t,stubWaves[:,1],'--',label='load')
+        plt.plot(t,stubWaves[:,0],':',label='source')
+        plt.grid(True)
+        plt.ylabel('voltage')
+        plt.xlim(0,20)
+        plt.ylim(-0.8,1.8)
+        plt.text(0.1,-0.7,topologies[i][0])
+    plt.legend()
+    plt.xlabel('time (scaled by rise time)')
+    plt.show()
+
+##########################################################################
+###   Lossy lines: skin effect and dielectric loss slow the edge at the load of a long trace
+###   zTrace=100Ω with velocity 1 is L=100 and C=0.01 per unit length, see LossyLine.py
+##########################################################################
+
+def PlotLossy(nT=2000,length=10):
+    #length is a long trace, in units of rise time
+    import matplotlib.pyplot as plt
+    from LossyLine import LossyLine, SkinEffect, DielectricLoss
+    srcDrv, t = Drive(nT)
+    lossless = LossyLine(0,zTrace,0,1/zTrace,length,endT/nT,probes=[0.,1.])
+    lossy = LossyLine(SkinEffect(0.5,5),zTrace,DielectricLoss(1/zTrace,0.02),1/zTrace,length,endT/nT,probes=[0.,1.])
+    plt.figure(figsize=(5,4),dpi=150)
+    plt.title(f'Lossy line, length={length}, zSrc={zTrace}Ω, zTrace={zTrace}Ω, zTerm=open')
+    for line,name in [(lossless,'lossless'),(lossy,'lossy')]:
+        lossWaves = line.Waves(srcDrv,zTrace,zTerm)[0]
+        plt.plot(t,lossWaves[:,1],label=f'load, {name}')
+        plt.plot(t,lossWaves[:,0],':',label=f'source, {name}')
+    plt.grid(True)
+    plt.ylabel('voltage')
+    plt.xlabel('time (scaled by rise time)')
+    plt.xlim(0,20)
+    plt.legend()
+    plt.show()
+
+##########################################################################
+###   Crosstalk on a bus of 4 coupled traces, the victim is line 1 between aggressors 0 and 2
+###   L and C per unit length of ~50Ω traces with velocity ~1, see CoupledLines.py
+##########################################################################
+
+def PlotCrosstalk(nT=2000,length=2,nLines=4):
+    #length is in units of rise time
+    import matplotlib.pyplot as plt
+    from CoupledLines import CoupledWaves, Crosstalk
+    srcDrv, t = Drive(nT)
+    near = np.eye(nLines,k=1) + np.eye(nLines,k=-1)
+    L = 50*(np.eye(nLines) + 0.15*near)
+    C = (np.eye(nLines)*1.1 - 0.1*near)/50
+    patterns = np.asarray([[1,0,0,0],[1,0,1,0],[-1,0,-1,0],[1,0,1,1]])
+    busWaves = CoupledWaves(srcDrv,L,C,50,50,length,endT,patterns=patterns,probes=(0.,1.))
+    xtalk = Crosstalk(busWaves,patterns)
+    plt.figure(figsize=(5,4),dpi=150)
+    plt.title(f'Crosstalk on line 1, length={length}, zSrc=zTerm=50Ω')
+    for p in range(len(patterns)):
+        plt.plot(t,busWaves[p,:,0,1],label=f'near end, aggressors {patterns[p]}')
+        plt.plot(t,busWaves[p,:,1,1],':',label=f'far end, aggressors {patterns[p]}')
+        print(f"aggressors {patterns[p]}: NEXT={xtalk['next'][p,1]:.3f}, FEXT={xtalk['fext'][p,1]:.3f}",file=sys.stderr)
+    plt.grid(True)
+    plt.ylabel('voltage')
+    plt.xlabel('time (scaled by rise time)')
+    plt.xlim(0,20)
+    plt.legend(fontsize=6)
+    plt.show()
+    return xtalk
+
+##########################################################################
+###   Cheapest termination of the open line in the 'mistune' figure of TlineLTSpice.py
+###   instead of trying source resistors by hand, search them with the native engine (TermOptimizer.py)
+##########################################################################
+
+def PrintTermination(length=2,zTrace=zTrace,rDrv=10,top=3):
+    #length is in units of rise time, rDrv is the output impedance of the driver
+    from TermOptimizer import OptimizeTermination, Describe
+    designs = OptimizeTermination(length,zTrace,rDrv=rDrv)
+    if not designs:
+        print(f'no termination found for length={length}, zTrace={zTrace}Ω')
+    for d in designs[:top]:
+        print(f"length={length}, zTrace={zTrace}Ω, rDrv={rDrv}Ω: {Describe(d)}, Vih margin={d['ringbackMargin']:.2f}V")
+    return designs
 
 ##########################################################################
 ###   Drawings to explain code and equations
-###     
-##########################################################################
-
-#pip install schemdraw, pip install schemdraw[svgmath]
-import schemdraw
-import schemdraw.elements as elm
-
-with schemdraw.Drawing():
-    Rleft = elm.Resistor().label('Rleft')
-    #elm.Line().up()
-    #elm.Line().right()
-    #elm.Tag().label('Vmid')
-    Rright = elm.Resistor().label('Rright')
-    elm.SourceV().down().label('Vright')
-    elm.Line().left()
-    elm.Line().left()
-    elm.Ground()
-    elm.SourceV().up().label('Vleft')
-    #elm.Tag().at(Rright).label('Vmid')
-    #elm.Tag().at(Rright).label('Vmid').left()
-    
-with schemdraw.Drawing():
-    elm.SourceV().up().label('Vsrc')
-    elm.Resistor().label('Rsrc')
-    #elm.Line().up()
-    #elm.Line().right()
-    #elm.Tag().label('Vmid')
-    Rright = elm.Resistor().label('Rright')
-    elm.SourceV().down().label('Vright')
-    elm.Line().left()
-    elm.Line().left()
-    elm.Ground()
-    elm.SourceV().up().label('Vleft')
-    #elm.Tag().at(Rright).label('Vmid')
-    
\ No newline at end of file
+###
+##########################################################################
+
+def DrawSchematics():
+    #pip install schemdraw, pip install schemdraw[svgmath]
+    import schemdraw
+    import schemdraw.elements as elm
+
+    with schemdraw.Drawing():
+        Rleft = elm.Resistor().label('Rleft')
+        #elm.Line().up()
+        #elm.Line().right()
+        #elm.Tag().label('Vmid')
+        Rright = elm.Resistor().label('Rright')
+        elm.SourceV().down().label('Vright')
+        elm.Line().left()
+        elm.Line().left()
+        elm.Ground()
+        elm.SourceV().up().label('Vleft')
+        #elm.Tag().at(Rright).label('Vmid')
+        #elm.Tag().at(Rright).label('Vmid').left()
+
+    with schemdraw.Drawing():
+        elm.SourceV().up().label('Vsrc')
+        elm.Resistor().label('Rsrc')
+        #elm.Line().up()
+        #elm.Line().right()
+        #elm.Tag().label('Vmid')
+        Rright = elm.Resistor().label('Rright')
+        elm.SourceV().down().label('Vright')
+        elm.Line().left()
+        elm.Line().left()
+        elm.Ground()
+        elm.SourceV().up().label('Vleft')
+        #elm.Tag().at(Rright).label('Vmid')
+
+FIGURES = {'reflections': PlotReflections, 'reactive': PlotReactive, 'animation': AnimatePosition,
+           'stubs': PlotStubs, 'lossy': PlotLossy, 'crosstalk': PlotCrosstalk, 'schematics': DrawSchematics}
+
+if __name__ == '__main__':
+    cache = Cache()
+    PlotReflections(cache)
+    PlotReactive(cache)
+    AnimatePosition(cache)
+    PlotStubs(cache)
+    PlotLossy()
+    PlotCrosstalk()
+    PrintTermination()
+    DrawSchematics()
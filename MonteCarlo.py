@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 23:50:00 2026
+
+@author: MarcMignard
+"""
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from WaveEngine import LineState, ProbePositions
+from SIMetrics import MetricState, MeetsLimits, LARGER_IS_WORSE
+from TermOptimizer import Pulse
+
+##########################################################################
+###   Monte Carlo tolerance analysis of a point to point line
+###   zSrc, zTrace, zTerm, length (and the reactive terms of LineState) are drawn from distributions, and the
+###   samples are split into shards that run on a process pool. Each shard is one batched LineState, and only
+###   the worst case metrics of each sample over the probes are kept. These go into fixed histograms, so the
+###   shards are added together as they finish and memory does not grow with the number of samples.
+###   Every shard has its own random stream from np.random.SeedSequence, so the result does not depend on the
+###   number of workers. https://numpy.org/doc/stable/reference/random/parallel.html
+###   Time is in units of rise time, as in TermOptimizer.py
+##########################################################################
+
+class Normal:
+    #distributions are objects (not lambdas) so they can be sent to the worker processes
+    def __init__(self,mean,sigma):
+        self.mean, self.sigma = mean, sigma
+
+    def __call__(self,rng,n):
+        return rng.normal(self.mean,self.sigma,n)
+
+class Uniform:
+    def __init__(self,low,high):
+        self.low, self.high = low, high
+
+    def __call__(self,rng,n):
+        return rng.uniform(self.low,self.high,n)
+
+class Tolerance(Uniform):
+    #nominal value ±pct percent
+    def __init__(self,nominal,pct):
+        super().__init__(nominal*(1-pct/100),nominal*(1+pct/100))
+
+def MetricBins(endT):
+    #fixed histogram bin edges of each metric: 1mV for voltages, 1/1000 of the simulation for times
+    volts = np.linspace(-4,4,8001)
+    times = np.linspace(0,endT,1001)
+    return {'overshoot': volts, 'undershoot': volts, 'ringback': volts, 'ringbackMargin': volts,
+            'ringUp': volts, 'ringUpMargin': volts, 'tVil': times, 'tVih': times, 'tFall': times,
+            'settle': times, 'nonMonotonic': np.arange(1001)}
+
+def Histogram(values,edges):
+    #counts of the underflow bin, each bin, the overflow bin and the nan values, every value is in one of them
+    #np.histogram closes its last bin on the right, so only values below edges[-1] go to it
+    inside = (values >= edges[0]) & (values < edges[-1])
+    return np.concatenate(([np.sum(values < edges[0])],np.histogram(values[inside],edges)[0],
+                           [np.sum(values >= edges[-1])],[np.sum(np.isnan(values))]))
+
+def RunShard(args):
+    #simulate one shard of samples, returns (number of samples, number that pass, histograms of the metrics)
+    seed, n, dists, dt, tRise, tOn, probes, vih, vil, maxOvershoot, maxUndershoot = args
+    rng = np.random.default_rng(seed)
+    params = {k: d(rng,n) if callable(d) else d for k,d in dists.items()}
+    drv = Pulse(dt,tRise,tOn)
+    state = LineState(dt=dt,pos=ProbePositions(probes),**params)
+    metrics = MetricState(dt,vih,vil)
+    for start in range(0,drv.size,4096):
+        metrics.Add(state.Advance(drv[start:start+4096]))
+    res = metrics.Results()
+    nPass = int(MeetsLimits(res,maxOvershoot,maxUndershoot).all(1).sum())
+    bins = MetricBins(drv.size*dt)
+    hists = {}
+    for k,edges in bins.items():
+        worst = res[k].max(1) if k in LARGER_IS_WORSE else res[k].min(1)  #nan if any probe is nan
+        hists[k] = Histogram(worst,edges)
+    return n, nPass, hists
+
+def Percentiles(counts,edges,q):
+    #percentiles q (0..100) from a histogram with an underflow and overflow bin at each end (and a nan count),
+    #as the lower edge of the bin that holds the percentile, so they are within one bin of the exact value
+    counts = counts[:-1]
+    total = counts.sum()
+    if total == 0:
+        return np.full(len(q),np.nan)
+    cum = np.cumsum(counts)/total
+    lower = np.concatenate(([-np.inf],edges))       #lower edge of underflow, each bin, and overflow
+    return lower[np.minimum(np.searchsorted(cum,np.asarray(q)/100 - 1e-12),cum.size-1)]
+
+def MonteCarlo(nSamples,dists,tRise=1.,tOn=None,probes=(1.,),vih=0.8,vil=0.2,maxOvershoot=0.3,maxUndershoot=0.3,
+               pointsPerRise=10,shardSize=2000,workers=None,seed=0,q=(1,5,50,95,99)):
+    #dists: {'zSrc','zTrace','zTerm','length', and optional 'lSrc','cSrc','lTerm','cTerm'}: a distribution
+    #(Normal, Uniform, Tolerance or any picklable callable(rng,n)) or a fixed value
+    #returns a dict with the yield, the percentiles q of the worst case of each metric over the probes,
+    #and the histograms they came from
+    for k in ('zSrc','zTrace','zTerm','length'):
+        if k not in dists:
+            raise ValueError(f"dists needs a distribution or value for '{k}'")
+    dt = tRise/pointsPerRise
+    if tOn is None:
+        #long enough for the longest line to settle, from a few samples of its distribution
+        length = dists['length']
+        tOn = max(10*tRise,20*np.max(length(np.random.default_rng(seed),1000) if callable(length) else length))
+    sizes = [min(shardSize,nSamples-i) for i in range(0,nSamples,shardSize)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = [(s,n,dists,dt,tRise,tOn,probes,vih,vil,maxOvershoot,maxUndershoot) for s,n in zip(seeds,sizes)]
+    total, nPass, hists = 0, 0, None
+    pool = None if workers == 1 or len(args) <= 1 else ProcessPoolExecutor(max_workers=workers)
+    try:
+        for n,p,h in (map(RunShard,args) if pool is None else pool.map(RunShard,args)):
+            total += n
+            nPass += p
+            hists = h if hists is None else {k: hists[k] + h[k] for k in hists}
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    bins = MetricBins(Pulse(dt,tRise,tOn).size*dt)
+    return {'n': total, 'yield': nPass/total, 'q': np.asarray(q),
+            'percentiles': {k: Percentiles(hists[k],bins[k],q) for k in bins},
+            'missing': {k: int(hists[k][-1]) for k in bins},   #samples where the metric does not exist (never reached Vih)
+            'histograms': hists, 'bins': bins}
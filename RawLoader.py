@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 19:00:00 2026
+
+@author: MarcMignard
+"""
+import os
+import numpy as np
+
+##########################################################################
+###   Selective loader for LTSpice and ngspice .raw files
+###   The header is parsed once, then each trace is a np.memmap view into the file, so only the
+###   pages of the traces that are used are read. The file format is described in PyLTSpice
+###   (https://github.com/nunobrum/PyLTSpice/blob/master/PyLTSpice/raw/raw_read.py):
+###     normal:     <time 0><trace1 0>...<traceN 0><time 1><trace1 1>...   (one record per time point)
+###     fastaccess: <time 0><time 1>...<trace1 0><trace1 1>...             (each trace contiguous)
+###   Transient data is 8 byte time and 4 byte traces, unless the file is 'double' (ngspice is always double).
+###   For normal files a trace is a strided view of the records, with fastaccess it is contiguous.
+##########################################################################
+
+def ComplexValue(text):
+    #complex values in ASCII raw files are written as real,imaginary
+    re,_,im = text.partition(',')
+    return complex(float(re),float(im) if im else 0.)
+
+class RawWaves:
+    def __init__(self,filename):
+        self.filename = filename
+        with open(filename,'rb') as f:
+            head = f.read(6)
+            if head == b'Title:':
+                self.encoding = 'utf_8'
+            elif head.decode('utf_16_le',errors='ignore') == 'Tit':
+                self.encoding = 'utf_16_le'
+            else:
+                raise ValueError(f'{filename} is not a LTSpice or ngspice raw file')
+            #read until the start of the data, the header is small so a few reads are enough
+            f.seek(0)
+            data = b''
+            while True:
+                chunk = f.read(65536)
+                data += chunk
+                found = [(data.find(m.encode(self.encoding)),m) for m in ('Binary:\n','Values:\n','Binary:\r\n','Values:\r\n')]
+                found = [(i,m) for i,m in found if i >= 0]
+                if found:
+                    i,marker = min(found)
+                    break
+                if not chunk:
+                    raise ValueError(f'{filename} has no Binary: or Values: section')
+        self.dataStart = i + len(marker.encode(self.encoding))
+        self.rawType = marker.strip()
+        header = data[:i].decode(self.encoding).replace('\r','').split('\n')
+
+        self.params = {}
+        varLine = None
+        for n,line in enumerate(header):
+            k,_,v = line.partition(':')
+            if k == 'Variables':
+                varLine = n
+                break
+            self.params[k] = v.strip()
+        self.nPoints = int(self.params['No. Points'])
+        self.nVars = int(self.params['No. Variables'])
+        self.flags = self.params.get('Flags','').lower().split()
+        self.names = [line.split()[1] for line in header[varLine+1:varLine+1+self.nVars]]
+        self.index = {name.lower(): i for i,name in enumerate(self.names)}
+        self.complex = 'complex' in self.flags
+        self._traces = {}
+        self._steps = None
+
+        if self.rawType == 'Values:':
+            self._ReadValues()
+            return
+        #the size of the values is not in the header, work it out from the size of the file
+        blockSize = (os.path.getsize(filename) - self.dataStart)//self.nPoints
+        if self.complex:
+            sizes = [16]*self.nVars
+            types = ['<c16']*self.nVars
+        elif blockSize == 8*self.nVars:
+            sizes = [8]*self.nVars
+            types = ['<f8']*self.nVars
+        else:
+            sizes = [8] + [4]*(self.nVars-1)
+            types = ['<f8'] + ['<f4']*(self.nVars-1)
+        self.types = types
+        if 'fastaccess' in self.flags:
+            self.offsets = self.dataStart + np.concatenate(([0],np.cumsum(sizes)[:-1]))*self.nPoints
+            self._records = None
+        else:
+            self._records = np.memmap(filename,dtype=np.dtype({'names':[f'v{i}' for i in range(self.nVars)],'formats':types}),
+                                      mode='r',offset=self.dataStart,shape=(self.nPoints,))
+
+    def _ReadValues(self):
+        #ASCII raw files cannot be memory mapped, read all the values once
+        with open(self.filename,'rb') as f:
+            f.seek(self.dataStart)
+            text = f.read().decode(self.encoding).split()
+        values = []
+        for i in range(self.nPoints):
+            block = text[i*(self.nVars+1)+1:(i+1)*(self.nVars+1)] #each point starts with its index
+            values.append([ComplexValue(v) if self.complex else float(v) for v in block])
+        values = np.asarray(values)
+        for i,name in enumerate(self.names):
+            self._traces[i] = values[:,i]
+
+    def GetTrace(self,name):
+        #the whole trace (all steps) as a read-only memmap view, the time axis is a copy with abs() applied
+        #because LTSpice uses the sign of the time to flag some points
+        i = self.index[name.lower()]
+        if i not in self._traces:
+            if self._records is not None:
+                trace = self._records[f'v{i}']
+            else:
+                trace = np.memmap(self.filename,dtype=self.types[i],mode='r',offset=int(self.offsets[i]),shape=(self.nPoints,))
+            if i == 0 and self.names[0].lower() == 'time':
+                trace = np.abs(trace)
+            self._traces[i] = trace
+        return self._traces[i]
+
+    def StepOffsets(self):
+        #index of the first point of each step, a new step starts when the axis goes back to its first value
+        if self._steps is None:
+            if 'stepped' in self.flags:
+                axis = self.GetTrace(self.names[0])
+                self._steps = np.concatenate((np.flatnonzero(axis == axis[0]),[self.nPoints]))
+            else:
+                self._steps = np.asarray([0,self.nPoints])
+        return self._steps
+
+    def GetSteps(self):
+        return np.arange(self.StepOffsets().size-1)
+
+    def GetWave(self,name,step=0):
+        #one step of a trace, still a view into the file
+        offsets = self.StepOffsets()
+        return self.GetTrace(name)[offsets[step]:offsets[step+1]]
+
+    def GetTimeAxis(self,step=0):
+        return self.GetWave(self.names[0],step)
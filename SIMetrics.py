@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 22:30:00 2026
+
+@author: MarcMignard
+"""
+import numpy as np
+
+##########################################################################
+###   Signal integrity measurements on batches of waveforms (config,time,probes)
+###   A waveform is expected to rise through Vil and Vih, stay high for a while and then fall back through Vil,
+###   like srcDrv in MakeWaves.py and the PULSE sources in TlineLTSpice.py. Every measurement is on all the
+###   configs and probes at once, and the waves can be given a chunk at a time (StreamWaves) with MetricState.
+###   The high time is from the Vih crossing to the start of the falling edge, which is the last step that does
+###   not go down before the falling Vil crossing (the falling edge is one monotonic fall through Vih and Vil).
+###     overshoot      how far the wave goes above vHigh (0 if it never does)
+###     undershoot     how far the wave goes below vLow
+###     ringback       lowest voltage in the high time, after the wave first stops rising
+###     ringbackMargin ringback-vih, negative when the wave rings back below Vih
+###     ringUp         highest voltage after the falling Vil crossing, ringUpMargin=vil-ringUp
+###     tVil, tVih     first time the wave rises through Vil and Vih (linear interpolation), nan if it never does
+###     tFall          first time the wave falls through Vil after tVih
+###     settle         time the wave is within band of vHigh for the rest of the high time
+###     nonMonotonic   number of time steps where the wave goes down between tVil and tVih, 0 if it never gets to Vih
+##########################################################################
+
+LARGER_IS_WORSE = ('overshoot','undershoot','ringUp','tVil','tVih','settle','nonMonotonic')
+
+class MetricState:
+    #Running measurements of waveforms that arrive in chunks of (config,samples,probes), sample n is at time n*dt
+    def __init__(self,dt,vih=0.8,vil=0.2,vHigh=1.,vLow=0.,band=0.05):
+        self.dt = dt
+        self.vih, self.vil, self.vHigh, self.vLow, self.band = vih, vil, vHigh, vLow, band
+        self.eps = 1e-9*(vHigh - vLow)  #smaller steps than this are flat
+        self.count = 0                  #number of samples seen so far
+        self.last = None                #last sample of the previous chunk
+
+    def Start(self,shape):
+        nan = np.full(shape,np.nan)
+        self.vMax = np.full(shape,-np.inf)
+        self.vMin = np.full(shape,np.inf)
+        #sample index of each crossing, and of the first step after Vih that does not go up
+        self.iVil, self.iVih, self.iFall, self.iTop = nan.copy(), nan.copy(), nan.copy(), nan.copy()
+        self.tVil, self.tVih, self.tFall = nan.copy(), nan.copy(), nan.copy()
+        self.ringback = np.full(shape,np.inf)
+        self.ringUp = np.full(shape,-np.inf)
+        self.lastOut = nan.copy()       #last sample outside the settling band in the high time
+        #samples after the last step that did not go down could be the falling edge, they are pending until
+        #the wave stops going down again (then they were ringing) or falls through Vil (then they are dropped)
+        self.pendingMin = np.full(shape,np.inf)
+        self.pendingOut = nan.copy()
+        self.nonMonotonic = np.zeros(shape,dtype=int)
+        self.pendingDown = np.zeros(shape,dtype=int)    #steps down after Vil, until the wave gets to Vih
+
+    def FirstIndex(self,k,hit,after):
+        #first sample index k where hit is true and k > after, and its position j in the chunk
+        hit = hit & (k > np.nan_to_num(after,nan=np.inf)[:,None,:])
+        j = hit.argmax(1)
+        return np.where(hit.any(1),k[0,j,0],np.nan), j
+
+    def FirstCrossing(self,k,crossed,after,v,vth):
+        #index and interpolated time of the first crossing of vth in this chunk after the index 'after'
+        idx, j = self.FirstIndex(k,crossed,after)
+        v0 = np.take_along_axis(v[:,:-1],j[:,None,:],1)[:,0,:]
+        v1 = np.take_along_axis(v[:,1:],j[:,None,:],1)[:,0,:]
+        with np.errstate(divide='ignore',invalid='ignore'):
+            t = (idx - 1 + (vth - v0)/(v1 - v0))*self.dt
+        return idx, t
+
+    def Add(self,waves):
+        waves = np.asarray(waves,dtype=float)
+        if waves.shape[1] == 0:
+            return
+        if self.last is None:
+            self.Start(waves[:,0,:].shape)
+            self.last = waves[:,:1,:]       #no crossing at the first sample, it is carried to the next step
+            self.vMax, self.vMin = waves[:,0,:].copy(), waves[:,0,:].copy()
+            self.count = 1
+            waves = waves[:,1:,:]
+            if waves.shape[1] == 0:
+                return
+        v = np.concatenate((self.last,waves),axis=1)
+        vOld, vNew = v[:,:-1], v[:,1:]
+        k = (self.count + np.arange(waves.shape[1]))[None,:,None]  #sample index of vNew
+        self.vMax = np.maximum(self.vMax,v.max(1))
+        self.vMin = np.minimum(self.vMin,v.min(1))
+        #crossings, only the first of each kind and in order: Vil then Vih rising, then Vil falling
+        upVil = (vOld < self.vil) & (vNew >= self.vil)
+        upVih = (vOld < self.vih) & (vNew >= self.vih)
+        downVil = (vOld >= self.vil) & (vNew < self.vil)
+        down = vNew < vOld - self.eps
+        new = np.isnan(self.iVil)
+        i, t = self.FirstCrossing(k,upVil,np.full(new.shape,-1.),v,self.vil)
+        self.iVil, self.tVil = np.where(new,i,self.iVil), np.where(new,t,self.tVil)
+        new = np.isnan(self.iVih)
+        i, t = self.FirstCrossing(k,upVih,self.iVil-1,v,self.vih)  #can be the same step as the Vil crossing
+        self.iVih, self.tVih = np.where(new,i,self.iVih), np.where(new,t,self.tVih)
+        new = np.isnan(self.iFall)
+        i, t = self.FirstCrossing(k,downVil,self.iVih,v,self.vil)
+        self.iFall, self.tFall = np.where(new,i,self.iFall), np.where(new,t,self.tFall)
+        new = np.isnan(self.iTop)
+        i, _ = self.FirstIndex(k,vNew <= vOld + self.eps,self.iVih)
+        self.iTop = np.where(new,i,self.iTop)
+
+        #windows of samples: rising (Vil to Vih), high (Vih to falling Vil) and low again (after falling Vil)
+        iVil, iVih, iFall, iTop = [np.nan_to_num(i,nan=np.inf)[:,None,:] for i in (self.iVil,self.iVih,self.iFall,self.iTop)]
+        rising = (k > iVil) & (k <= iVih)
+        high = (k >= iVih) & (k < iFall)
+        low = k > iFall                 #after the sample where it crossed Vil
+        #the steps down only count once the wave gets to Vih, before that they are pending
+        found = np.isfinite(self.iVih)
+        pending = self.pendingDown + (rising & down).sum(1)
+        self.nonMonotonic += np.where(found,pending,0)
+        self.pendingDown = np.where(found,0,pending)
+        self.ringUp = np.maximum(self.ringUp,np.where(low,vNew,-np.inf).max(1))
+
+        #split the high samples of this chunk at the last step that does not go down
+        keep = np.where(high & ~down,k,-1).max(1)
+        seen = keep >= 0
+        before = high & (k <= keep[:,None,:])
+        after = high & (k > keep[:,None,:])
+        settled = np.abs(vNew - self.vHigh) <= self.band
+        minBefore = np.where(before & (k >= iTop),vNew,np.inf).min(1)
+        minAfter = np.where(after & (k >= iTop),vNew,np.inf).min(1)
+        outBefore = np.where(before & ~settled,k,-1).max(1).astype(float)
+        outAfter = np.where(after & ~settled,k,-1).max(1).astype(float)
+        outBefore[outBefore < 0] = np.nan
+        outAfter[outAfter < 0] = np.nan
+        self.ringback = np.minimum(self.ringback,np.where(seen,np.minimum(minBefore,self.pendingMin),np.inf))
+        self.lastOut = np.where(seen,np.fmax(self.lastOut,np.fmax(self.pendingOut,outBefore)),self.lastOut)
+        self.pendingMin = np.where(seen,minAfter,np.minimum(self.pendingMin,minAfter))
+        self.pendingOut = np.where(seen,outAfter,np.fmax(self.pendingOut,outAfter))
+        self.last = v[:,-1:,:]
+        self.count += waves.shape[1]
+
+    def Select(self,rows):
+        #keep only some of the configurations, the same as LineState.Select
+        for name in ('vMax','vMin','iVil','iVih','iFall','iTop','tVil','tVih','tFall','ringback','ringUp',
+                     'lastOut','pendingMin','pendingOut','nonMonotonic','pendingDown','last'):
+            setattr(self,name,getattr(self,name)[rows])
+
+    def Results(self):
+        #dict of arrays of (config,probes)
+        #without a falling edge, whatever is still pending is part of the high time
+        fell = np.isfinite(self.iFall)
+        ringback = np.where(fell,self.ringback,np.minimum(self.ringback,self.pendingMin))
+        lastOut = np.where(fell,self.lastOut,np.fmax(self.lastOut,self.pendingOut))
+        highSeen = np.isfinite(ringback)
+        settle = np.where(np.isnan(lastOut),self.iVih,lastOut+1)*self.dt
+        return {'overshoot': np.maximum(self.vMax - self.vHigh,0),
+                'undershoot': np.maximum(self.vLow - self.vMin,0),
+                'ringback': np.where(highSeen,ringback,np.nan),
+                'ringbackMargin': np.where(highSeen,ringback - self.vih,np.nan),
+                'ringUp': np.where(np.isfinite(self.ringUp),self.ringUp,np.nan),
+                'ringUpMargin': np.where(np.isfinite(self.ringUp),self.vil - self.ringUp,np.nan),
+                'tVil': self.tVil, 'tVih': self.tVih, 'tFall': self.tFall,
+                'settle': settle,
+                'nonMonotonic': self.nonMonotonic}
+
+def WaveMetrics(waves,dt,vih=0.8,vil=0.2,vHigh=1.,vLow=0.,band=0.05):
+    #measurements of a whole array of (config,time,probes) or (time,probes), see the list at the top
+    waves = np.asarray(waves,dtype=float)
+    state = MetricState(dt,vih,vil,vHigh,vLow,band)
+    state.Add(waves if waves.ndim == 3 else waves[None])
+    res = state.Results()
+    return res if waves.ndim == 3 else {k: v[0] for k,v in res.items()}
+
+def MeetsLimits(res,maxOvershoot=0.3,maxUndershoot=0.3):
+    #boolean array of the waveforms in the results of WaveMetrics or MetricState that get to Vih without
+    #a non-monotonic edge, stay out of the no-man's land between Vil and Vih, and are within the overshoot limits
+    return ((res['overshoot'] <= maxOvershoot) & (res['undershoot'] <= maxUndershoot) & (res['ringbackMargin'] >= 0)
+            & (res['ringUpMargin'] >= 0) & (res['nonMonotonic'] == 0) & np.isfinite(res['tVih']))
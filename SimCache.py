@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 18:20:00 2026
+
+@author: MarcMignard
+"""
+import os
+import sys
+import json
+import shutil
+import hashlib
+import tempfile
+import numpy as np
+
+##########################################################################
+###   On-disk cache of simulation results, shared by the native engine and SimRunner
+###   The key is a hash of everything that goes into the simulation (component values, drive
+###   waveform, grid), so re-running a report only simulates what changed. Each entry is a directory
+###   of .npy files that are loaded as memory maps, or one compressed .npz file (compress=True).
+###   The cache is limited to maxBytes, and the least recently used entries are removed first.
+###   Call also hashes the source files of the function's module and of the modules next to it that it
+###   uses, so editing WaveEngine.py (or any engine) does not keep serving results of the old code.
+##########################################################################
+
+VERSION = 2  #change this when the format of the entries changes
+SCAN_EVERY = 64  #puts between scans of the cache directory, for entries written by other processes
+
+sourceHashes = {}  #(file,mtime,size): sha256 of the file, so the files are only read again when they change
+
+def SourceFiles(module,files=None):
+    #the file of module and of the modules in the same directory that it uses, directly or through each other
+    files = set() if files is None else files
+    fn = getattr(module,'__file__',None)
+    if fn is None or fn in files:
+        return files
+    files.add(fn)
+    folder = os.path.dirname(fn)
+    for v in list(vars(module).values()):
+        name = v.__name__ if isinstance(v,type(sys)) else getattr(v,'__module__',None)
+        m = sys.modules.get(name) if isinstance(name,str) else None
+        if m is not None and os.path.dirname(getattr(m,'__file__',None) or '') == folder:
+            SourceFiles(m,files)
+    return files
+
+def CodeHash(obj):
+    #hash of the source files that obj (a function, class or instance) depends on, see SourceFiles
+    module = sys.modules.get(getattr(obj,'__module__',None) or type(obj).__module__)
+    h = hashlib.sha256()
+    for fn in sorted(SourceFiles(module)) if module is not None else []:
+        st = os.stat(fn)
+        if (fn,st.st_mtime_ns,st.st_size) not in sourceHashes:
+            with open(fn,'rb') as f:
+                sourceHashes[(fn,st.st_mtime_ns,st.st_size)] = hashlib.sha256(f.read()).hexdigest()
+        h.update(sourceHashes[(fn,st.st_mtime_ns,st.st_size)].encode())
+    return h.hexdigest()
+
+def HashInputs(h,value):
+    #feed a nested structure of dicts, lists, arrays and scalars into the hash h
+    if isinstance(value,dict):
+        h.update(b'd%d' % len(value))
+        for k in sorted(value,key=str):
+            HashInputs(h,str(k))
+            HashInputs(h,value[k])
+    elif isinstance(value,(list,tuple)):
+        h.update(b'l%d' % len(value))
+        for v in value:
+            HashInputs(h,v)
+    elif isinstance(value,np.ndarray) or isinstance(value,np.generic):
+        a = np.ascontiguousarray(value)
+        h.update(f'a{a.dtype.str}{a.shape}'.encode())
+        h.update(a.tobytes())
+    elif isinstance(value,bytes):
+        h.update(b'b%d' % len(value))
+        h.update(value)
+    elif value is None or isinstance(value,(bool,int,float,complex,str)):
+        h.update(f'{type(value).__name__}:{value!r};'.encode())
+    else:
+        raise TypeError(f'cannot hash simulation input of type {type(value).__name__}')
+
+class SimCache:
+    def __init__(self,cacheDir='.simcache',maxBytes=2**30,compress=False):
+        self.cacheDir = cacheDir
+        self.maxBytes = maxBytes  #total size of the cache on disk
+        self.compress = compress  #compressed .npz entries are smaller, but are not memory mapped
+        os.makedirs(cacheDir,exist_ok=True)
+        self.scanBytes = None     #size of the cache at the last scan, None before the first scan
+        self.newBytes = 0         #bytes put since the last scan
+        self.newPuts = 0          #entries put since the last scan
+
+    def Key(self,*inputs):
+        h = hashlib.sha256(f'simcache{VERSION}'.encode())
+        HashInputs(h,inputs)
+        return h.hexdigest()
+
+    def Get(self,key):
+        #returns {name: array} or None when the key is not in the cache
+        #the arrays are read-only (memory maps unless the entry is compressed), see Put
+        path = os.path.join(self.cacheDir,key)
+        try:
+            with open(os.path.join(path,'names.json')) as f:
+                names = json.load(f)
+            if os.path.exists(os.path.join(path,'data.npz')):
+                with np.load(os.path.join(path,'data.npz')) as data:
+                    arrays = {n: data[f'a{i}'] for i,n in enumerate(names)}
+                for a in arrays.values():
+                    a.setflags(write=False)
+            else:
+                arrays = {n: np.load(os.path.join(path,f'{i}.npy'),mmap_mode='r') for i,n in enumerate(names)}
+            os.utime(path)  #mark as recently used
+        except (FileNotFoundError,NotADirectoryError):
+            return None
+        return arrays
+
+    def Put(self,key,arrays):
+        #store {name: array}, written to a temporary directory first so readers never see a partial entry
+        #numpy arrays in arrays are made read-only, so a result that was just simulated behaves like one from Get
+        names = list(arrays)
+        for a in arrays.values():
+            if isinstance(a,np.ndarray):
+                a.setflags(write=False)
+        tmp = tempfile.mkdtemp(prefix='tmp_',dir=self.cacheDir)
+        if self.compress:
+            np.savez_compressed(os.path.join(tmp,'data.npz'),**{f'a{i}': np.asarray(arrays[n]) for i,n in enumerate(names)})
+        else:
+            for i,n in enumerate(names):
+                np.save(os.path.join(tmp,f'{i}.npy'),np.asarray(arrays[n]))
+        with open(os.path.join(tmp,'names.json'),'w') as f:
+            json.dump(names,f)
+        self.newBytes += sum(e.stat().st_size for e in os.scandir(tmp))
+        self.newPuts += 1
+        try:
+            os.replace(tmp,os.path.join(self.cacheDir,key))
+        except OSError:
+            shutil.rmtree(tmp,ignore_errors=True) #another process stored the same key first
+        #only scan the directory when this process could have filled the cache, or after SCAN_EVERY puts
+        if self.scanBytes is None or self.scanBytes + self.newBytes > self.maxBytes or self.newPuts >= SCAN_EVERY:
+            self.Evict()
+
+    def Evict(self):
+        #remove least recently used entries until the cache fits in maxBytes
+        entries = []
+        for key in os.listdir(self.cacheDir):
+            path = os.path.join(self.cacheDir,key)
+            if key.startswith('tmp_') or not os.path.isdir(path):
+                continue
+            try:
+                size = sum(e.stat().st_size for e in os.scandir(path))
+                entries.append((os.stat(path).st_mtime,size,path))
+            except FileNotFoundError:
+                continue
+        total = sum(e[1] for e in entries)
+        for mtime,size,path in sorted(entries):
+            if total <= self.maxBytes:
+                break
+            shutil.rmtree(path,ignore_errors=True)
+            total -= size
+        self.scanBytes, self.newBytes, self.newPuts = total, 0, 0
+
+    def Call(self,func,*args,**kwargs):
+        #func(*args,**kwargs) through the cache, func returns an array or a dict of arrays
+        #the results are read-only whether they were simulated or came from the cache
+        key = self.Key(CodeHash(func),func.__module__,func.__qualname__,args,kwargs)
+        arrays = self.Get(key)
+        if arrays is None:
+            result = func(*args,**kwargs)
+            self.Put(key,result if isinstance(result,dict) else {'': result})
+            return result
+        return arrays[''] if list(arrays) == [''] else arrays
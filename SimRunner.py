@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 17:40:00 2026
+
+@author: MarcMignard
+"""
+import os
+import shutil
+import subprocess
+import tempfile
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from RawLoader import RawWaves
+from WaveEngine import SweepWaves
+from SimCache import CodeHash
+
+##########################################################################
+###   Run sweeps of the singleTrace family of schematics in parallel
+###   Every job gets its own directory with its own copy of the netlist and its own raw file,
+###   so jobs do not overwrite each other and can run at the same time on a process pool.
+###   A job is a dict of component values (times in nS, capacitors in pF):
+###     schematic, tdT1, tdT2, zSource, zTrace, zTerm, CS (optional), CL (optional),
+###     tStart, tRise, tOn, tPeriod, nCycles, tEnd
+###   The simulator is a backend object with Run(job,workDir) that returns {trace name: array}
+##########################################################################
+
+TRACES = ['time','V(vs)','V(vm)','V(vl)']
+
+def PulseArgs(job):
+    #LTSpice/ngspice PULSE(V1 V2 Tdelay Trise Tfall Ton Tperiod Ncycles) for a job
+    return (f"PULSE(0 1 {job['tStart']}n {job['tRise']}n {job['tRise']}n {job['tOn']}n "
+            f"{job['tPeriod']}n {job['nCycles']})")
+
+def PulseWave(t,job):
+    #the same PULSE source sampled at times t (nS)
+    tRise, tOn, tPeriod = job['tRise'], job['tOn'], job['tPeriod']
+    tp = t - job['tStart']
+    cycle = np.floor(tp/tPeriod)
+    tc = tp - cycle*tPeriod
+    v = np.clip(np.minimum(tc/tRise,(tRise+tOn+tRise-tc)/tRise),0,1)
+    return np.where((tp < 0) | (cycle >= job['nCycles']),0,v)
+
+def LoadTraces(raw):
+    #only the traces that are plotted are read from the raw file, copied so they can go back to the main process
+    LTR = RawWaves(raw)
+    return {name: np.array(LTR.GetWave(name)) for name in TRACES}
+
+class LTSpiceBackend:
+    #LTSpice through PyLTSpice, edits a copy of the .asc schematic in the job directory
+    name = 'ltspice'
+
+    def Run(self,job,workDir):
+        from PyLTSpice import SimCommander
+        asc = os.path.join(workDir,os.path.basename(job['schematic'])+'.asc')
+        shutil.copyfile(job['schematic']+'.asc',asc)
+        LTC = SimCommander(asc)
+        LTC.set_component_value('RS', f"{job['zSource']}")
+        if 'CS' in job:
+            LTC.set_component_value('CS', f"{job['CS']}p")
+        if 'CL' in job:
+            LTC.set_component_value('CL', f"{job['CL']}p")
+        LTC.set_component_value('RL', f"{job['zTerm']}")
+        LTC.set_element_model('T1', f"Td={job['tdT1']}n Z0={job['zTrace']}")
+        LTC.set_element_model('T2', f"Td={job['tdT2']}n Z0={job['zTrace']}")
+        LTC.set_element_model('V1', PulseArgs(job))
+        LTC.add_instructions(f".tran {job['tEnd']}n")
+        LTC.run()
+        LTC.wait_completion()
+        return LoadTraces(asc[:-4]+'_1.raw')
+
+class NgspiceBackend:
+    #ngspice in batch mode, writes a SPICE netlist of the same circuit as the singleTrace schematics
+    name = 'ngspice'
+
+    def __init__(self,ngspice='ngspice'):
+        self.ngspice = ngspice
+
+    def Netlist(self,job):
+        lines = [f"* {os.path.basename(job['schematic'])}",
+                 f"V1 vdrv 0 {PulseArgs(job)}",
+                 f"RS vdrv vs {job['zSource']}",
+                 f"T1 vs 0 vm 0 Z0={job['zTrace']} TD={job['tdT1']}n",
+                 f"T2 vm 0 vl 0 Z0={job['zTrace']} TD={job['tdT2']}n"]
+        if 'CS' in job:
+            lines.append(f"CS vs 0 {job['CS']}p")
+        if 'CL' in job:
+            lines += [f"RL vl vc {job['zTerm']}", f"CL vc 0 {job['CL']}p"]
+        else:
+            lines.append(f"RL vl 0 {job['zTerm']}")
+        lines += [f".tran {job['tRise']/100}n {job['tEnd']}n", ".end", ""]
+        return '\n'.join(lines)
+
+    def Run(self,job,workDir):
+        cir = os.path.join(workDir,os.path.basename(job['schematic'])+'.cir')
+        raw = cir[:-4]+'.raw'
+        with open(cir,'w') as f:
+            f.write(self.Netlist(job))
+        subprocess.run([self.ngspice,'-b','-r',raw,cir],cwd=workDir,check=True,capture_output=True)
+        return LoadTraces(raw)
+
+class NativeBackend:
+    #the delay line engine in WaveEngine.py, for machines without a SPICE simulator
+    name = 'native'
+
+    def __init__(self,dt=0.01):
+        self.dt = dt  #time step in nS
+
+    def Run(self,job,workDir):
+        length = job['tdT1'] + job['tdT2']
+        nT = int(round(job['tEnd']/self.dt))
+        t = np.arange(nT)*self.dt
+        waves = SweepWaves(PulseWave(t,job),job['zSource'],job['zTrace'],job['zTerm'],length,2,job['tEnd'],
+                           probes=[0.,job['tdT1']/length,1.],cSrc=job.get('CS',0)*1e-3,
+                           cTerm=job['CL']*1e-3 if 'CL' in job else np.inf)[0]
+        return {'time': t*1e-9, 'V(vs)': waves[:,0], 'V(vm)': waves[:,1], 'V(vl)': waves[:,2]}
+
+def RunJob(args):
+    backend, job, workDir = args
+    os.makedirs(workDir,exist_ok=True)
+    return backend.Run(job,workDir)
+
+def JobKey(cache,backend,job):
+    #cache key of a job, includes the backend settings and code (SimCache.CodeHash) and the contents of the
+    #schematic (not where it is, so the cache does not depend on the directory the repository is in)
+    asc = job['schematic']+'.asc'
+    schematic = open(asc,'rb').read() if os.path.exists(asc) else None
+    return cache.Key('SimRunner',backend.name,vars(backend),CodeHash(backend),
+                     dict(job,schematic=os.path.basename(job['schematic'])),schematic)
+
+def RunSweep(jobs,backend=None,workers=None,workDir=None,cache=None):
+    #run all the jobs on a process pool, returns the results in the same order as jobs
+    #workDir keeps the netlists and raw files, by default they go in a temporary directory that is removed
+    #cache is a SimCache, jobs that were already simulated are not run again
+    backend = LTSpiceBackend() if backend is None else backend
+    results = [None]*len(jobs)
+    keys = [None]*len(jobs)
+    if cache is not None:
+        for i,job in enumerate(jobs):
+            keys[i] = JobKey(cache,backend,job)
+            results[i] = cache.Get(keys[i])
+    todo = [i for i in range(len(jobs)) if results[i] is None]
+    tmp = None
+    if workDir is None:
+        tmp = workDir = tempfile.mkdtemp(prefix='tline_')
+    try:
+        args = [(backend,jobs[i],os.path.join(workDir,f'job{i:04d}')) for i in todo]
+        if workers == 1 or len(args) <= 1:
+            new = [RunJob(a) for a in args]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                new = list(pool.map(RunJob,args))
+    finally:
+        if tmp is not None:
+            shutil.rmtree(tmp,ignore_errors=True)
+    for i,res in zip(todo,new):
+        results[i] = res
+        if cache is not None:
+            cache.Put(keys[i],res)
+    return results
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 23:15:00 2026
+
+@author: MarcMignard
+"""
+import numpy as np
+from WaveEngine import LineState, ProbePositions
+from SIMetrics import MetricState, MeetsLimits, LARGER_IS_WORSE
+
+##########################################################################
+###   Search for the cheapest termination of a point to point line that keeps the receiver out of the
+###   no-man's land between Vil and Vih (the 'mistune source series resistor' section of TlineLTSpice.py)
+###   Every candidate is simulated at the smallest, nominal and largest zTrace, all together on one batched
+###   LineState. The simulation runs in chunks, and after each chunk the candidates that already have too much
+###   overshoot or undershoot are dropped (those can only get worse), so most bad designs cost very little.
+###   Designs with fewer parts are tried first, and more expensive topologies only if nothing cheaper works.
+###   Time is in units of rise time (1nS) and velocity is 1, so capacitance is in nF and length is a delay.
+##########################################################################
+
+E12 = np.asarray([10,12,15,18,22,27,33,39,47,56,68,82])
+RESISTORS = np.concatenate(([0],E12,E12*10))           #ohms, 0 means no resistor
+CAPACITORS = np.concatenate((E12[:-1],E12*10))*1e-3    #10pF to 820pF, in nF
+
+def TerminationDesigns(rDrv,resistors=RESISTORS,capacitors=CAPACITORS):
+    #candidate designs, a list of (topology,parts,dict of arrays for LineState)
+    #rDrv is the output impedance of the driver, it is always in series with the source resistor
+    R, C = np.meshgrid(resistors,capacitors,indexing='ij')
+    R, C = R.ravel(), C.ravel()
+    rLoad = resistors[resistors > 0]
+    RL, CL = np.meshgrid(rLoad,capacitors,indexing='ij')
+    RL, CL = RL.ravel(), CL.ravel()
+    return [('series R',(resistors > 0).astype(int),dict(zSrc=rDrv+resistors,zTerm=np.inf)),
+            ('parallel load R',np.ones(rLoad.size,dtype=int),dict(zSrc=rDrv,zTerm=rLoad)),
+            ('series R, source C',(R > 0)+1,dict(zSrc=rDrv+R,cSrc=C,zTerm=np.inf)),
+            ('load RC',np.full(RL.size,2),dict(zSrc=rDrv,zTerm=RL,cTerm=CL))]
+
+def Pulse(dt,tRise,tOn):
+    #drive rising over tRise, high for tOn and falling over tRise, then low for tOn
+    t = np.arange(int(np.ceil((2*tRise+2*tOn)/dt)))*dt
+    return np.clip(np.minimum(t/tRise,(2*tRise+tOn-t)/tRise),0,1)
+
+def CheckDesigns(params,length,zTraces,probes=(1.,),tRise=1.,tOn=None,vih=0.8,vil=0.2,maxOvershoot=0.3,
+                 maxUndershoot=0.3,pointsPerRise=10,chunk=None):
+    #simulate every design in params (dict of arrays of the same length) at every zTrace, returns a boolean
+    #array of the designs that pass, and the worst case metrics (see SIMetrics.py) over zTrace and probes
+    #tOn is how long the drive stays high, long enough for the reflections to settle by default
+    if not length > 0:
+        raise ValueError('length must be more than 0, the time step is a fraction of the line delay')
+    zTraces = np.atleast_1d(np.asarray(zTraces,dtype=float))
+    nDesign = np.broadcast(*[np.asarray(v) for v in params.values()]).size
+    cols = {k: np.broadcast_to(np.asarray(v,dtype=float),(nDesign,))[:,None] for k,v in params.items()}
+    tOn = max(10*tRise,20*length) if tOn is None else tOn
+    dt = length/np.ceil(length*pointsPerRise/tRise)   #the line is a whole number of time steps
+    drv = Pulse(dt,tRise,tOn)
+    roundTrip = int(round(2*length/dt))
+    chunk = max(roundTrip,int(tRise/dt)) if chunk is None else chunk
+
+    state = LineState(zTrace=zTraces[None,:],length=length,dt=dt,
+                      pos=ProbePositions(probes),**cols)
+    metrics = MetricState(dt,vih,vil)
+    alive = np.arange(nDesign*zTraces.size)          #configurations that are still simulated
+    failed = np.zeros(nDesign,dtype=bool)
+    for start in range(0,drv.size,chunk):
+        metrics.Add(state.Advance(drv[start:start+chunk]))
+        over = metrics.vMax.max(1) - 1 > maxOvershoot
+        under = -metrics.vMin.min(1) > maxUndershoot
+        failed[alive[over | under]//zTraces.size] = True
+        keep = ~failed[alive//zTraces.size]
+        if not keep.all():
+            alive = alive[keep]
+            state.Select(keep)
+            metrics.Select(keep)
+        if alive.size == 0:
+            break
+    worst = {}
+    if alive.size:
+        res = metrics.Results()
+        ok = MeetsLimits(res,maxOvershoot,maxUndershoot).all(1)
+        failed[alive[~ok]//zTraces.size] = True
+        #worst case of each design over zTrace and probes, nan for designs that were dropped early
+        for k,v in res.items():
+            w = np.full((nDesign,zTraces.size),np.nan)
+            high = k in LARGER_IS_WORSE
+            w[alive//zTraces.size,alive % zTraces.size] = v.max(1) if high else v.min(1)
+            worst[k] = w.max(1) if high else w.min(1)
+    return ~failed, worst
+
+def OptimizeTermination(length,zTrace,rDrv=10,designs=None,**limits):
+    #cheapest termination for a line of delay length (in rise times) and zTrace=(min,max) or a single value
+    #rDrv is the output impedance of the driver, designs defaults to TerminationDesigns(rDrv)
+    #limits are passed to CheckDesigns (probes, vih, vil, maxOvershoot, maxUndershoot, ...)
+    #returns a list of passing designs as dicts, cheapest first and then the most Vih margin, [] if none pass
+    #zSrc in the dicts includes rDrv, rSeries is the source resistor that is added to the board (0 for none)
+    if not length > 0:
+        raise ValueError('length must be more than 0, a lumped load has no line to terminate')
+    zTrace = np.atleast_1d(np.asarray(zTrace,dtype=float))
+    zTraces = np.unique([zTrace.min(),zTrace.mean(),zTrace.max()])
+    designs = TerminationDesigns(rDrv) if designs is None else designs
+    found = []
+    for nParts in sorted(set(np.concatenate([d[1] for d in designs]))):
+        for topology,parts,params in designs:
+            sel = parts == nParts
+            if not sel.any():
+                continue
+            sub = {k: np.broadcast_to(np.asarray(v,dtype=float),parts.shape)[sel] for k,v in params.items()}
+            ok, worst = CheckDesigns(sub,length,zTraces,**limits)
+            for i in np.flatnonzero(ok):
+                found.append(dict({k: float(v[i]) for k,v in sub.items()},topology=topology,parts=int(nParts),
+                                  rSeries=round(float(sub['zSrc'][i]) - rDrv,9) if 'zSrc' in sub else 0.,
+                                  **{k: float(v[i]) for k,v in worst.items()}))
+        if found:
+            break
+    return sorted(found,key=lambda d: -d['ringbackMargin'])
+
+def Describe(design):
+    #the parts of a design from OptimizeTermination as text, capacitors in pF
+    parts = []
+    if design['rSeries'] > 0:
+        parts.append(f"series R {design['rSeries']:g}Ω")
+    if design.get('cSrc',0) > 0:
+        parts.append(f"source C {design['cSrc']*1e3:g}pF")
+    if np.isfinite(design.get('cTerm',np.inf)):
+        parts.append(f"load RC {design['zTerm']:g}Ω {design['cTerm']*1e3:g}pF")
+    elif np.isfinite(design.get('zTerm',np.inf)):
+        parts.append(f"parallel load R {design['zTerm']:g}Ω")
+    return ', '.join(parts) if parts else 'no termination'
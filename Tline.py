@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 02:10:00 2026
+
+@author: MarcMignard
+"""
+import os
+import sys
+import json
+import argparse
+import numpy as np
+
+##########################################################################
+###   Library and command line entry point for the transmission line engines
+###   'import Tline' only loads numpy and the engines below, matplotlib, PyLTSpice and schemdraw are imported
+###   by the functions that need them, so batch workers that only simulate do not pay for the plotting stack.
+###   Command line (python Tline.py -h for all options):
+###     sweep    simulate every combination of zSrc, zTrace, zTerm and length, print the SI metrics, save an .npz
+###     render   draw the figures of MakeWaves.py and TlineLTSpice.py, --no-show only writes the files in media
+###     compare  run the LTSpice schematics with a SPICE backend and the native engine, and print the differences
+###     video    write the voltage versus position animation at full resolution (FrameExport.py)
+###     terminate search the cheapest termination of a point to point line (TermOptimizer.py)
+##########################################################################
+
+from WaveEngine import MakeWaves, SweepWaves, StreamWaves, LineState, AutoWaves
+from TlineNetwork import NetworkWaves
+from LineResponse import LineResponse, ImpulseResponse
+from LossyLine import LossyLine, SkinEffect, DielectricLoss
+from CoupledLines import CoupledWaves, Crosstalk, Modes
+from SIMetrics import WaveMetrics, MetricState, MeetsLimits
+from TermOptimizer import OptimizeTermination, Describe, Pulse
+from MonteCarlo import MonteCarlo, Normal, Uniform, Tolerance
+from EyeDiagram import EyeDiagram, PrbsDrive
+from Ibis import OpenIbis, DriverModel
+from SimRunner import RunSweep, LTSpiceBackend, NgspiceBackend, NativeBackend
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+def Sweep(zSrc,zTrace,zTerm,length,endT=20.,nT=2000,probes=(0.,0.5,1.),tRise=1.,tOn=None,**terms):
+    #every combination of the values of zSrc, zTrace, zTerm, length (and lSrc, cSrc, lTerm, cTerm in terms)
+    #driven by a pulse that rises over tRise and stays high for tOn (half the simulation by default)
+    #returns (t, waves of (config,time,probes), dict of the parameter of each config)
+    names = ['zSrc','zTrace','zTerm','length'] + list(terms)
+    values = [zSrc,zTrace,zTerm,length] + list(terms.values())
+    grid = np.meshgrid(*[np.atleast_1d(np.asarray(v,dtype=float)) for v in values],indexing='ij')
+    params = {k: g.ravel() for k,g in zip(names,grid)}
+    dt = endT/nT
+    tOn = endT/2 - tRise if tOn is None else tOn
+    drv = np.zeros(nT)
+    pulse = Pulse(dt,tRise,tOn)[:nT]
+    drv[:pulse.size] = pulse
+    waves = SweepWaves(drv,params['zSrc'],params['zTrace'],params['zTerm'],params['length'],2,endT,
+                       probes=np.asarray(probes,dtype=float),
+                       **{k: params[k] for k in terms})
+    return np.arange(nT)*dt, waves, params
+
+def Backend(name,dt=0.01):
+    #a SimRunner backend by name, dt is the time step of the native engine in nS
+    if name == 'ltspice':
+        return LTSpiceBackend()
+    if name == 'ngspice':
+        return NgspiceBackend()
+    if name == 'native':
+        return NativeBackend(dt)
+    raise ValueError(f"unknown backend '{name}', use ltspice, ngspice or native")
+
+def Compare(backend='ngspice',dt=0.01,workers=None,cache=None):
+    #the point to point cases of TlineLTSpice.py with a SPICE backend and the native engine
+    #returns a list of dicts with the case and the largest difference of each trace, in volts
+    from SimRunner import TRACES
+    fn = os.path.join(HERE,'LTSpice','singleTrace')
+    pulse = dict(tStart=0,tRise=1,tOn=9,tPeriod=20,nCycles=1,tEnd=20)
+    cases = [(length,zSrc) for length in (0.25,0.5,1) for zSrc in (20,100)]
+    jobs = [dict(pulse,schematic=fn,tdT1=length/2,tdT2=length/2,zSource=zSrc,zTrace=100,zTerm=1e6) for length,zSrc in cases]
+    spice = RunSweep(jobs,Backend(backend),workers,cache=cache)
+    native = RunSweep(jobs,NativeBackend(dt),workers,cache=cache)
+    diffs = []
+    for (length,zSrc),ref,res in zip(cases,spice,native):
+        t = np.asarray(ref['time'])
+        diffs.append(dict(length=length,zSrc=zSrc,**{name: float(np.max(np.abs(np.interp(t,res['time'],res[name]) - ref[name])))
+                                                      for name in TRACES[1:]}))
+    return diffs
+
+def Figures():
+    #all the figures that Render can draw, {name: function}
+    import MakeWaves
+    import TlineLTSpice
+    return dict(MakeWaves.FIGURES,**TlineLTSpice.FIGURES)
+
+def Render(names=None,show=True,backend='ltspice',dt=0.01):
+    #draw figures by name (default all of MakeWaves.py), without show nothing is displayed and only the
+    #figures that are saved in media are written, so this works without a display
+    #figures of the default list that need a package that is not installed (schemdraw) are skipped
+    import matplotlib
+    if not show:
+        matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    figures = Figures()
+    optional = names is None
+    names = [n for n in figures if not n.startswith('ltspice')] if names is None else names
+    for name in names:
+        if name not in figures:
+            raise ValueError(f"unknown figure '{name}', use one of {', '.join(figures)}")
+    for name in names:
+        try:
+            if name.startswith('ltspice'):
+                figures[name](Backend(backend,dt))
+            else:
+                figures[name]()
+        except ModuleNotFoundError as e:
+            if not optional:
+                raise
+            print(f"skipped '{name}', {e.name} is not installed",file=sys.stderr)
+        if not show:
+            plt.close('all')
+
+def Floats(text):
+    return [float(v) for v in text.split(',')]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Transmission line reflections and terminations')
+    sub = parser.add_subparsers(dest='command',required=True)
+    p = sub.add_parser('sweep',help='simulate all combinations of the parameters with the delay line engine')
+    p.add_argument('--zSrc',type=Floats,default=[20.,100.],help='source impedances, comma separated')
+    p.add_argument('--zTrace',type=Floats,default=[100.])
+    p.add_argument('--zTerm',type=Floats,default=[1e6],help='load impedances, inf for open')
+    p.add_argument('--length',type=Floats,default=[0.25,0.5,1.],help='line lengths in rise times')
+    p.add_argument('--cSrc',type=Floats,default=None,help='source capacitors in nF (rise time in nS)')
+    p.add_argument('--cTerm',type=Floats,default=None,help='load capacitors in nF')
+    p.add_argument('--probes',type=Floats,default=[0.,0.5,1.],help='positions as a fraction of the line length')
+    p.add_argument('--endT',type=float,default=20.)
+    p.add_argument('--nT',type=int,default=2000)
+    p.add_argument('--tRise',type=float,default=1.)
+    p.add_argument('--out',default=None,help='.npz file for the time axis, waves and parameters')
+    p.add_argument('--json',action='store_true',help='print the metrics as JSON instead of a table')
+    p = sub.add_parser('render',help='draw the figures')
+    p.add_argument('figures',nargs='*',help='figure names, default all except the LTSpice ones')
+    p.add_argument('--list',action='store_true',help='list the figure names')
+    p.add_argument('--no-show',dest='show',action='store_false',help='do not open windows, only write files')
+    p.add_argument('--backend',default='ltspice',choices=['ltspice','ngspice','native'])
+    p.add_argument('--dt',type=float,default=0.01,help='time step of the native backend in nS')
+    p = sub.add_parser('compare',help='compare a SPICE backend to the native engine')
+    p.add_argument('--backend',default='ngspice',choices=['ltspice','ngspice','native'])
+    p.add_argument('--dt',type=float,default=0.01,help='time step of the native engine in nS')
+    p.add_argument('--workers',type=int,default=None)
+    p.add_argument('--json',action='store_true')
+    p = sub.add_parser('video',help='write the voltage versus position animation to a video file')
+    p.add_argument('out',help='file name, .mp4 and others need ffmpeg, .gif works without it')
+    p.add_argument('--nX',type=int,default=1000)
+    p.add_argument('--nT',type=int,default=2000)
+    p.add_argument('--fps',type=int,default=60)
+    p.add_argument('--step',type=int,default=1,help='only write every step\'th time step')
+    p.add_argument('--workers',type=int,default=None)
+    p = sub.add_parser('terminate',help='search the cheapest termination of a point to point line')
+    p.add_argument('--length',type=float,default=2.,help='line delay in rise times')
+    p.add_argument('--zTrace',type=Floats,default=[100.],help='trace impedance, or min,max')
+    p.add_argument('--rDrv',type=float,default=10.,help='output impedance of the driver')
+    p.add_argument('--top',type=int,default=3,help='number of designs to print')
+    p.add_argument('--json',action='store_true')
+    args = parser.parse_args(argv)
+
+    if args.command == 'sweep':
+        terms = {k: getattr(args,k) for k in ('cSrc','cTerm') if getattr(args,k) is not None}
+        t, waves, params = Sweep(args.zSrc,args.zTrace,args.zTerm,args.length,args.endT,args.nT,args.probes,args.tRise,**terms)
+        metrics = WaveMetrics(waves,t[1]-t[0])
+        if args.out is not None:
+            np.savez(args.out,t=t,waves=waves,probes=np.asarray(args.probes),**params)
+        passes = MeetsLimits(metrics).all(1)
+        rows = []
+        for i in range(waves.shape[0]):
+            rows.append(dict({k: float(v[i]) for k,v in params.items()},
+                             overshoot=float(metrics['overshoot'][i].max()),undershoot=float(metrics['undershoot'][i].max()),
+                             vihMargin=float(np.nanmin(metrics['ringbackMargin'][i])) if np.isfinite(metrics['ringbackMargin'][i]).any() else None,
+                             settle=float(np.nanmax(metrics['settle'][i])) if np.isfinite(metrics['settle'][i]).any() else None,
+                             passes=bool(passes[i])))
+        if args.json:
+            print(json.dumps(rows,indent=1))
+        else:
+            for r in rows:
+                print(', '.join(f'{k}={v:.3g}' if isinstance(v,float) else f'{k}={v}' for k,v in r.items()))
+    elif args.command == 'render':
+        if args.list:
+            print('\n'.join(Figures()))
+        else:
+            Render(args.figures or None,args.show,args.backend,args.dt)
+    elif args.command == 'compare':
+        diffs = Compare(args.backend,args.dt,args.workers)
+        if args.json:
+            print(json.dumps(diffs,indent=1))
+        else:
+            for d in diffs:
+                print(f"length={d['length']}, zSrc={d['zSrc']}: " + ', '.join(f'{k} {v*1e3:.1f}mV' for k,v in d.items() if k.startswith('V(')))
+    elif args.command == 'video':
+        from MakeWaves import ExportPositionVideo
+        nFrames = ExportPositionVideo(args.out,None,args.nX,args.nT,args.fps,args.step,args.workers)
+        print(f'{nFrames} frames written to {args.out}')
+    elif args.command == 'terminate':
+        designs = OptimizeTermination(args.length,args.zTrace,rDrv=args.rDrv)[:args.top]
+        if args.json:
+            print(json.dumps(designs,indent=1))
+        elif not designs:
+            print('no termination meets the limits')
+        for d in ([] if args.json else designs):
+            print(f"{Describe(d)}, Vih margin={d['ringbackMargin']:.2f}V, overshoot={d['overshoot']:.2f}V")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
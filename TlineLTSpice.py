@@ -6,294 +6,287 @@ Created on Sun Oct 22 08:36:00 2023
 ΑΒΓΔΕΖΗΘΙΚΛΜΝΞΟΠΡΣΤΥΦΧΨΩαβγδεζηθικλμνξοπρσςτυφχψωάέήϊίόύϋώΆΈΉΊΌΎΏ±≥≤ΪΫ÷≈°√ⁿ²ˑ∂
 """
 
+import os
 import numpy as np
-import matplotlib.pyplot as plt
-from PyLTSpice import RawRead
-from PyLTSpice import SimCommander
-#have to run 'pip install pyltspice' to use these
+from SimRunner import RunSweep, LTSpiceBackend
+from SimCache import SimCache
+#LTSpiceBackend needs 'pip install pyltspice'
 #documentation is at https://pyltspice.readthedocs.io/en/latest/
 #more info and source code is at https://github.com/nunobrum/PyLTSpice
+#Each sweep runs its jobs in parallel, each with its own copy of the schematic. To run on Linux use
+#SimRunner.NgspiceBackend() (needs ngspice), or SimRunner.NativeBackend() for the native wave engine
+#Each figure is a function, nothing is simulated when this file is imported, and matplotlib is only imported
+#by the functions that draw. Run this file to make all of them, or one at a time with 'python Tline.py render'
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+MEDIA = os.path.join(HERE,'media')
+
+def Defaults(backend,cache):
+    #LTSpice, and results of jobs that were already simulated are read from .simcache next to this file
+    backend = LTSpiceBackend() if backend is None else backend
+    cache = SimCache(os.path.join(HERE,'.simcache')) if cache is None else cache
+    return backend, cache
+
+def PlotTraces(res,tStart,tRise):
+    import matplotlib.pyplot as plt
+    x = (res['time']*1e9-tStart)/tRise  #time axis scaled by rise time
+    plt.plot(x, res['V(vl)'],'--', label='load')
+    plt.plot(x, res['V(vm)'], label='middle')
+    plt.plot(x, res['V(vs)'],':', label='source')
 
 ##########################################################################
 ###  point-to-point transmission line
 ###  
 ##########################################################################
 
-fn = '.\\LTSpice\\singleTrace'
-tRise = 1               #rise time in nS
-fracToMid = 1/2         #fraction of total length until signal is sampled (using two Tlines so can see voltage at this point)
-tdT1 = fracToMid*tRise  #propagation delay of first transmission line
-tdT2 = tRise - tdT1     #propagation delay of second transmission line
-tStart = 0              #little delay at beginning of simulation, probably not necessary
-tEnd = tStart+20*tRise  #length of simulation
-zSource = 20            #impedance of source
-zTrace = 100            #impedance of transmission lines
-zTermination = 1e6      #impedance of termination
-
-def RunSim(fn,tdT1,tdT2,zSource=20,zTrace=100,zTerm=1e6):
-    LTC = SimCommander(fn+'.asc')
-    LTC.set_component_value('RS', f'{zSource}')
-    LTC.set_component_value('RL', f'{zTermination}')
-    LTC.set_element_model('T1', f'Td={tdT1}n Z0={zTrace}')
-    LTC.set_element_model('T2', f'Td={tdT2}n Z0={zTrace}')
-    LTC.set_element_model('V1', f'PULSE(0 1 {tStart}n {tRise}n {tRise}n 9n {tEnd}n 1)')
-    LTC.add_instructions(f'.tran {tEnd}n')
-    LTC.run()
-    LTC.wait_completion()
-    
-def PlotTraces(fn):    
-    LTR = RawRead(fn+'_1.raw')
-    VVL = LTR.get_trace('V(vl)')
-    VVS = LTR.get_trace('V(vs)')
-    VVM = LTR.get_trace('V(vm)')
-    x = LTR.get_trace('time')  # Gets the time axis
-    steps = LTR.get_steps()
-    for step in range(len(steps)):
-        plt.plot((x.get_time_axis(step)*1e9-tStart)/tRise, VVL.get_wave(step),'--', label='load')
-    for step in range(len(steps)):
-        plt.plot((x.get_time_axis(step)*1e9-tStart)/tRise, VVM.get_wave(step), label='middle')
-    for step in range(len(steps)):
-        plt.plot((x.get_time_axis(step)*1e9-tStart)/tRise, VVS.get_wave(step),':', label='source')
-
-plt.figure(figsize=(8,8),dpi=150)
-# if zTermination > 1000:
-#     plt.suptitle(f'impedance mismatch reflections\nzSrc={zSource}Ω, zTrace={zTrace}Ω, zTerm=open')
-# else:    
-#     plt.suptitle(f'impedance mismatch reflections\nzSrc={zSource}Ω, zTrace={zTrace}Ω, zTerm={zTermination}Ω')
-plt.suptitle(f'Voltage versus time using LTSpice, zTrace={zTrace}', y=0.92)
-
-params = [[321,0.25,20,'fine everywhere'],[322,0.25,100,'fine everywhere'],
-          [323,0.5,20,'undershoot bad'],[324,0.5,100,'fine everywhere'],
-          [325,1,20,'undershoot bad'],[326,1,100,'load ok, problem near source']] #[subplot,length,zSrc]
-for i in range(len(params)):
-    plt.subplot(params[i][0])
-    lenTotal = params[i][1] #total transmission line length as a fraction of rise time
-    RunSim(fn,lenTotal*tdT1,lenTotal*tdT2,params[i][2],zTrace)
-    PlotTraces(fn)
-    plt.grid(True)
-    plt.xlim(0,20)
-    plt.ylim(-0.8,1.8)
-    plt.text(0.1,-0.7,f'length={lenTotal}, zSrc={params[i][2]}')
-    if i%2==0:
-        plt.ylabel('voltage')
-    if i==4 or i==5:
-        plt.xlabel('time (units of rise time)')
+def PlotPointToPoint(backend=None,cache=None,save=True):
+    import matplotlib.pyplot as plt
+    backend, cache = Defaults(backend,cache)
+    fn = os.path.join(HERE,'LTSpice','singleTrace')
+    tRise = 1               #rise time in nS
+    fracToMid = 1/2         #fraction of total length until signal is sampled (using two Tlines so can see voltage at this point)
+    tdT1 = fracToMid*tRise  #propagation delay of first transmission line
+    tdT2 = tRise - tdT1     #propagation delay of second transmission line
+    tStart = 0              #little delay at beginning of simulation, probably not necessary
+    tEnd = tStart+20*tRise  #length of simulation
+    zSource = 20            #impedance of source
+    zTrace = 100            #impedance of transmission lines
+    zTermination = 1e6      #impedance of termination
+
+    pulse = dict(tStart=tStart,tRise=tRise,tOn=9,tPeriod=tEnd,nCycles=1,tEnd=tEnd)
+
+    plt.figure(figsize=(8,8),dpi=150)
+    # if zTermination > 1000:
+    #     plt.suptitle(f'impedance mismatch reflections\nzSrc={zSource}Ω, zTrace={zTrace}Ω, zTerm=open')
+    # else:    
+    #     plt.suptitle(f'impedance mismatch reflections\nzSrc={zSource}Ω, zTrace={zTrace}Ω, zTerm={zTermination}Ω')
+    plt.suptitle(f'Voltage versus time using LTSpice, zTrace={zTrace}', y=0.92)
 
-plt.legend()
-plt.xlabel('time (scaled by rise time)')
-plt.savefig('./media/LTS_reflections_single.svg', bbox_inches='tight')
-#plt.savefig('singleTrace.jpg', bbox_inches='tight')
-plt.show()
+    params = [[321,0.25,20,'fine everywhere'],[322,0.25,100,'fine everywhere'],
+              [323,0.5,20,'undershoot bad'],[324,0.5,100,'fine everywhere'],
+              [325,1,20,'undershoot bad'],[326,1,100,'load ok, problem near source']] #[subplot,length,zSrc]
+    jobs = [dict(pulse,schematic=fn,tdT1=p[1]*tdT1,tdT2=p[1]*tdT2,zSource=p[2],zTrace=zTrace,zTerm=zTermination) for p in params]
+    results = RunSweep(jobs,backend,cache=cache)
+    for i in range(len(params)):
+        plt.subplot(params[i][0])
+        lenTotal = params[i][1] #total transmission line length as a fraction of rise time
+        PlotTraces(results[i],tStart,tRise)
+        plt.grid(True)
+        plt.xlim(0,20)
+        plt.ylim(-0.8,1.8)
+        plt.text(0.1,-0.7,f'length={lenTotal}, zSrc={params[i][2]}')
+        if i%2==0:
+            plt.ylabel('voltage')
+        if i==4 or i==5:
+            plt.xlabel('time (units of rise time)')
+
+    plt.legend()
+    plt.xlabel('time (scaled by rise time)')
+    if save:
+        plt.savefig(os.path.join(MEDIA,'LTS_reflections_single.svg'), bbox_inches='tight')
+    #plt.savefig('singleTrace.jpg', bbox_inches='tight')
+    plt.show()
 
 ##########################################################################
 ###  point-to-point transmission line, source series RC termination
 ###  
 ##########################################################################
 
-fn = 'singleTrace_RCsrc'
-tRise = 1               #rise time in nS
-fracToMid = 1/4         #fraction of total length until signal is sampled (using two Tlines so can see voltage at this point)
-tdT1 = fracToMid*tRise  #propagation delay of first transmission line
-tdT2 = tRise - tdT1     #propagation delay of second transmission line
-tStart = 10             #little delay at beginning of simulation, probably not necessary
-tEnd = tStart+50*tRise  #length of simulation
-zSource =100            #impedance of source
-zTrace = 100            #impedance of transmission lines
-zTermination = 1e6      #impedance of termination
-
-def RunSim(fn,tdT1,tdT2,zSource=20,zTrace=100,zTerm=1e6,CS=10):
-    LTC = SimCommander(fn+'.asc')
-    LTC.set_component_value('RS', f'{zSource}')
-    LTC.set_component_value('CS', f'{CS}p')
-    LTC.set_component_value('RL', f'{zTermination}')
-    LTC.set_element_model('T1', f'Td={tdT1}n Z0={zTrace}')
-    LTC.set_element_model('T2', f'Td={tdT2}n Z0={zTrace}')
-    LTC.set_element_model('V1', f'PULSE(0 1 {tStart}n {tRise}n {tRise}n 380n 800n 10)')
-    LTC.add_instructions(f'.tran {tEnd}n')
-    LTC.run()
-    LTC.wait_completion()
-    
-plt.figure(figsize=(5,8),dpi=150)
-if zTermination > 1000:
-    plt.suptitle(f'Source series RC termination\nzSrc={zSource}Ω, zTrace={zTrace}Ω, zTerm=open')
-else:    
-    plt.suptitle(f'Source series RC termination\nzSrc={zSource}Ω, zTrace={zTrace}Ω, zTerm={zTermination}Ω')
-
-CSs = np.asarray([1,10,50,100])
-for cs in np.arange(CSs.size):
-    plt.subplot(CSs.size,1,cs+1)
+def PlotSourceRC(backend=None,cache=None):
+    import matplotlib.pyplot as plt
+    backend, cache = Defaults(backend,cache)
+    fn = os.path.join(HERE,'LTSpice','singleTrace_RCsrc')
+    tRise = 1               #rise time in nS
+    fracToMid = 1/4         #fraction of total length until signal is sampled (using two Tlines so can see voltage at this point)
+    tdT1 = fracToMid*tRise  #propagation delay of first transmission line
+    tdT2 = tRise - tdT1     #propagation delay of second transmission line
+    tStart = 10             #little delay at beginning of simulation, probably not necessary
+    tEnd = tStart+50*tRise  #length of simulation
+    zSource =100            #impedance of source
+    zTrace = 100            #impedance of transmission lines
+    zTermination = 1e6      #impedance of termination
+
+    pulse = dict(tStart=tStart,tRise=tRise,tOn=380,tPeriod=800,nCycles=10,tEnd=tEnd)
+
+    plt.figure(figsize=(5,8),dpi=150)
+    if zTermination > 1000:
+        plt.suptitle(f'Source series RC termination\nzSrc={zSource}Ω, zTrace={zTrace}Ω, zTerm=open')
+    else:    
+        plt.suptitle(f'Source series RC termination\nzSrc={zSource}Ω, zTrace={zTrace}Ω, zTerm={zTermination}Ω')
+
+    CSs = np.asarray([1,10,50,100])
     lenTotal = 2 #total transmission line length as a fraction of rise time
-    RunSim(fn,lenTotal*tdT1,lenTotal*tdT2,zSource,zTrace,1e6,CSs[cs])
-    PlotTraces(fn)
-    plt.grid(True)
-    if 0==cs:
-        plt.ylabel('voltage (source=1V)')
-        plt.annotate('Worrisome transition', xy=(3.5,0.5), xytext=(7.5,0.75), arrowprops=dict(facecolor='black', width=1, headwidth=5, headlength=8))
-    plt.xlim(0,20)
-    plt.ylim(0,1.25)
-    plt.text(5,0.1,f'CS = {CSs[cs]}pF')
-
-plt.legend()
-plt.xlabel('time (scaled by rise time)')
-#plt.savefig('sourceRCterm.svg', bbox_inches='tight')
-#plt.savefig('sourceRCterm.jpg', bbox_inches='tight')
-plt.show()
+    jobs = [dict(pulse,schematic=fn,tdT1=lenTotal*tdT1,tdT2=lenTotal*tdT2,zSource=zSource,zTrace=zTrace,zTerm=zTermination,CS=cs) for cs in CSs]
+    results = RunSweep(jobs,backend,cache=cache)
+    for cs in np.arange(CSs.size):
+        plt.subplot(CSs.size,1,cs+1)
+        PlotTraces(results[cs],tStart,tRise)
+        plt.grid(True)
+        if 0==cs:
+            plt.ylabel('voltage (source=1V)')
+            plt.annotate('Worrisome transition', xy=(3.5,0.5), xytext=(7.5,0.75), arrowprops=dict(facecolor='black', width=1, headwidth=5, headlength=8))
+        plt.xlim(0,20)
+        plt.ylim(0,1.25)
+        plt.text(5,0.1,f'CS = {CSs[cs]}pF')
+
+    plt.legend()
+    plt.xlabel('time (scaled by rise time)')
+    #plt.savefig('sourceRCterm.svg', bbox_inches='tight')
+    #plt.savefig('sourceRCterm.jpg', bbox_inches='tight')
+    plt.show()
 
 ##########################################################################
 ###  mistune source series resistor
 ###  
 ##########################################################################
 
+def PlotMistune(backend=None,cache=None):
+    import matplotlib.pyplot as plt
+    backend, cache = Defaults(backend,cache)
+    fn = os.path.join(HERE,'LTSpice','singleTrace')
+    tRise = 1               #rise time in nS
+    fracToMid = 1/4         #fraction of total length until signal is sampled (using two Tlines so can see voltage at this point)
+    tdT1 = fracToMid*tRise  #propagation delay of first transmission line
+    tdT2 = tRise - tdT1     #propagation delay of second transmission line
+    tStart = 10             #little delay at beginning of simulation, probably not necessary
+    tEnd = tStart+50*tRise  #length of simulation
+    zSource =100            #impedance of source
+    zTrace = 100            #impedance of transmission lines
+    zTermination = 1e6      #impedance of termination
+    pulse = dict(tStart=tStart,tRise=tRise,tOn=380,tPeriod=800,nCycles=10,tEnd=tEnd)
+
+    plt.figure(figsize=(5,8),dpi=150)
+    if zTermination > 1000:
+        plt.suptitle(f'Detune source term to avoid invalid\ndigital voltage, zTrace={zTrace}Ω, zTerm=open')
+    else:    
+        plt.suptitle(f'Source series RC termination\nzSrc={zSource}Ω, zTrace={zTrace}Ω, zTerm={zTermination}Ω')
 
-fn = 'singleTrace'
-tRise = 1               #rise time in nS
-fracToMid = 1/4         #fraction of total length until signal is sampled (using two Tlines so can see voltage at this point)
-tdT1 = fracToMid*tRise  #propagation delay of first transmission line
-tdT2 = tRise - tdT1     #propagation delay of second transmission line
-tStart = 10             #little delay at beginning of simulation, probably not necessary
-tEnd = tStart+50*tRise  #length of simulation
-zSource =100            #impedance of source
-zTrace = 100            #impedance of transmission lines
-zTermination = 1e6      #impedance of termination
-
-def RunSim(fn,tdT1,tdT2,zSource=20,zTrace=100,zTerm=1e6):
-    LTC = SimCommander(fn+'.asc')
-    LTC.set_component_value('RS', f'{zSource}')
-    LTC.set_component_value('RL', f'{zTermination}')
-    LTC.set_element_model('T1', f'Td={tdT1}n Z0={zTrace}')
-    LTC.set_element_model('T2', f'Td={tdT2}n Z0={zTrace}')
-    LTC.set_element_model('V1', f'PULSE(0 1 {tStart}n {tRise}n {tRise}n 380n 800n 10)')
-    LTC.add_instructions(f'.tran {tEnd}n')
-    LTC.run()
-    LTC.wait_completion()
-    
-plt.figure(figsize=(5,8),dpi=150)
-if zTermination > 1000:
-    plt.suptitle(f'Detune source term to avoid invalid\ndigital voltage, zTrace={zTrace}Ω, zTerm=open')
-else:    
-    plt.suptitle(f'Source series RC termination\nzSrc={zSource}Ω, zTrace={zTrace}Ω, zTerm={zTermination}Ω')
-
-zSrc = np.asarray([100,40,30,20])
-for z in np.arange(zSrc.size):
-    plt.subplot(zSrc.size,1,z+1)
+    zSrc = np.asarray([100,40,30,20])
     lenTotal = 2 #total transmission line length as a fraction of rise time
-    zSource = zSrc[z]
-    RunSim(fn,lenTotal*tdT1,lenTotal*tdT2,zSource,zTrace,1e6)
-    PlotTraces(fn)
-    plt.plot([0,11],[0.8,0.8],'k:')   
-    plt.text(11,0.7,'0.8')
-    plt.grid(True)
-    if 0==z:
-        plt.ylabel('voltage (source=1V)')        
-        #plt.annotate('Worrisome transition', xy=(3.5,0.5), xytext=(7.5,0.75), arrowprops=dict(facecolor='black', width=1, headwidth=5, headlength=8))
-    plt.xlim(0,20)
-    plt.ylim(0,1.75)
-    plt.text(5,0.1,f'zSrc = {zSource}Ω')
-
-plt.legend()
-plt.xlabel('time (scaled by rise time)')
-#plt.savefig('srcTermDetune.svg', bbox_inches='tight')
-#plt.savefig('srcTermDetune.jpg', bbox_inches='tight')
-plt.show()
+    jobs = [dict(pulse,schematic=fn,tdT1=lenTotal*tdT1,tdT2=lenTotal*tdT2,zSource=z,zTrace=zTrace,zTerm=zTermination) for z in zSrc]
+    results = RunSweep(jobs,backend,cache=cache)
+    for z in np.arange(zSrc.size):
+        plt.subplot(zSrc.size,1,z+1)
+        zSource = zSrc[z]
+        PlotTraces(results[z],tStart,tRise)
+        plt.plot([0,11],[0.8,0.8],'k:')   
+        plt.text(11,0.7,'0.8')
+        plt.grid(True)
+        if 0==z:
+            plt.ylabel('voltage (source=1V)')        
+            #plt.annotate('Worrisome transition', xy=(3.5,0.5), xytext=(7.5,0.75), arrowprops=dict(facecolor='black', width=1, headwidth=5, headlength=8))
+        plt.xlim(0,20)
+        plt.ylim(0,1.75)
+        plt.text(5,0.1,f'zSrc = {zSource}Ω')
 
+    plt.legend()
+    plt.xlabel('time (scaled by rise time)')
+    #plt.savefig('srcTermDetune.svg', bbox_inches='tight')
+    #plt.savefig('srcTermDetune.jpg', bbox_inches='tight')
+    plt.show()
 
 ##########################################################################
 ###  load R termination
 ###  
 ##########################################################################
 
+def PlotLoadR(backend=None,cache=None):
+    import matplotlib.pyplot as plt
+    backend, cache = Defaults(backend,cache)
+    fn = os.path.join(HERE,'LTSpice','singleTrace')
+    tRise = 1               #rise time in nS
+    fracToMid = 1/4         #fraction of total length until signal is sampled (using two Tlines so can see voltage at this point)
+    tdT1 = fracToMid*tRise  #propagation delay of first transmission line
+    tdT2 = tRise - tdT1     #propagation delay of second transmission line
+    tStart = 10             #little delay at beginning of simulation, probably not necessary
+    tEnd = tStart+20*tRise  #length of simulation
+    zSource = 20            #impedance of source
+    zTrace = 100            #impedance of transmission lines
+    zTermination = 1e6      #impedance of termination
+    pulse = dict(tStart=tStart,tRise=tRise,tOn=380,tPeriod=800,nCycles=10,tEnd=tEnd)
 
-fn = 'singleTrace'
-tRise = 1               #rise time in nS
-fracToMid = 1/4         #fraction of total length until signal is sampled (using two Tlines so can see voltage at this point)
-tdT1 = fracToMid*tRise  #propagation delay of first transmission line
-tdT2 = tRise - tdT1     #propagation delay of second transmission line
-tStart = 10             #little delay at beginning of simulation, probably not necessary
-tEnd = tStart+20*tRise  #length of simulation
-zSource = 20            #impedance of source
-zTrace = 100            #impedance of transmission lines
-zTermination = 1e6      #impedance of termination
-    
-plt.figure(figsize=(5,8),dpi=150)
-plt.suptitle(f'Parallel load termination\nzSrc={zSource}Ω, zTrace={zTrace}Ω')
-
-zTerm = np.asarray([1000,500,200,100])
-for z in np.arange(zSrc.size):
-    plt.subplot(zSrc.size,1,z+1)
+    plt.figure(figsize=(5,8),dpi=150)
+    plt.suptitle(f'Parallel load termination\nzSrc={zSource}Ω, zTrace={zTrace}Ω')
+
+    zTerm = np.asarray([1000,500,200,100])
     lenTotal = 2 #total transmission line length as a fraction of rise time
-    zTermination = zTerm[z]
-    RunSim(fn,lenTotal*tdT1,lenTotal*tdT2,zSource,zTrace,zTermination)
-    PlotTraces(fn)
-    plt.plot([0,11],[0.8,0.8],'k:')   
-    plt.text(11,0.7,'0.8')
-    plt.grid(True)
-    if 0==z:
-        plt.ylabel('voltage (source=1V)')        
-        #plt.annotate('Worrisome transition', xy=(3.5,0.5), xytext=(7.5,0.75), arrowprops=dict(facecolor='black', width=1, headwidth=5, headlength=8))
-    plt.xlim(0,20)
-    plt.ylim(0,1.75)
-    plt.text(5,0.1,f'zTerm = {zTermination}Ω')
-
-plt.legend(loc='lower right')
-plt.xlabel('time (scaled by rise time)')
-#plt.savefig('parLoadTerm.svg', bbox_inches='tight')
-#plt.savefig('parLoadTerm.jpg', bbox_inches='tight')
-plt.show()
+    jobs = [dict(pulse,schematic=fn,tdT1=lenTotal*tdT1,tdT2=lenTotal*tdT2,zSource=zSource,zTrace=zTrace,zTerm=z) for z in zTerm]
+    results = RunSweep(jobs,backend,cache=cache)
+    for z in np.arange(zTerm.size):
+        plt.subplot(zTerm.size,1,z+1)
+        zTermination = zTerm[z]
+        PlotTraces(results[z],tStart,tRise)
+        plt.plot([0,11],[0.8,0.8],'k:')   
+        plt.text(11,0.7,'0.8')
+        plt.grid(True)
+        if 0==z:
+            plt.ylabel('voltage (source=1V)')        
+            #plt.annotate('Worrisome transition', xy=(3.5,0.5), xytext=(7.5,0.75), arrowprops=dict(facecolor='black', width=1, headwidth=5, headlength=8))
+        plt.xlim(0,20)
+        plt.ylim(0,1.75)
+        plt.text(5,0.1,f'zTerm = {zTermination}Ω')
+
+    plt.legend(loc='lower right')
+    plt.xlabel('time (scaled by rise time)')
+    #plt.savefig('parLoadTerm.svg', bbox_inches='tight')
+    #plt.savefig('parLoadTerm.jpg', bbox_inches='tight')
+    plt.show()
 
 ##########################################################################
 ###  load RC termination
 ###  
 ##########################################################################
 
-fn = '.\\LTSpice\\singleTrace_loadRC'
-tRise = 1               #rise time in nS
-fracToMid = 1/2         #fraction of total length until signal is sampled (using two Tlines so can see voltage at this point)
-tdT1 = fracToMid*tRise  #propagation delay of first transmission line
-tdT2 = tRise - tdT1     #propagation delay of second transmission line
-tStart = 0              #little delay at beginning of simulation, probably not necessary
-tEnd = tStart+20*tRise  #length of simulation
-zSource = 20            #impedance of source
-zTrace = 100            #impedance of transmission lines
-zTermination = 100      #impedance of termination
-
-def RunSim(fn,tdT1,tdT2,zSource=20,zTrace=100,zTerm=1e6,CL=10):
-    LTC = SimCommander(fn+'.asc')
-    LTC.set_component_value('RS', f'{zSource}')
-    LTC.set_component_value('CL', f'{CL}p')
-    LTC.set_component_value('RL', f'{zTermination}')
-    LTC.set_element_model('T1', f'Td={tdT1}n Z0={zTrace}')
-    LTC.set_element_model('T2', f'Td={tdT2}n Z0={zTrace}')
-    LTC.set_element_model('V1', f'PULSE(0 1 {tStart}n {tRise}n {tRise}n 9n {tEnd}n 1)')
-    LTC.add_instructions(f'.tran {tEnd}n')
-    LTC.run()
-    LTC.wait_completion()
-    
-plt.figure(figsize=(4,5),dpi=150)
-plt.suptitle(f'Parallel load termination\nzSrc={zSource}Ω, zTrace={zTrace}Ω, zTerm={zTermination}Ω||xx pF')
-
-CLs = np.asarray([5,20,100])
-for cl in np.arange(CLs.size):
-    plt.subplot(CLs.size,1,cl+1)
+def PlotLoadRC(backend=None,cache=None,save=True):
+    import matplotlib.pyplot as plt
+    backend, cache = Defaults(backend,cache)
+    fn = os.path.join(HERE,'LTSpice','singleTrace_loadRC')
+    tRise = 1               #rise time in nS
+    fracToMid = 1/2         #fraction of total length until signal is sampled (using two Tlines so can see voltage at this point)
+    tdT1 = fracToMid*tRise  #propagation delay of first transmission line
+    tdT2 = tRise - tdT1     #propagation delay of second transmission line
+    tStart = 0              #little delay at beginning of simulation, probably not necessary
+    tEnd = tStart+20*tRise  #length of simulation
+    zSource = 20            #impedance of source
+    zTrace = 100            #impedance of transmission lines
+    zTermination = 100      #impedance of termination
+
+    pulse = dict(tStart=tStart,tRise=tRise,tOn=9,tPeriod=tEnd,nCycles=1,tEnd=tEnd)
+
+    plt.figure(figsize=(4,5),dpi=150)
+    plt.suptitle(f'Parallel load termination\nzSrc={zSource}Ω, zTrace={zTrace}Ω, zTerm={zTermination}Ω||xx pF')
+
+    CLs = np.asarray([5,20,100])
     lenTotal = 2 #total transmission line length as a fraction of rise time
-    RunSim(fn,lenTotal*tdT1,lenTotal*tdT2,zSource,zTrace,1e6,CLs[cl])
-    PlotTraces(fn)
-    #plt.plot([0,11],[0.8,0.8],'k:')   
-    #plt.text(11,0.7,'0.8')
-    plt.grid(True)
-    plt.ylabel('voltage')
-        #plt.annotate('Worrisome transition', xy=(3.5,0.5), xytext=(7.5,0.75), arrowprops=dict(facecolor='black', width=1, headwidth=5, headlength=8))
-    # if (CLs.size-1)==cl:
-    #     plt.annotate('Worrisome transition', xy=(2,0.85), xytext=(4,1.3), arrowprops=dict(facecolor='black', width=1, headwidth=5, headlength=8))
-    plt.xlim(0,20)
-    plt.ylim(-0.8,1.8)
-    plt.text(0.1,-0.7,f'CL = {CLs[cl]}pF')
-
-plt.legend()
-plt.xlabel('time (scaled by rise time)')
-plt.savefig('./media/parLoadRCterm.svg', bbox_inches='tight')
-plt.show()
+    jobs = [dict(pulse,schematic=fn,tdT1=lenTotal*tdT1,tdT2=lenTotal*tdT2,zSource=zSource,zTrace=zTrace,zTerm=zTermination,CL=cl) for cl in CLs]
+    results = RunSweep(jobs,backend,cache=cache)
+    for cl in np.arange(CLs.size):
+        plt.subplot(CLs.size,1,cl+1)
+        PlotTraces(results[cl],tStart,tRise)
+        #plt.plot([0,11],[0.8,0.8],'k:')   
+        #plt.text(11,0.7,'0.8')
+        plt.grid(True)
+        plt.ylabel('voltage')
+            #plt.annotate('Worrisome transition', xy=(3.5,0.5), xytext=(7.5,0.75), arrowprops=dict(facecolor='black', width=1, headwidth=5, headlength=8))
+        # if (CLs.size-1)==cl:
+        #     plt.annotate('Worrisome transition', xy=(2,0.85), xytext=(4,1.3), arrowprops=dict(facecolor='black', width=1, headwidth=5, headlength=8))
+        plt.xlim(0,20)
+        plt.ylim(-0.8,1.8)
+        plt.text(0.1,-0.7,f'CL = {CLs[cl]}pF')
 
-##########################################################################
-###  stubs
-###  
-##########################################################################
+    plt.legend()
+    plt.xlabel('time (scaled by rise time)')
+    if save:
+        plt.savefig(os.path.join(MEDIA,'parLoadRCterm.svg'), bbox_inches='tight')
+    plt.show()
+
+FIGURES = {'ltspice-single': PlotPointToPoint, 'ltspice-source-rc': PlotSourceRC, 'ltspice-mistune': PlotMistune,
+           'ltspice-load-r': PlotLoadR, 'ltspice-load-rc': PlotLoadRC}
+
+if __name__ == '__main__':
+    backend, cache = Defaults(None,None)
+    PlotPointToPoint(backend,cache)
+    PlotSourceRC(backend,cache)
+    PlotMistune(backend,cache)
+    PlotLoadR(backend,cache)
+    PlotLoadRC(backend,cache)
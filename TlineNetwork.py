@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 17:05:00 2026
+
+@author: MarcMignard
+"""
+import numpy as np
+from WaveEngine import DelayTaps
+
+##########################################################################
+###   Networks of transmission line segments (stubs, V and Y splits, dualTrace.asc)
+###   Each segment is a lossless line with its own impedance and delay, stored as two delay lines
+###   (the waves launched from each end). At every node the incoming waves are combined with the
+###   sources and loads at that node to give the node voltage, and the outgoing wave on each segment
+###   is the node voltage minus the incoming wave. For a tee of equal impedances this is the familiar
+###   scattering of Γ=-1/3 back and 2/3 into each branch.
+###   https://en.wikipedia.org/wiki/Scattering_parameters
+##########################################################################
+
+def NetworkNodes(segments):
+    #node names in the order they first appear in the segment list
+    nodes = []
+    for seg in segments:
+        for n in seg[:2]:
+            if n not in nodes:
+                nodes.append(n)
+    return nodes
+
+def NetworkWaves(srcDrv,segments,endT,sources,loads=None,probes=None,decimate=1):
+    #segments: list of (nodeA,nodeB,zTrace,delay), delay is the length in units of time (velocity is 1)
+    #sources: {node: zSrc}, srcDrv drives each of these nodes through zSrc, zSrc=0 is an ideal source
+    #loads: {node: zTerm}, resistors to ground (zTerm=0 is a short), nodes without a source or load are open (stub ends) or plain junctions
+    #probes: list of nodes to return, default is all nodes in the order of NetworkNodes(segments)
+    #returns an array of (ceil(nT/decimate),probes) with the node voltages
+    loads = {} if loads is None else loads
+    nodes = NetworkNodes(segments)
+    nodeIdx = {n:i for i,n in enumerate(nodes)}
+    for n in list(sources) + list(loads):
+        if n not in nodeIdx:
+            raise ValueError(f"node '{n}' is not connected to any segment")
+    probeIdx = np.asarray([nodeIdx[n] for n in (nodes if probes is None else probes)])
+    nT = srcDrv.size              #number of time steps
+    dt = endT/nT                  #time step
+    totalWave = np.zeros((-(-nT//decimate),probeIdx.size)) #array to return
+
+    #Each segment has a port at both ends, port 2s is at nodeA of segment s and port 2s+1 at nodeB.
+    #The wave arriving at a port is the wave launched from the other end of the segment (port^1), delayed.
+    portNode = np.asarray([nodeIdx[seg[i]] for seg in segments for i in (0,1)])
+    portY = np.repeat([1/seg[2] for seg in segments],2)          #admittance of the segment at each port
+    tap, frac = DelayTaps(np.repeat([seg[3] for seg in segments],2)/dt)
+    if np.any(tap < 1):
+        raise ValueError('every segment needs a delay of at least one time step, increase nT')
+    partner = np.arange(portNode.size) ^ 1
+
+    #sources and loads as Norton equivalents at each node, except an ideal source (zSrc=0) or a short (zTerm=0)
+    #which force the node voltage to srcDrv or to 0
+    gNode = np.bincount(portNode,weights=portY,minlength=len(nodes))
+    gDrv = np.zeros(len(nodes))
+    forced = np.zeros(len(nodes),dtype=bool)
+    forcedDrv = np.zeros(len(nodes))
+    for n,z in sources.items():
+        if z == 0:
+            forced[nodeIdx[n]], forcedDrv[nodeIdx[n]] = True, 1.
+        else:
+            gDrv[nodeIdx[n]] += 1/z
+    for n,z in loads.items():
+        if z == 0:
+            if forcedDrv[nodeIdx[n]]:
+                raise ValueError(f"node '{n}' has an ideal source (zSrc=0) and a short (zTerm=0)")
+            forced[nodeIdx[n]] = True
+        else:
+            gNode[nodeIdx[n]] += 1/z
+    gNode += gDrv
+
+    #Each buffer is stored twice (buf[i] and buf[i+M]) so that a delay d is always buf[head+M-d]
+    M = tap.max() + 1
+    buf = np.zeros((portNode.size,2*M))   #wave launched from each port into its segment
+    head = 0
+    for tIdx in np.arange(nT):
+        k = head+M-tap
+        arrive = (1-frac)*buf[partner,k[partner]] + frac*buf[partner,k[partner]-1]
+        #node voltage from the incoming waves (each one doubles at the node, like an open circuit) and the sources
+        vNode = (np.bincount(portNode,weights=2*arrive*portY,minlength=len(nodes)) + srcDrv[tIdx]*gDrv)/gNode
+        vNode[forced] = srcDrv[tIdx]*forcedDrv[forced]
+        buf[:,head] = buf[:,head+M] = vNode[portNode] - arrive
+        if tIdx % decimate == 0:
+            totalWave[tIdx//decimate,:] = vNode[probeIdx]
+        head = (head+1) % M
+    return totalWave
@@ -0,0 +1,382 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 15:30:00 2026
+
+@author: MarcMignard
+"""
+import numpy as np
+
+##########################################################################
+###   This code implements the d'Alembert solution to the 1-dimensional lossless wave equation
+###   wave equation: https://en.wikipedia.org/wiki/Wave_equation and https://en.wikipedia.org/wiki/Telegrapher%27s_equations
+###   d'Alembert solution: https://en.wikipedia.org/wiki/D%27Alembert%27s_formula
+##########################################################################
+
+def ProbePositions(probes):
+    #probes as positions along the line, a fraction of the line length (0=source, 1=load)
+    #Only MakeWaves and SweepWaves have a grid to index, so everywhere else integer probes are an error
+    #instead of silently becoming fractions (probes=[0,1] would be the source and the load, not grid points 0 and 1)
+    pos = np.atleast_1d(np.asarray(probes))
+    if pos.dtype.kind in 'biu':
+        raise TypeError('integer probes are grid indices, only MakeWaves and SweepWaves have a grid; give positions as floats')
+    pos = pos.astype(float)
+    if np.any(~((pos >= 0) & (pos <= 1))):
+        raise ValueError('probe positions are fractions of the line length, between 0 and 1')
+    return pos
+
+def ProbeFractions(probes,nX):
+    #probes given as integers are indices into the nX grid (negative counts from the load end, -1 is the load),
+    #probes given as floats are positions as a fraction of the line length (0=source, 1=load)
+    if probes is None:
+        return np.linspace(0,1,nX)
+    idx = np.atleast_1d(np.asarray(probes))
+    if idx.dtype.kind in 'iu':
+        if np.any((idx < -nX) | (idx >= nX)):
+            raise IndexError(f'probe index out of range for a grid of {nX} points')
+        return (idx % nX)/(nX-1)
+    return ProbePositions(probes)
+
+def MakeWaves(srcDrv,zSrc,zTrace,zTerm,length,nX,endT,method='delay',probes=None,decimate=1,
+              lSrc=0,cSrc=0,lTerm=0,cTerm=np.inf,driver=None):
+    #method='delay' treats each direction as a delay line (exact shifts when the Courant ratio is 1)
+    #method='interp' is the original per-step linear interpolation, kept to compare results
+    #probes=None returns all nX points, otherwise only the probed points (see ProbeFractions)
+    #decimate=k only keeps every k'th time step, the returned array is (ceil(nT/k),nX or number of probes)
+    #lSrc,cSrc,lTerm,cTerm add reactive terminations and driver a nonlinear driver, see SweepWaves (only for method='delay')
+    if method == 'delay':
+        return SweepWaves(srcDrv,zSrc,zTrace,zTerm,length,nX,endT,probes,decimate,lSrc,cSrc,lTerm,cTerm,driver)[0]
+    if method != 'interp':
+        raise ValueError(f"unknown method '{method}', use 'delay' or 'interp'")
+    if np.any(np.asarray(lSrc) != 0) or np.any(np.asarray(cSrc) != 0) or np.any(np.asarray(lTerm) != 0) or np.any(np.asarray(cTerm) != np.inf):
+        raise ValueError("reactive terminations need method='delay'")
+    if driver is not None:
+        raise ValueError("a driver model needs method='delay'")
+    probeIdx = np.rint(ProbeFractions(probes,nX)*(nX-1)).astype(int)
+    rightWave = np.zeros(nX+2)    #wave going in direction from source to load
+    leftWave = np.zeros(nX+2)     #wave going in direction from load to source
+    nT = srcDrv.size              #number of time steps
+    totalWave = np.zeros((-(-nT//decimate),probeIdx.size)) #array to return
+    x = np.linspace(-1/(nX-1),1+1/(nX-1),nX+2)*length
+    #The points on the left and right of x are one simulation time step away from the physical line
+    #This allows simple linear interpolation to update the simulation step
+    velocity = 1 #by definition
+    x[0] = -velocity*endT/nT
+    x[-1] = length + velocity*endT/nT
+
+    #for all the time steps in the simulation
+    for tIdx in np.arange(nT):
+        temp = rightWave[-1] #need to save this before updating rightWave
+        #at the beginning is both the source (through the zSrc/zTrace voltage divider), and the reflection from the left-going wave
+        rightWave[0] = srcDrv[tIdx]/(1+zSrc/zTrace) + leftWave[0]*(zSrc-zTrace)/(zSrc+zTrace)
+        rightWave = np.interp(x-endT/nT,x,rightWave)
+        #at the end is the reflection from the right-going wave
+        leftWave[-1] = temp*(zTerm-zTrace)/(zTerm+zTrace)
+        leftWave =  np.interp(x+endT/nT,x,leftWave)
+        if tIdx % decimate == 0:
+            totalWave[tIdx//decimate,:] = rightWave[probeIdx+1] + leftWave[probeIdx+1]
+    return totalWave
+
+##########################################################################
+###   Delay line engine
+###   A lossless line does not change the waves, it only delays them. So instead of moving every
+###   point of rightWave/leftWave each time step, keep the history of the wave launched at each end
+###   in a circular buffer and move the head index. The wave at position x is the wave launched
+###   x/velocity earlier, so a time step only touches the two ends of the line.
+##########################################################################
+
+def DelayTaps(delay):
+    #split a delay (in time steps) into an integer part and the linear interpolation weight of the next older sample
+    whole = np.floor(delay + 1e-9)
+    frac = delay - whole
+    frac[frac < 1e-9] = 0 #Courant ratio of 1 gives exact integer shifts
+    return whole.astype(int), frac
+
+def Reflection(zEnd,zTrace):
+    #reflection coefficient looking into an impedance zEnd, an infinite impedance is an open circuit
+    with np.errstate(invalid='ignore'):
+        return np.where(np.isinf(zEnd),1.0,(zEnd-zTrace)/(zEnd+zTrace))
+
+def SweepWaves(srcDrv,zSrc,zTrace,zTerm,length,nX,endT,probes=None,decimate=1,lSrc=0,cSrc=0,lTerm=0,cTerm=np.inf,
+               driver=None):
+    #Same as MakeWaves(...,method='delay'), but zSrc, zTrace, zTerm and length can be arrays (broadcast together)
+    #All the configurations are advanced together on a (config x position) state, returns an array of (config,nT,nX)
+    #With probes/decimate only those points are stored, so memory is (config,nT/decimate,probes) instead of the whole line
+    #Reactive terminations (also arrays that broadcast with the others):
+    #  source: srcDrv -> zSrc -> lSrc (series) -> line, with cSrc from the line to ground (singleTrace_RCsrc)
+    #  load:   line -> zTerm -> lTerm -> cTerm (all in series) to ground (singleTrace_loadRC), cTerm=inf is no capacitor
+    #  capacitance is in units of time/ohm and inductance in ohm*time (nF and nH when time is in nS)
+    #Nonlinear driver (Ibis.DriverModel): srcDrv is the switching state from 0 (pulldown on) to 1 (pullup on), the
+    #driver pad connects to the line through zSrc, and the voltages are in volts instead of a fraction of the drive
+    state = LineState(zSrc,zTrace,zTerm,length,endT/srcDrv.size,ProbeFractions(probes,nX),decimate,lSrc,cSrc,lTerm,cTerm,driver)
+    return state.Advance(srcDrv)
+
+def StreamWaves(chunks,zSrc,zTrace,zTerm,length,dt,probes=(0.,0.5,1.),decimate=1,lSrc=0,cSrc=0,lTerm=0,cTerm=np.inf,
+                driver=None):
+    #Streaming version of SweepWaves for very long drive patterns (PRBS), chunks is an iterable of srcDrv pieces
+    #with time step dt. Only the state of the line is kept between chunks, and for each chunk this yields the
+    #probe waves (config,samples,probes), decimated across chunk boundaries. Memory does not grow with the pattern.
+    #probes are positions as a fraction of the line length (see ProbePositions), there is no grid to index
+    state = LineState(zSrc,zTrace,zTerm,length,dt,ProbePositions(probes),decimate,lSrc,cSrc,lTerm,cTerm,
+                      driver)
+    for chunk in chunks:
+        yield state.Advance(np.asarray(chunk,dtype=float))
+
+def Delayed(hist,k,frac):
+    #samples k of hist, linearly interpolated with the next older samples by frac (no interpolation when it is all 0)
+    if not frac.any():
+        return hist[k]
+    return (1-frac)*hist[k] + frac*hist[k-1]
+
+class LineState:
+    #State of the delay lines and termination networks of a batch of configurations, see SweepWaves
+    #pos are the stored points as a fraction of the line length
+    #driver is an Ibis.DriverModel, then srcDrv is its switching state (0 low, 1 high) and zSrc is a series resistor
+    def __init__(self,zSrc,zTrace,zTerm,length,dt,pos,decimate=1,lSrc=0,cSrc=0,lTerm=0,cTerm=np.inf,driver=None):
+        zSrc,zTrace,zTerm,length,lSrc,cSrc,lTerm,cTerm = [a.ravel() for a in np.broadcast_arrays(
+            *[np.asarray(p,dtype=float) for p in (zSrc,zTrace,zTerm,length,lSrc,cSrc,lTerm,cTerm)])]
+        nCfg = length.size            #number of configurations
+        self.nCfg = nCfg
+        self.nP = pos.size            #number of stored points along the line
+        self.decimate = decimate
+        self.zTrace = zTrace
+
+        #The inductors and capacitors are replaced by their trapezoidal companion models, a resistor and a
+        #voltage or current source that carries the state from the previous step. Then each end of the line
+        #is a Thevenin source (zSrcEq,zTermEq) and the boundary update is the same as for resistors.
+        #https://en.wikipedia.org/wiki/Trapezoidal_rule_(differential_equations), companion models as in SPICE
+        self.kLSrc = 2*lSrc/dt                #companion resistance of the source inductor
+        self.gCSrc = 2*cSrc/dt                #companion conductance of the source capacitor
+        self.kLTerm = 2*lTerm/dt              #companion resistance of the load inductor
+        self.kCTerm = dt/(2*cTerm)            #companion resistance of the load capacitor
+        self.zSeries = zSrc + self.kLSrc
+        zSrcEq = self.zSeries/(1+self.zSeries*self.gCSrc) #source impedance seen by the line
+        zTermEq = zTerm + self.kLTerm + self.kCTerm       #load impedance seen by the line
+        self.drvScale = zTrace/(zSrcEq+zTrace)            #voltage divider between source and line
+        self.termScale = np.where(np.isinf(zTermEq),0,zTrace/(zTermEq+zTrace))
+        self.gSrc = Reflection(zSrcEq,zTrace)             #reflection coefficient looking into the source
+        self.gTerm = Reflection(zTermEq,zTrace)           #reflection coefficient looking into the termination
+        self.reactive = np.any(self.kLSrc) or np.any(self.gCSrc) or np.any(self.kLTerm) or np.any(self.kCTerm)
+        self.vLSrc = np.zeros(nCfg)           #history voltage of the source inductor
+        self.jCSrc = np.zeros(nCfg)           #history current of the source capacitor
+        self.vLTerm = np.zeros(nCfg)          #history voltage of the load inductor
+        self.vCTerm = np.zeros(nCfg)          #history voltage of the load capacitor
+
+        #delay of the whole line, and of each stored point from the source (right wave) and from the load (left wave)
+        self.lineTap, self.lineFrac = DelayTaps(length/dt)
+        x = pos*length[:,None]
+        self.rightTap, self.rightFrac = DelayTaps(x/dt)
+        self.leftTap, self.leftFrac = DelayTaps((length[:,None]-x)/dt)
+        self.exact = not (np.any(self.rightFrac) or np.any(self.leftFrac))
+        self.shift = self.exact and np.all(self.rightTap == np.arange(self.nP)) #Courant ratio of 1, one grid point per time step
+
+        #Each buffer is stored twice (buf[i] and buf[i+M]) so that a delay d is always buf[head+M-d],
+        #no modulo needed, and with a Courant ratio of 1 the snapshot is a plain slice
+        self.M = self.lineTap.max() + 2
+        self.rightBuf = np.zeros((nCfg,2*self.M)) #wave launched at the source end, going to the load
+        self.leftBuf = np.zeros((nCfg,2*self.M))  #wave launched at the load end, going to the source
+        #when the line is shorter than one time step the newest sample is part of the boundary tap,
+        #so the two ends have to be solved together
+        self.g = np.where(self.lineTap == 0,1-self.lineFrac,0)
+        self.loop = 1 - self.gSrc*self.gTerm*self.g*self.g
+        self.head = 0
+        self.tIdx = 0                 #number of time steps done so far
+        self.driver = driver
+        if driver is not None:
+            if np.any(self.kLSrc) or np.any(self.gCSrc):
+                raise ValueError('a driver model can not have lSrc or cSrc')
+            if np.any(self.lineTap == 0):
+                raise ValueError('with a driver model the line has to be at least one time step long')
+            self.zDrv = zSrc + zTrace         #series resistor and line, seen from the driver pad
+
+    def Advance(self,srcDrv):
+        #run the time steps of srcDrv, returns the stored points (config,steps kept after decimation,points)
+        nCfg, nP, M, decimate = self.nCfg, self.nP, self.M, self.decimate
+        rightBuf, leftBuf, head = self.rightBuf, self.leftBuf, self.head
+        lineTap, lineFrac, g, loop = self.lineTap, self.lineFrac, self.g, self.loop
+        drvScale, termScale, gSrc, gTerm, zTrace = self.drvScale, self.termScale, self.gSrc, self.gTerm, self.zTrace
+        kLSrc, gCSrc, kLTerm, kCTerm, zSeries = self.kLSrc, self.gCSrc, self.kLTerm, self.kCTerm, self.zSeries
+        vLSrc, jCSrc, vLTerm, vCTerm = self.vLSrc, self.jCSrc, self.vLTerm, self.vCTerm
+        rightTap, rightFrac, leftTap, leftFrac = self.rightTap, self.rightFrac, self.leftTap, self.leftFrac
+        driver = self.driver
+        first = -self.tIdx % decimate       #first step of this chunk that is stored
+        if nCfg == 1 and driver is None:
+            return self.AdvanceScalar(srcDrv,first)
+        rows = np.arange(nCfg)
+        totalWave = np.zeros((nCfg,len(range(first,srcDrv.size,decimate)),nP)) #array to return
+        for tIdx in np.arange(srcDrv.size):
+            rightBuf[:,head] = rightBuf[:,head+M] = 0 #the current sample is not known yet
+            leftBuf[:,head] = leftBuf[:,head+M] = 0
+            k = head+M-lineTap
+            rightArrive = (1-lineFrac)*rightBuf[rows,k] + lineFrac*rightBuf[rows,k-1] #right wave reaching the load
+            leftArrive = (1-lineFrac)*leftBuf[rows,k] + lineFrac*leftBuf[rows,k-1]    #left wave reaching the source
+            #at the beginning is both the source (through the zSrc/zTrace voltage divider), and the reflection from the left-going wave
+            #at the end is the reflection from the right-going wave (plus the stored energy of a reactive load)
+            if self.reactive:
+                vSrc = (srcDrv[tIdx] + vLSrc + jCSrc*zSeries)/(1+zSeries*gCSrc)
+                vTerm = vCTerm - vLTerm
+                if driver is None:
+                    right = (vSrc*drvScale + gSrc*(leftArrive + g*(vTerm*termScale + gTerm*rightArrive)))/loop
+                else:
+                    right = self.DriveRight(srcDrv[tIdx],leftArrive)
+                left = vTerm*termScale + gTerm*(rightArrive + g*right)
+                #update the companion model history from the voltages and currents at the ends of the line
+                leftArrive += g*left
+                rightArrive += g*right
+                vLine = right + leftArrive
+                iCap = gCSrc*vLine - jCSrc
+                jCSrc = gCSrc*vLine + iCap
+                iSrc = (right - leftArrive)/zTrace + iCap
+                vLSrc = 2*kLSrc*iSrc - vLSrc
+                iTerm = (rightArrive - left)/zTrace
+                vLTerm = 2*kLTerm*iTerm - vLTerm
+                vCTerm = vCTerm + 2*kCTerm*iTerm
+            else:
+                if driver is None:
+                    right = (srcDrv[tIdx]*drvScale + gSrc*(leftArrive + g*gTerm*rightArrive))/loop
+                else:
+                    right = self.DriveRight(srcDrv[tIdx],leftArrive)
+                left = gTerm*(rightArrive + g*right)
+            rightBuf[:,head] = rightBuf[:,head+M] = right
+            leftBuf[:,head] = leftBuf[:,head+M] = left
+            if (tIdx - first) % decimate == 0 and tIdx >= first:
+                out = totalWave[:,(tIdx-first)//decimate,:]
+                if self.shift:
+                    k = head+M+1
+                    out[:] = rightBuf[:,k-nP:k][:,::-1] + leftBuf[:,k-nP:k]
+                elif self.exact:
+                    #right wave at x is rightBuf delayed by x/dt, left wave is leftBuf delayed by (length-x)/dt
+                    out[:] = rightBuf[rows[:,None],head+M-rightTap] + leftBuf[rows[:,None],head+M-leftTap]
+                else:
+                    k = head+M-rightTap
+                    out[:] = (1-rightFrac)*rightBuf[rows[:,None],k] + rightFrac*rightBuf[rows[:,None],k-1]
+                    k = head+M-leftTap
+                    out += (1-leftFrac)*leftBuf[rows[:,None],k] + leftFrac*leftBuf[rows[:,None],k-1]
+            head = (head+1) % M
+        self.head = head
+        self.vLSrc, self.jCSrc, self.vLTerm, self.vCTerm = vLSrc, jCSrc, vLTerm, vCTerm
+        self.tIdx += srcDrv.size
+        return totalWave
+
+    def AdvanceScalar(self,srcDrv,first):
+        #Advance for a single configuration without a driver model (MakeWaves): the boundary update is a scalar
+        #recurrence done on Python floats, and the stored points are gathered from the whole history of the
+        #launched waves afterwards, with numpy, instead of at every time step
+        M, nP, n = self.M, self.nP, srcDrv.size
+        lineTap, lineFrac = int(self.lineTap[0]), float(self.lineFrac[0])
+        drvScale, termScale, gSrc, gTerm, zTrace = [float(a[0]) for a in (self.drvScale,self.termScale,self.gSrc,self.gTerm,self.zTrace)]
+        kLSrc, gCSrc, kLTerm, kCTerm, zSeries = [float(a[0]) for a in (self.kLSrc,self.gCSrc,self.kLTerm,self.kCTerm,self.zSeries)]
+        vLSrc, jCSrc, vLTerm, vCTerm = [float(a[0]) for a in (self.vLSrc,self.jCSrc,self.vLTerm,self.vCTerm)]
+        g, loop = float(self.g[0]), float(self.loop[0])
+        #history of the launched waves, the M-1 samples in the buffers (oldest first) and the samples of this chunk
+        #history index i is time step i-(M-1) of this chunk, and the delay d is at index i-d
+        old = slice(self.head+1,self.head+M)
+        right = self.rightBuf[0,old].tolist() + [0.]*n
+        left = self.leftBuf[0,old].tolist() + [0.]*n
+        wNew = 1-lineFrac if lineTap > 0 else 0.   #a line shorter than one step has the newest sample in g
+        i = M-1
+        if not self.reactive:
+            for d in (np.asarray(srcDrv,dtype=float)*drvScale).tolist():
+                k = i-lineTap
+                rightArrive = wNew*right[k] + lineFrac*right[k-1]
+                leftArrive = wNew*left[k] + lineFrac*left[k-1]
+                r = (d + gSrc*(leftArrive + g*gTerm*rightArrive))/loop
+                right[i] = r
+                left[i] = gTerm*(rightArrive + g*r)
+                i += 1
+        else:
+            #the same companion models as in Advance
+            for d in np.asarray(srcDrv,dtype=float).tolist():
+                k = i-lineTap
+                rightArrive = wNew*right[k] + lineFrac*right[k-1]
+                leftArrive = wNew*left[k] + lineFrac*left[k-1]
+                vSrc = (d + vLSrc + jCSrc*zSeries)/(1+zSeries*gCSrc)
+                vTerm = vCTerm - vLTerm
+                r = (vSrc*drvScale + gSrc*(leftArrive + g*(vTerm*termScale + gTerm*rightArrive)))/loop
+                l = vTerm*termScale + gTerm*(rightArrive + g*r)
+                right[i], left[i] = r, l
+                leftArrive += g*l
+                rightArrive += g*r
+                vLine = r + leftArrive
+                iCap = gCSrc*vLine - jCSrc
+                jCSrc = gCSrc*vLine + iCap
+                vLSrc = 2*kLSrc*((r - leftArrive)/zTrace + iCap) - vLSrc
+                iTerm = (rightArrive - l)/zTrace
+                vLTerm = 2*kLTerm*iTerm - vLTerm
+                vCTerm = vCTerm + 2*kCTerm*iTerm
+                i += 1
+            self.vLSrc[0], self.jCSrc[0], self.vLTerm[0], self.vCTerm[0] = vLSrc, jCSrc, vLTerm, vCTerm
+        right, left = np.asarray(right), np.asarray(left)
+
+        #stored points, a block of time steps at a time to keep the index arrays small
+        steps = np.arange(first,n,self.decimate) + M-1
+        totalWave = np.empty((1,steps.size,nP))
+        block = max(1,2**18//nP)
+        for b in range(0,steps.size,block):
+            i = steps[b:b+block,None]
+            totalWave[0,b:b+block] = Delayed(right,i-self.rightTap,self.rightFrac) + Delayed(left,i-self.leftTap,self.leftFrac)
+
+        #put the newest M-1 samples back in the buffers
+        self.head = (self.head+n) % M
+        slots = (self.head - np.arange(1,M)) % M
+        self.rightBuf[0,slots] = self.rightBuf[0,slots+M] = right[:-M:-1]
+        self.leftBuf[0,slots] = self.leftBuf[0,slots+M] = left[:-M:-1]
+        self.tIdx += n
+        return totalWave
+
+    def DriveRight(self,state,leftArrive):
+        #right going wave launched by the nonlinear driver, the line is a Thevenin source of twice the incoming
+        #wave behind zTrace, and the series resistor zSrc is between it and the driver pad
+        vPad, iPad = self.driver.Solve(state,2*leftArrive,self.zDrv)
+        return vPad - iPad*(self.zDrv - self.zTrace) - leftArrive
+
+    def Select(self,rows):
+        #keep only some of the configurations (index array or boolean mask), for example to stop
+        #simulating the ones that already failed
+        for name in ('zTrace','kLSrc','gCSrc','kLTerm','kCTerm','zSeries','drvScale','termScale','gSrc','gTerm',
+                     'vLSrc','jCSrc','vLTerm','vCTerm','lineTap','lineFrac','rightTap','rightFrac','leftTap','leftFrac',
+                     'rightBuf','leftBuf','g','loop') + (('zDrv',) if self.driver is not None else ()):
+            setattr(self,name,getattr(self,name)[rows])
+        self.nCfg = self.lineTap.size
+
+##########################################################################
+###   Automatic grid selection
+###   Instead of picking nX and nT by hand, start with a few time steps per rise time of srcDrv and keep
+###   halving the time step until a Richardson estimate of the error is below tol. The first time step
+###   only depends on the rise time, not on the length of the line. When the line is longer than that
+###   step, it is shortened so the line is a whole number of steps long (Courant ratio of 1) and the delay
+###   engine does exact shifts. A shorter line is less than one step long, which the delay engine handles
+###   with the fractional tap, so a short line does not force a fine grid.
+###   https://en.wikipedia.org/wiki/Richardson_extrapolation
+##########################################################################
+
+def AutoWaves(srcDrv,zSrc,zTrace,zTerm,length,endT,tol=1e-3,probes=(0.,0.5,1.),method='delay',
+              pointsPerRise=4,maxT=2**20,**terms):
+    #srcDrv is sampled uniformly over endT and treated as piecewise linear
+    #probes are positions as a fraction of the line length, terms are lSrc,cSrc,lTerm,cTerm
+    #returns (totalWave,t,err,nT): waves at the probes on the chosen time grid t, the estimated maximum error,
+    #and the number of time steps (method='interp' also gets a grid of about length/dt points along the line)
+    order = 2                      #linear interpolation and trapezoidal companion models are second order
+    pos = ProbePositions(probes)
+    t0 = np.arange(srcDrv.size)*endT/srcDrv.size
+    slope = np.abs(np.diff(srcDrv)).max()/(endT/srcDrv.size)
+    tRise = np.ptp(srcDrv)/slope if slope > 0 else endT
+    tRise = max(tRise,endT/srcDrv.size) #srcDrv can not be resolved better than its own samples
+
+    def Run(dt):
+        nT = int(np.ceil(endT/dt - 1e-9))
+        t = np.arange(nT)*dt
+        drv = np.interp(t,t0,srcDrv)
+        nX = max(2,int(np.ceil(length/dt - 1e-9)) + 1)
+        return MakeWaves(drv,zSrc,zTrace,zTerm,length,nX,nT*dt,method,pos,**terms), t
+
+    dt = tRise/pointsPerRise
+    if length >= dt:
+        dt = length/np.ceil(length/dt - 1e-9)
+    coarse, t = Run(dt)
+    while True:
+        fine, tFine = Run(dt/2)
+        #the coarse time steps are every other fine step
+        err = np.abs(coarse - fine[::2][:coarse.shape[0]]).max()*2**order/(2**order-1)
+        if err <= tol or tFine.size > maxT:
+            return coarse, t, err, t.size
+        dt, coarse, t = dt/2, fine, tFine
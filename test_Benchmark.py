@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 09:40:00 2026
+
+@author: MarcMignard
+"""
+import numpy as np
+from Benchmark import CheckAccuracy, ExactWaves, SpiceFromSvg, NT
+from Lattice import LatticeWaves
+
+def test_exact_waves_match_lattice():
+    #the frequency domain reference agrees with the bounce diagram for resistive ends, also an open load
+    drv = np.minimum(np.arange(1,1001)/100,1.)
+    drv[600:] = 0
+    for zSrc,zTerm in ((20,np.inf),(150,30)):
+        ref = LatticeWaves(drv,zSrc,100,zTerm,1.5,10.,probes=(0.,0.4,1.),tol=1e-14)[0]
+        assert np.allclose(ExactWaves(drv,0.01,zSrc,100,zTerm,1.5,(0.,0.4,1.),fine=2),ref,atol=1e-12)
+
+def test_accuracy_checks():
+    results = {a['check']: a for a in CheckAccuracy()}
+    assert results['reflections']['passed'] and results['reactive']['passed']
+    #the engine against the LTSpice traces saved with the repository, an outside simulator
+    assert results['spice']['passed'] is True
+
+def test_spice_from_svg():
+    #the LTSpice figure has the six cases of reflections.svg with the source, middle and load traces
+    spice = SpiceFromSvg()
+    assert spice.shape == (6,NT,3)
+    assert np.allclose(spice[:,0,:],0,atol=1e-3)
+    #with a matched source the open load settles at the drive, zSrc=20 overshoots at the load of the long line
+    assert np.allclose(spice[1::2,950,2],1,atol=1e-3)
+    assert spice[4,:,2].max() > 1.5
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 10:40:00 2026
+
+@author: MarcMignard
+"""
+import numpy as np
+from CoupledLines import CoupledWaves, Crosstalk, Modes, ImpedanceMatrix
+from WaveEngine import SweepWaves
+
+def Drive(nT=1000):
+    return np.minimum(np.arange(1,nT+1)/50,1.)
+
+def Bus(n=3,k=0.15):
+    near = np.eye(n,k=1) + np.eye(n,k=-1)
+    return 50*(np.eye(n) + k*near), (np.eye(n)*(1+k) - k*near)/50
+
+def test_one_line_matches_delay_engine():
+    drv = Drive()
+    coupled = CoupledWaves(drv,[[50.]],[[0.02]],20,np.inf,1.,10.,probes=(0.,0.5,1.))
+    line = SweepWaves(drv,20,50,np.inf,1.,2,10.,[0.,0.5,1.])
+    assert np.allclose(coupled[...,0],line,atol=1e-12)
+
+def test_modes():
+    L, C = Bus()
+    tv, delay, zMode = Modes(L,C)
+    assert np.allclose(tv.T @ C @ tv,np.eye(3))
+    #the impedance matrix of uncoupled lines is sqrt(L/C) on the diagonal
+    assert np.allclose(ImpedanceMatrix(np.eye(2)*50,np.eye(2)*0.02),np.eye(2)*50)
+
+def test_uncoupled_lines_have_no_crosstalk():
+    L, C = Bus(k=0)
+    patterns = np.array([[1,0,0],[0,1,0],[1,0,1]])
+    waves = CoupledWaves(Drive(),L,C,50,50,1.,10.,patterns=patterns)
+    xt = Crosstalk(waves,patterns)
+    assert np.nanmax(xt['next']) < 1e-12 and np.nanmax(xt['fext']) < 1e-12
+    assert np.isnan(xt['next'][0,0])
+
+def test_superposition_of_patterns():
+    #more patterns than lines are built from the response of each line alone
+    L, C = Bus()
+    patterns = np.array([[1,0,0],[0,1,0],[0,0,1],[1,-1,1]])
+    many = CoupledWaves(Drive(),L,C,40,60,1.,10.,patterns=patterns)
+    one = CoupledWaves(Drive(),L,C,40,60,1.,10.,patterns=patterns[3:])
+    assert np.allclose(many[3],one[0],atol=1e-12)
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 12:00:00 2026
+
+@author: MarcMignard
+"""
+import numpy as np
+import pytest
+from EyeDiagram import PrbsBits, PrbsDrive, EyeDiagram
+
+@pytest.mark.parametrize('order',[7,9,15])
+def test_prbs_period(order):
+    #a maximal length sequence repeats after 2^n-1 bits, not before, and has one more 1 than 0's
+    period = 2**order - 1
+    gen = PrbsBits(order,1000)
+    bits = np.concatenate([next(gen) for _ in range(-(-2*period//1000))])
+    assert np.array_equal(bits[period:2*period],bits[:period])
+    for d in range(1,period):
+        if period % d == 0:
+            assert not np.array_equal(bits[d:d+period],bits[:period])
+    assert bits[:period].sum() == 2**(order-1)
+
+def test_prbs_drive_chunks():
+    #the drive does not depend on how it is cut into chunks
+    drive = lambda chunkBits: np.concatenate(list(PrbsDrive(7,300,4,3,chunkBits=chunkBits)))
+    whole = drive(4096)
+    assert whole.size == 300*4
+    for chunkBits in (1,7,100):
+        assert np.array_equal(drive(chunkBits),whole)
+
+def Eye(wave,chunks):
+    eye = EyeDiagram(16,-0.1,1.1,nBins=120,nUI=2,skip=5)
+    start = 0
+    for n in chunks:
+        eye.Add(wave[start:start+n])
+        start += n
+    eye.Add(wave[start:])
+    return eye
+
+def test_histogram_chunks():
+    wave = np.concatenate(list(PrbsDrive(7,200,16,4))) + 0.01*np.sin(np.arange(200*16))
+    whole = Eye(wave,[])
+    assert whole.hist.sum() == wave.size - 5
+    assert np.array_equal(Eye(wave,[0,1,3,17,0,333,1]).hist,whole.hist)
+
+def test_opening():
+    #a clean drive with edges of 4 samples: the eye is fully open in the middle of the bit,
+    #and closed on the edges
+    wave = np.concatenate(list(PrbsDrive(7,254,16,4)))
+    eye = Eye(wave,[])
+    opening = eye.Opening(0.5)
+    assert np.allclose(opening[3:16],1.,atol=0.02)
+    assert np.all(opening[:3] < 0.6) and np.all(opening[16:19] < 0.6)
+    #a wave that is always high has no eye to measure
+    high = EyeDiagram(16,-0.1,1.1)
+    high.Add(np.ones(100))
+    assert np.all(np.isnan(high.Opening(0.5)))
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 12:30:00 2026
+
+@author: MarcMignard
+"""
+import sys
+import subprocess
+import numpy as np
+import pytest
+from PIL import Image
+import FrameExport
+from FrameExport import ExportAnimation, DrawCurve, COLORS
+
+def Panels(nFrames=40,nX=30):
+    #a step moving along the line, and a second panel with a flat line
+    x = np.linspace(0,1,nX)
+    waves = (x[None,:] <= np.linspace(0,1,nFrames)[:,None]).astype(float)
+    return [dict(xlim=(0,1),ylim=(-0.5,1.5),title='right',curves=[(x,waves,0.,'r')]),
+            dict(xlim=(0,1),ylim=(-0.5,1.5),title='left',curves=[(x,0.5*waves[::-1],0.,'b')])]
+
+def GifPixels(fn):
+    with Image.open(fn) as im:
+        frames = []
+        for i in range(im.n_frames):
+            im.seek(i)
+            frames.append(np.asarray(im.convert('RGB')))
+    return np.stack(frames)
+
+def test_draw_curve():
+    frame = np.zeros((50,100,3),dtype=np.uint8)
+    DrawCurve(frame,(10,10,90,40),(0,1),(0,1),np.array([0.,1.]),np.array([0.5,0.5]),(255,0,0),lineWidth=2)
+    red = np.all(frame == (255,0,0),axis=2)
+    rows, cols = np.nonzero(red)
+    assert cols.min() == 10 and cols.max() == 89      #only inside the panel
+    assert rows.min() >= 23 and rows.max() <= 27      #around the middle of the panel height
+
+def test_gif_export(tmp_path,monkeypatch):
+    monkeypatch.setattr(FrameExport,'Encoder',lambda *args: None)   #Pillow, also when ffmpeg is installed
+    fn = str(tmp_path/'one.gif')
+    assert ExportAnimation(fn,Panels(),fps=20,step=2,size=(4,2),dpi=50,workers=1,chunk=7) == 20
+    one = GifPixels(fn)
+    assert one.shape == (20,100,200,3)
+    for color in ('r','b'):
+        assert np.any(np.all(one == COLORS[color],axis=3))
+    #the frames drawn on a process pool are the same, and in the same order
+    fn = str(tmp_path/'two.gif')
+    assert ExportAnimation(fn,Panels(),fps=20,step=2,size=(4,2),dpi=50,workers=2,chunk=3) == 20
+    assert np.array_equal(GifPixels(fn),one)
+
+def test_encoder_error_does_not_hide_drawing_error(tmp_path,monkeypatch):
+    #an encoder that fails, and drawing that fails first: the drawing error is the one raised
+    failing = lambda *args: subprocess.Popen([sys.executable,'-c','import sys; sys.exit(1)'],stdin=subprocess.PIPE)
+    monkeypatch.setattr(FrameExport,'Encoder',failing)
+    def Broken(span):
+        raise ValueError('bad frame')
+    monkeypatch.setattr(FrameExport,'RenderFrames',Broken)
+    with pytest.raises(ValueError,match='bad frame'):
+        ExportAnimation(str(tmp_path/'out.mp4'),Panels(),size=(4,2),dpi=50,workers=1)
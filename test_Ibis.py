@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 09:20:00 2026
+
+@author: MarcMignard
+"""
+import numpy as np
+from Ibis import OpenIbis, DriverModel, IbisNumber
+from WaveEngine import SweepWaves
+
+#a 20Ω driver to 1V, with NA min and max corners everywhere
+IBS = """[IBIS Ver]   5.1
+[File Name]  test.ibs
+[Component]  TESTCHIP
+[Manufacturer] Me
+[Pin] signal_name model_name
+1 OUT drv
+[Model]  drv
+Model_type Output
+C_comp 1.0pF NA NA
+[Voltage Range] 1.0V 0.9V 1.1V
+[Pulldown]
+| V  I(typ) I(min) I(max)
+-1.0 -50mA NA NA
+0.0 0.0 NA NA
+1.0 50mA NA NA
+2.0 100mA NA NA
+[Pullup]
+-1.0 50mA NA NA
+0.0 0.0 NA NA
+1.0 -50mA NA NA
+2.0 -100mA NA NA
+[Ramp]
+dV/dt_r 0.6/0.6n NA NA
+dV/dt_f 0.6/0.3n 0.5/0.4n NA
+R_load = 50
+[Model] other
+Model_type Input
+[End]
+"""
+
+def Model(tmp_path):
+    fn = tmp_path/'test.ibs'
+    fn.write_text(IBS)
+    return OpenIbis(str(fn)).Model('drv')
+
+def test_numbers():
+    assert np.isclose(IbisNumber('50mA'),50e-3)
+    assert np.isclose(IbisNumber('1.5n'),1.5e-9,rtol=1e-12,atol=0)
+    assert np.isnan(IbisNumber('NA'))
+
+def test_ramp_na_corners(tmp_path):
+    model = Model(tmp_path)
+    #NA is a pair of nan, like the corners that are given
+    assert len(model.ramp['dv/dt_r'][1]) == 2 and np.all(np.isnan(model.ramp['dv/dt_r'][1]))
+    assert np.allclose(model.ramp['dv/dt_f'][1],(0.5,0.4e-9),rtol=1e-12,atol=0)
+    assert model.ramp['r_load'] == 50
+    for corner in ('typ','min','max'):
+        #NA corners use the typ ramp
+        assert np.isclose(DriverModel(model,corner).RampTime(),1.)
+    assert np.isclose(DriverModel(model,'typ').RampTime(False),0.5)
+    assert np.isclose(DriverModel(model,'min').RampTime(False),0.4/0.6)
+    assert np.isclose(DriverModel(model,'max').RampTime(False),0.5)
+
+def test_linear_driver_is_a_resistor(tmp_path):
+    #straight V-I tables are a 20Ω source, so with 10Ω in series it is zSrc=30 in the resistive engine
+    driver = DriverModel(Model(tmp_path))
+    drv = np.minimum(np.arange(1,2001)/100,1.)
+    ibis = SweepWaves(drv,10,50,np.inf,1.,2,20.,probes=[0.,1.],driver=driver)
+    res = SweepWaves(drv,30,50,np.inf,1.,2,20.,probes=[0.,1.])
+    assert np.allclose(ibis,res*driver.vcc,atol=1e-12)
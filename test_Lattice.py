@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 09:00:00 2026
+
+@author: MarcMignard
+"""
+import warnings
+import numpy as np
+from Lattice import LatticeWaves
+
+def Step(nT=1000):
+    #unit step that rises over the first 10 time steps
+    return np.minimum(np.arange(1,nT+1)/10,1.)
+
+def test_open_load_doubles():
+    #a matched source launches half of the drive, and an open load sees twice that after one delay
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        waves = LatticeWaves(Step(),50,50,np.inf,1.,10.,probes=(0.,1.))
+    load = waves[0,:,1]
+    assert np.all(load[:100] == 0)
+    assert np.allclose(load[110:],1.)
+    assert np.allclose(waves[0,-1,0],1.)
+
+def test_shorted_load():
+    #a short reflects the wave with the opposite sign, so the load stays at zero and the source
+    #drops back to zero after the round trip
+    waves = LatticeWaves(Step(),50,50,0,1.,10.,probes=(0.,1.))
+    assert np.allclose(waves[0,:,1],0)
+    assert np.allclose(waves[0,50:200,0],0.5)
+    assert np.allclose(waves[0,210:,0],0)
+
+def Bounces(f,t,x,zSrc,zTrace,zTerm,length,nBounce=200):
+    #the bounce sum written out for a continuous drive f(t), at position x along the line
+    gSrc, gTerm = (zSrc-zTrace)/(zSrc+zTrace), (zTerm-zTrace)/(zTerm+zTrace)
+    amp = 1/(1+zSrc/zTrace)
+    v = np.zeros_like(t)
+    for m in range(nBounce):
+        v += amp*(gSrc*gTerm)**m*(f(t-x-2*m*length) + gTerm*f(t-2*length+x-2*m*length))
+    return v
+
+def test_off_grid_length():
+    #a line that is not a whole number of time steps long still gives the exact bounce sum, because the
+    #drive is piecewise linear with its corners on the time grid
+    dt, nT = 0.01, 2000
+    f = lambda t: np.clip(t/0.5,0,1)
+    t = np.arange(nT)*dt
+    waves = LatticeWaves(f(t),20,50,200,1.003,nT*dt,probes=(0.,0.3,1.),tol=1e-14)
+    for p,x in enumerate((0.,0.3,1.)):
+        assert np.allclose(waves[0,:,p],Bounces(f,t,x*1.003,20,50,200,1.003),rtol=0,atol=1e-12)
@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 10:50:00 2026
+
+@author: MarcMignard
+"""
+import numpy as np
+from LineResponse import LineResponse
+from WaveEngine import SweepWaves
+
+def test_matches_sweep():
+    #the FFT convolution with the impulse response gives the same waves as the step by step simulation
+    drv = np.minimum(np.arange(1,3001)/50,1.)
+    drv[1500:] = 0
+    zSrc, length = np.array([20,50,100]), np.array([0.5,1.,0.37])
+    resp = LineResponse(zSrc,50,100,length,0.01,(0.,0.5,1.),cTerm=0.02)
+    ref = SweepWaves(drv,zSrc,50,100,length,2,30.,[0.,0.5,1.],cTerm=0.02)
+    assert np.allclose(resp.Waves(drv),ref,atol=1e-7)
+    #a batch of drives
+    assert np.allclose(resp.Waves(np.stack((drv,2*drv)))[1],2*ref,atol=1e-7)
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 11:00:00 2026
+
+@author: MarcMignard
+"""
+import numpy as np
+from LossyLine import LossyLine
+from Lattice import LatticeWaves
+
+def Drive(nT=2000):
+    drv = np.minimum(np.arange(1,nT+1)/100,1.)
+    drv[1000:] = 0
+    return drv
+
+def test_lossless_limit():
+    #without R and G the lossy line is the lossless one
+    drv = Drive()
+    lossy = LossyLine(0,50,0,0.02,1.,0.01).Waves(drv,20,1e6)
+    exact = LatticeWaves(drv,20,50,1e6,1.,20.,probes=(0.,0.5,1.),tol=1e-12)
+    assert np.abs(lossy - exact).max() < 1e-9
+
+def test_series_loss_lowers_the_load_voltage():
+    #the DC level at an open load is the same, but the first edge arrives smaller
+    drv = np.minimum(np.arange(1,4001)/100,1.)
+    lossless = LossyLine(0,50,0,0.02,1.,0.01).Waves(drv,50,1e6)[0,:,2]
+    lossy = LossyLine(5,50,0,0.02,1.,0.01).Waves(drv,50,1e6)[0,:,2]
+    assert lossy[150] < lossless[150]
+    assert np.isclose(lossy[-1],lossless[-1],atol=1e-2)
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 10:00:00 2026
+
+@author: MarcMignard
+"""
+import numpy as np
+from MonteCarlo import Histogram, Percentiles, MonteCarlo, Tolerance
+
+def test_histogram_counts_every_value_once():
+    edges = np.linspace(0,1,11)
+    values = np.array([-np.inf,-1,0,0.05,0.5,1-1e-12,1,1,2,np.inf,np.nan])
+    h = Histogram(values,edges)
+    assert h.sum() == values.size
+    assert h[0] == 2 and h[1] == 2 and h[-3] == 1
+    assert h[-2] == 4 and h[-1] == 1       #1, 1, 2 and inf are over, nan is counted apart
+
+def test_percentiles_at_the_last_edge():
+    edges = np.linspace(0,1,11)
+    h = Histogram(np.ones(10),edges)
+    #all the samples are at the last edge, which is the lower edge of the overflow bin
+    assert np.all(Percentiles(h,edges,[1,50,99]) == 1)
+
+def test_worker_count_does_not_change_result():
+    dists = {'zSrc': Tolerance(40,20), 'zTrace': Tolerance(50,10), 'zTerm': 1e6, 'length': Tolerance(0.5,20)}
+    one = MonteCarlo(300,dists,shardSize=100,workers=1)
+    two = MonteCarlo(300,dists,shardSize=100,workers=2)
+    assert one['yield'] == two['yield']
+    for k in one['histograms']:
+        assert np.array_equal(one['histograms'][k],two['histograms'][k])
+        assert one['histograms'][k].sum() == 300
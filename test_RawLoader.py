@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 09:50:00 2026
+
+@author: MarcMignard
+"""
+import numpy as np
+import pytest
+from RawLoader import RawWaves
+
+NAMES = ['time','V(vs)','V(vl)']
+
+def Header(nPoints,flags,marker,names=NAMES):
+    lines = ['Title: test','Date: Mon Oct 19 09:50:00 2026','Plotname: Transient Analysis',f'Flags: {flags}',
+             f'No. Variables: {len(names)}',f'No. Points: {nPoints}','Offset: 0.0','Variables:']
+    lines += [f'\t{i}\t{n}\t{"time" if i == 0 else "voltage"}' for i,n in enumerate(names)]
+    return '\n'.join(lines + [marker]) + '\n'
+
+def Traces(nPoints=7):
+    t = np.linspace(0,1e-9,nPoints)
+    return [t,np.sin(1e9*t),-np.cos(1e9*t)]
+
+@pytest.mark.parametrize('encoding,flags,double',[('utf_16_le','real forward',False),          #LTSpice
+                                                  ('utf_16_le','real forward fastaccess',False),
+                                                  ('utf_8','real',True)])                      #ngspice
+def test_binary_round_trip(tmp_path,encoding,flags,double):
+    traces = Traces()
+    types = ['<f8'] + ['<f8' if double else '<f4']*2
+    if 'fastaccess' in flags:
+        data = b''.join(v.astype(d).tobytes() for v,d in zip(traces,types))
+    else:
+        rec = np.zeros(traces[0].size,dtype=np.dtype({'names':NAMES,'formats':types}))
+        for n,v in zip(NAMES,traces):
+            rec[n] = v
+        data = rec.tobytes()
+    fn = tmp_path/'test.raw'
+    fn.write_bytes(Header(traces[0].size,flags,'Binary:').encode(encoding) + data)
+    raw = RawWaves(str(fn))
+    assert raw.names == NAMES
+    for n,v,d in zip(NAMES,traces,types):
+        assert np.array_equal(raw.GetTrace(n),v.astype(d))
+    assert np.array_equal(raw.GetTimeAxis(),traces[0])
+
+def test_ascii_complex(tmp_path):
+    #an AC analysis written as text, with negative imaginary parts
+    f = np.array([1e6,1e7,1e8])
+    v = np.array([1-2j,-0.5+0.25j,3e-3-4e-5j])
+    lines = [f'{i}\t{a.real:.6e},{a.imag:.6e}\n\t{b.real:.6e},{b.imag:.6e}\n\t{-b.real:.6e},{-b.imag:.6e}'
+             for i,(a,b) in enumerate(zip(f.astype(complex),v))]
+    fn = tmp_path/'ac.raw'
+    fn.write_text(Header(f.size,'complex forward','Values:',['frequency','V(vs)','V(vl)']) + '\n'.join(lines) + '\n')
+    raw = RawWaves(str(fn))
+    assert np.allclose(raw.GetTrace('frequency'),f)
+    assert np.allclose(raw.GetTrace('V(vs)'),v)
+    assert np.allclose(raw.GetTrace('v(vl)'),-v)
+
+def test_stepped(tmp_path):
+    #two steps of a .step run, the time axis starts again at 0
+    t = np.concatenate((np.linspace(0,1,4),np.linspace(0,1,5)))
+    v = np.arange(t.size,dtype=float)
+    rec = np.zeros(t.size,dtype=[('t','<f8'),('v','<f8')])
+    rec['t'], rec['v'] = t, v
+    fn = tmp_path/'step.raw'
+    fn.write_bytes(Header(t.size,'real forward stepped','Binary:',['time','V(vl)']).encode('utf_8') + rec.tobytes())
+    raw = RawWaves(str(fn))
+    assert list(raw.GetSteps()) == [0,1]
+    assert np.array_equal(raw.GetWave('V(vl)',1),v[4:])
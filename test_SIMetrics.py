@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 09:10:00 2026
+
+@author: MarcMignard
+"""
+import numpy as np
+from SIMetrics import WaveMetrics, MetricState, MeetsLimits
+from WaveEngine import SweepWaves, StreamWaves
+
+DT = 0.01
+
+def Waves():
+    #the reflections of an open line with a few source impedances, a good match and some ringing
+    drv = np.zeros(2000)
+    drv[:1000] = np.minimum(np.arange(1,1001)/100,1.)
+    return drv, SweepWaves(drv,[20,50,100,200],50,np.inf,[0.5,1.,2.,0.25],2,20.,probes=[0.,0.5,1.])
+
+def Chunked(waves,sizes):
+    state = MetricState(DT)
+    start = 0
+    for n in sizes:
+        state.Add(waves[:,start:start+n])
+        start += n
+    state.Add(waves[:,start:])
+    return state.Results()
+
+def Same(a,b):
+    for k in a:
+        np.testing.assert_array_equal(a[k],b[k],err_msg=k)
+
+def test_chunks_match_whole_array():
+    _, waves = Waves()
+    whole = WaveMetrics(waves,DT)
+    rng = np.random.default_rng(1)
+    Same(whole,Chunked(waves,rng.integers(0,50,60)))
+    #empty chunks first, then a first chunk of one sample, and more empty and one sample chunks
+    Same(whole,Chunked(waves,[0,0,1,0,1,1,0,7,1]))
+    Same(whole,Chunked(waves,[1]))
+
+def test_stream_with_large_decimate():
+    #decimate larger than the chunks gives empty chunks from StreamWaves
+    drv, waves = Waves()
+    state = MetricState(DT*16)
+    for w in StreamWaves(np.split(drv,200),[20,50,100,200],50,np.inf,[0.5,1.,2.,0.25],DT,[0.,0.5,1.],decimate=16):
+        state.Add(w)
+    Same(WaveMetrics(waves[:,::16],DT*16),state.Results())
+
+def test_never_reaches_vih():
+    #a wave that wobbles after Vil but never gets to Vih is not counted as non-monotonic
+    t = np.arange(500)*DT
+    wave = np.minimum(t,0.5) + 0.02*np.sin(40*t)*(t > 0.4)
+    res = WaveMetrics(wave[:,None],DT)
+    assert np.isnan(res['tVih'][0])
+    assert res['nonMonotonic'][0] == 0
+    assert not MeetsLimits(res)[0]
+
+def test_non_monotonic_edge():
+    #a step down between Vil and Vih is counted once the wave gets to Vih, in any chunking
+    wave = np.concatenate((np.linspace(0,0.5,50),[0.45,0.4],np.linspace(0.4,1,50),np.ones(50)))[None,:,None]
+    whole = WaveMetrics(wave,DT)
+    assert whole['nonMonotonic'][0,0] == 2
+    Same(whole,Chunked(wave,[51,1,1]))
+
+def test_ring_up():
+    #the falling edge crosses Vil (0.2) at 0.19, then rings back up to 0.1 before it settles
+    wave = np.concatenate((np.linspace(0,1,50),np.ones(50),[0.8,0.6,0.4,0.19,0.,-0.2,-0.1,0.,0.1,0.05],np.zeros(50)))
+    wave = wave[None,:,None]
+    whole = WaveMetrics(wave,DT)
+    assert np.isclose(whole['ringUp'][0,0],0.1)
+    assert np.isclose(whole['ringUpMargin'][0,0],0.1)
+    Same(whole,Chunked(wave,[103,1,1]))
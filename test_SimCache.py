@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 11:10:00 2026
+
+@author: MarcMignard
+"""
+import os
+import time
+import importlib
+import numpy as np
+import pytest
+from SimCache import SimCache, CodeHash
+
+calls = []
+
+def Simulate(n,scale=1.):
+    calls.append(n)
+    return {'t': np.arange(n)*1., 'v': np.ones(n)*scale}
+
+@pytest.mark.parametrize('compress',[False,True])
+def test_call_is_cached(tmp_path,compress):
+    cache = SimCache(str(tmp_path),compress=compress)
+    calls.clear()
+    first = cache.Call(Simulate,5,scale=2.)
+    again = cache.Call(Simulate,5,scale=2.)
+    assert calls == [5]
+    assert np.array_equal(again['v'],first['v'])
+    #a result that was just simulated is read-only like one from the cache
+    assert not first['v'].flags.writeable and not again['v'].flags.writeable
+    cache.Call(Simulate,5,scale=3.)          #any change of the inputs is a new entry
+    assert calls == [5,5]
+
+def test_keys():
+    cache = SimCache.__new__(SimCache)
+    assert cache.Key(np.arange(3)) != cache.Key(np.arange(3.))    #dtype is part of the key
+    assert cache.Key({'a':1,'b':2}) == cache.Key({'b':2,'a':1})
+    with pytest.raises(TypeError):
+        cache.Key(object())
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = SimCache(str(tmp_path),maxBytes=10**9)
+    for i in range(3):
+        cache.Put(f'k{i}',{'a': np.zeros(1000)})
+        os.utime(tmp_path/f'k{i}',(time.time()-100+i,)*2)
+    cache.Get('k0')                           #k0 is now the most recently used
+    cache.maxBytes = 2*(sum(e.stat().st_size for e in os.scandir(tmp_path/'k0')) + 1)
+    cache.Evict()
+    assert cache.Get('k1') is None
+    assert cache.Get('k0') is not None and cache.Get('k2') is not None
+
+def test_code_change_is_a_new_entry(tmp_path,monkeypatch):
+    #editing the module of the function, or a module next to it that it uses, is a new entry
+    src = tmp_path/'src'
+    src.mkdir()
+    (src/'helper.py').write_text('SCALE = 2.\n')
+    (src/'engine.py').write_text('import numpy as np\nimport helper\ndef Run(n):\n    return np.ones(n)*helper.SCALE\n')
+    monkeypatch.syspath_prepend(str(src))
+    engine = importlib.import_module('engine')
+    cache = SimCache(str(tmp_path/'cache'))
+    before = CodeHash(engine.Run)
+    cache.Call(engine.Run,3)
+    assert len(os.listdir(tmp_path/'cache')) == 1
+    (src/'helper.py').write_text('SCALE = 3.  #changed\n')
+    assert CodeHash(engine.Run) != before
+    cache.Call(engine.Run,3)
+    assert len(os.listdir(tmp_path/'cache')) == 2
+
+def test_put_only_scans_when_needed(tmp_path):
+    cache = SimCache(str(tmp_path),maxBytes=10**9)
+    scans = []
+    evict = cache.Evict
+    cache.Evict = lambda: (scans.append(1),evict())
+    for i in range(10):
+        cache.Put(f'k{i}',{'a': np.zeros(1000)})
+    assert len(scans) == 1                     #only the first put, to learn the size of the cache
+    cache.maxBytes = 1
+    cache.Put('k10',{'a': np.zeros(1000)})
+    assert len(scans) == 2 and os.listdir(tmp_path) == []
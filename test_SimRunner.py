@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 11:20:00 2026
+
+@author: MarcMignard
+"""
+import os
+import numpy as np
+from SimRunner import RunSweep, NativeBackend, NgspiceBackend, PulseWave, TRACES
+from SimCache import SimCache
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+PULSE = dict(tStart=1,tRise=1,tOn=4,tPeriod=20,nCycles=1,tEnd=20)
+
+def Jobs():
+    fn = os.path.join(HERE,'LTSpice','singleTrace')
+    return [dict(PULSE,schematic=fn,tdT1=0.25,tdT2=0.75,zSource=z,zTrace=100,zTerm=1e6) for z in (20,100)]
+
+def test_pulse_wave():
+    t = np.array([0,1,1.5,2,6,6.5,7,30])
+    assert np.allclose(PulseWave(t,PULSE),[0,0,0.5,1,1,0.5,0,0])
+
+def test_native_sweep_and_cache(tmp_path):
+    cache = SimCache(str(tmp_path))
+    results = RunSweep(Jobs(),NativeBackend(0.01),workers=1,cache=cache)
+    assert all(sorted(r) == sorted(TRACES) for r in results)
+    #an open line driven from 100Ω settles at the full drive, from 20Ω it overshoots at the load
+    assert np.isclose(results[1]['V(vl)'][550],1.,atol=1e-3)
+    assert results[0]['V(vl)'].max() > 1.3
+    again = RunSweep(Jobs(),NativeBackend(0.01),workers=2,cache=cache)
+    assert all(np.array_equal(a['V(vl)'],b['V(vl)']) for a,b in zip(results,again))
+
+def test_ngspice_netlist():
+    net = NgspiceBackend().Netlist(Jobs()[0])
+    assert 'PULSE(0 1 1n 1n 1n 4n 20n 1)' in net
+    assert '.tran' in net.lower()
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 10:10:00 2026
+
+@author: MarcMignard
+"""
+import numpy as np
+import pytest
+from TermOptimizer import OptimizeTermination, Describe, CheckDesigns, Pulse
+from WaveEngine import SweepWaves
+from SIMetrics import WaveMetrics, MeetsLimits
+
+def test_series_resistor_excludes_driver():
+    designs = OptimizeTermination(2,100,rDrv=10)
+    best = designs[0]
+    assert best['topology'] == 'series R'
+    #zSrc is the driver and the resistor together, rSeries only the part on the board
+    assert best['rSeries'] == best['zSrc'] - 10
+    assert Describe(best) == f"series R {best['rSeries']:g}Ω"
+
+def test_describe():
+    assert Describe(dict(rSeries=22.,zSrc=32.,cSrc=0.047,zTerm=np.inf)) == 'series R 22Ω, source C 47pF'
+    assert Describe(dict(rSeries=0.,zSrc=10.,zTerm=100.,cTerm=0.1)) == 'load RC 100Ω 100pF'
+    assert Describe(dict(rSeries=0.,zSrc=10.,zTerm=100.)) == 'parallel load R 100Ω'
+
+def test_chosen_design_meets_limits():
+    #simulated again on its own, on a finer grid, the best design is inside the limits at every zTrace
+    length, rDrv = 2., 10
+    best = OptimizeTermination(length,(80,120),rDrv=rDrv)[0]
+    dt = length/200
+    drv = Pulse(dt,1.,40.)
+    params = {k: best[k] for k in ('zSrc','zTerm','cSrc','cTerm') if k in best}
+    waves = SweepWaves(drv,zTrace=np.array([80.,100.,120.]),length=length,nX=2,endT=drv.size*dt,probes=[1.],**params)
+    res = WaveMetrics(waves,dt)
+    assert np.all(res['ringbackMargin'] >= 0)
+    assert np.all(res['overshoot'] <= 0.3) and np.all(res['undershoot'] <= 0.3)
+    assert np.all(MeetsLimits(res))
+
+def test_zero_length():
+    with pytest.raises(ValueError):
+        OptimizeTermination(0,100)
+    with pytest.raises(ValueError):
+        CheckDesigns(dict(zSrc=[50.],zTerm=[np.inf]),0,[100.])
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 10:20:00 2026
+
+@author: MarcMignard
+"""
+import os
+import sys
+import json
+import subprocess
+import numpy as np
+import Tline
+
+def test_import_is_headless():
+    #the library and the figure scripts do not load the plotting stack when they are imported
+    code = "import sys, Tline, MakeWaves, TlineLTSpice; print(any(m in sys.modules for m in ('matplotlib','schemdraw')))"
+    out = subprocess.run([sys.executable,'-c',code],cwd=os.path.dirname(os.path.abspath(Tline.__file__)),
+                         capture_output=True,text=True,check=True).stdout
+    assert out.strip() == 'False'
+
+def test_sweep(capsys,tmp_path):
+    out = tmp_path/'sweep.npz'
+    assert Tline.main(['sweep','--zSrc','20,100','--zTerm','inf','--length','0.25,1','--nT','500','--out',str(out),'--json']) == 0
+    rows = json.loads(capsys.readouterr().out)
+    assert len(rows) == 4
+    #a short line with a small source resistor passes, a long one rings back below Vih
+    short = [r for r in rows if r['zSrc'] == 20 and r['length'] == 0.25][0]
+    long = [r for r in rows if r['zSrc'] == 20 and r['length'] == 1][0]
+    assert short['passes'] and not long['passes']
+    saved = np.load(out)
+    assert saved['waves'].shape == (4,500,3)
+
+def test_terminate(capsys):
+    assert Tline.main(['terminate','--top','1','--json']) == 0
+    best = json.loads(capsys.readouterr().out)[0]
+    assert best['rSeries'] > 0
+
+def test_render_keeps_stdout_clean(capsys):
+    #figure functions report their measurements on stderr, stdout is left for the CLI output
+    Tline.Render(['crosstalk'],show=False)
+    out = capsys.readouterr()
+    assert out.out == '' and 'NEXT' in out.err
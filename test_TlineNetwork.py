@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 10:30:00 2026
+
+@author: MarcMignard
+"""
+import numpy as np
+import pytest
+from TlineNetwork import NetworkWaves, NetworkNodes
+from WaveEngine import SweepWaves
+
+def Drive(nT=1000):
+    return np.minimum(np.arange(1,nT+1)/50,1.)
+
+def test_single_segment_matches_line():
+    #two segments in a row are one line, the same as the delay engine with a probe at the joint
+    drv = Drive()
+    net = NetworkWaves(drv,[('vs','vm',100,0.25),('vm','vl',100,0.75)],10.,{'vs':20},{'vl':1e6})
+    line = SweepWaves(drv,20,100,1e6,1.,2,10.,[0.,0.25,1.])[0]
+    assert np.allclose(net,line,atol=1e-12)
+
+def test_tee_scattering():
+    #a wave reaching a tee of three equal lines goes on with 2/3 into each branch
+    drv = Drive()
+    segments = [('vs','vm',50,0.5),('vm','a',50,1.),('vm','b',50,1.)]
+    assert NetworkNodes(segments) == ['vs','vm','a','b']
+    waves = NetworkWaves(drv,segments,10.,{'vs':50},{'a':50,'b':50},probes=['vm','a'])
+    #the matched source launches 1/2, so the tee and the matched branch ends settle at 2/3 of that
+    assert np.allclose(waves[-1],[1/3,1/3])
+    assert np.all(waves[:150,1] == 0)
+
+def test_unknown_node():
+    with pytest.raises(ValueError):
+        NetworkWaves(Drive(),[('vs','vl',50,1.)],10.,{'vx':50})
+
+@pytest.mark.parametrize('zTerm',[0,1e6])
+def test_ideal_source_and_short(zTerm):
+    #zSrc=0 holds the source node at the drive and zTerm=0 holds the load at 0, like the delay engine
+    drv = Drive()
+    net = NetworkWaves(drv,[('vs','vm',100,0.25),('vm','vl',100,0.75)],10.,{'vs':0},{'vl':zTerm})
+    line = SweepWaves(drv,0,100,zTerm,1.,2,10.,[0.,0.25,1.])[0]
+    assert np.allclose(net,line,atol=1e-12)
+    assert np.array_equal(net[:,0],drv)
+    with pytest.raises(ValueError):
+        NetworkWaves(drv,[('vs','vl',100,1.)],10.,{'vs':0},{'vs':0})
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 09:30:00 2026
+
+@author: MarcMignard
+"""
+import numpy as np
+import pytest
+from WaveEngine import MakeWaves, SweepWaves, StreamWaves, AutoWaves
+from Lattice import LatticeWaves
+
+def Drive(nT=2000):
+    #a pulse that rises over 100 steps and falls to 0.3 after 1200
+    drv = np.minimum(np.arange(1,nT+1)/100,1.)
+    drv[1200:] = 0.3
+    return drv
+
+CASES = [dict(zSrc=20,zTerm=np.inf,length=0.5),
+         dict(zSrc=100,zTerm=100,length=2.),
+         dict(zSrc=5,zTerm=0,length=0.013),          #a line with fractional delays
+         dict(zSrc=20,zTerm=np.inf,length=0.004),    #shorter than one time step
+         dict(zSrc=20,zTerm=np.inf,length=0.5,cSrc=0.01),
+         dict(zSrc=20,zTerm=100,length=0.37,lSrc=0.3,cTerm=0.05)]
+
+@pytest.mark.parametrize('case',CASES)
+def test_single_config_matches_batch(case):
+    #one configuration takes the scalar path of LineState, two take the batched one
+    c = dict(case)
+    zSrc, zTerm, length = c.pop('zSrc'), c.pop('zTerm'), c.pop('length')
+    drv = Drive()
+    batch = SweepWaves(drv,[zSrc,zSrc],100,zTerm,length,2,20.,[0.,0.3,1.],3,**c)[0]
+    assert np.array_equal(SweepWaves(drv,zSrc,100,zTerm,length,2,20.,[0.,0.3,1.],3,**c)[0],batch)
+    #the same in chunks, with empty and one sample chunks
+    chunks = np.split(drv,[0,0,1,7,500,501,1700])
+    stream = np.concatenate(list(StreamWaves(chunks,zSrc,100,zTerm,length,0.01,[0.,0.3,1.],3,**c)),axis=1)[0]
+    assert np.array_equal(stream,batch)
+
+def test_delay_matches_interp_matched_load():
+    #with one grid point per time step and no reflections, the interpolation engine shifts exactly too
+    #(it does not agree after reflections, its ends are one time step outside the line)
+    drv = Drive(200)
+    delay = MakeWaves(drv,20,100,100,0.5,51,2.)
+    interp = MakeWaves(drv,20,100,100,0.5,51,2.,method='interp')
+    assert np.allclose(delay,interp,atol=1e-12)
+
+def test_delay_matches_lattice():
+    #with whole time steps along the line the delay engine is exact, the same as the bounce diagram,
+    #for a sweep that has open, shorted and matched loads
+    drv = Drive()
+    zSrc = np.array([10,20,100,300,1e9,50])
+    zTerm = np.array([np.inf,0,100,1e6,35,20])
+    length = np.array([0.25,0.5,1.,2.,0.73,0.01])
+    delay = SweepWaves(drv,zSrc,100,zTerm,length,2,20.,[0.,0.5,1.])
+    lattice = LatticeWaves(drv,zSrc,100,zTerm,length,20.,probes=[0.,0.5,1.],tol=1e-14)
+    assert np.allclose(delay,lattice,atol=1e-12)
+
+def test_open_and_shorted_load():
+    #a matched source launches half of the drive, an open load doubles it after one delay and a short
+    #keeps the load at 0 and sends -1/2 back to the source
+    drv = np.ones(400)
+    waves = SweepWaves(drv,50,50,[np.inf,0.],1.,2,4.,[0.,1.])
+    assert np.all(waves[0,:100,1] == 0) and np.allclose(waves[0,100:,1],1.)
+    assert np.allclose(waves[0,200:,0],1.)
+    assert np.allclose(waves[1,:,1],0.)
+    assert np.allclose(waves[1,:200,0],0.5) and np.allclose(waves[1,200:,0],0.)
+
+def test_probe_indices_and_positions():
+    #integer probes are indices of the grid of MakeWaves and SweepWaves, -1 is the load
+    drv = Drive(200)
+    waves = SweepWaves(drv,20,100,np.inf,0.5,11,2.)[0]
+    assert np.array_equal(SweepWaves(drv,20,100,np.inf,0.5,11,2.,probes=[0,5,-1])[0],waves[:,[0,5,10]])
+    assert np.array_equal(SweepWaves(drv,20,100,np.inf,0.5,11,2.,probes=[0.,0.5,1.])[0],waves[:,[0,5,10]])
+    with pytest.raises(IndexError):
+        SweepWaves(drv,20,100,np.inf,0.5,11,2.,probes=[0,11])
+    with pytest.raises(IndexError):
+        MakeWaves(drv,20,100,np.inf,0.5,11,2.,probes=[-12])
+    #the entry points without a grid only take positions, integers would mean something else there
+    with pytest.raises(TypeError):
+        next(StreamWaves([drv],20,100,np.inf,0.5,0.01,probes=[0,1]))
+    with pytest.raises(TypeError):
+        LatticeWaves(drv,20,100,np.inf,0.5,2.,probes=[0,1])
+    with pytest.raises(ValueError):
+        LatticeWaves(drv,20,100,np.inf,0.5,2.,probes=[1.5])
+
+def test_auto_waves_error_estimate():
+    #the estimated error of AutoWaves is close to the real error against the exact solution
+    t = np.linspace(0,20,2000,endpoint=False)
+    drv = np.clip(t/1.3,0,1)
+    waves, tAuto, err, nT = AutoWaves(drv,30,100,np.inf,0.7,20.,tol=1e-3,cSrc=0.005)
+    assert err <= 1e-3
+    fine, tFine = AutoWaves(drv,30,100,np.inf,0.7,20.,tol=1e-6,cSrc=0.005)[:2]
+    exact = np.stack([np.interp(tAuto,tFine,fine[:,p]) for p in range(fine.shape[1])],axis=1)
+    assert np.abs(waves - exact).max() <= 2*err
+
+def test_auto_waves_short_line():
+    #a line much shorter than the rise time does not need a step per line length, the delay engine takes
+    #the fractional tap, so the grid only depends on the rise time (a step of length would be 6667 steps)
+    t = np.linspace(0,20,2000,endpoint=False)
+    drv = np.clip(t/1.3,0,1)
+    waves, tAuto, err, nT = AutoWaves(drv,30,100,np.inf,0.003,20.,tol=1e-4)
+    assert err <= 1e-4 and nT < 100
+    exact = LatticeWaves(drv,30,100,np.inf,0.003,20.,tol=1e-12)[0]
+    exact = np.stack([np.interp(tAuto,t,exact[:,p]) for p in range(exact.shape[1])],axis=1)
+    assert np.abs(waves - exact).max() <= 1e-4